@@ -0,0 +1,249 @@
+# alerts.py
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Protocol
+
+from config import (
+    ALERTED_PATH, ALERT_CATEGORIES, ALERT_COALESCE_SECONDS, ALERT_EMAILS, ALERT_FILE_PATH,
+    ALERT_MAX_PER_MESSAGE, ALERT_MIN_SCORE, ALERT_QUEUE_SIZE, ALERT_WEBHOOK_URL,
+    SENDER_EMAIL, SMTP_HOST, SMTP_PASSWORD, SMTP_PORT, SMTP_USER,
+)
+from models import CastingListing, CareerCategory
+from ranking import Ranker, default_ranker
+from rules import categorize_all
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+# Keys already alerted, so a listing routed to several markets (or re-found
+# before its digest, by this process or after a restart) alerts once; the
+# oldest are forgotten past this many.
+_MAX_ALERTED = 10_000
+
+
+class Sink(Protocol):
+    """Somewhere an alert goes. Raises if it couldn't be delivered."""
+
+    def send(self, subject: str, text: str, listings: list[CastingListing]) -> None: ...
+
+
+class WebhookSink:
+    """POSTs {"text", "listings"} as JSON (Slack-style incoming webhooks read "text")."""
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self._url = url
+        self._timeout = timeout
+
+    def send(self, subject: str, text: str, listings: list[CastingListing]) -> None:
+        import urllib.request
+
+        payload = {
+            "text": f"{subject}\n{text}",
+            "listings": [{"title": l.title, "url": l.url, "source": l.source, "location": l.location}
+                         for l in listings],
+        }
+        request = urllib.request.Request(
+            self._url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self._timeout):
+            pass
+
+
+class SmtpSink:
+    """Sends the alert as a plain-text email."""
+
+    def __init__(self, host: str, port: int, recipients: list[str], sender: str,
+                 user: str = "", password: str = ""):
+        self._host = host
+        self._port = port
+        self._recipients = recipients
+        self._sender = sender
+        self._user = user
+        self._password = password
+
+    def send(self, subject: str, text: str, listings: list[CastingListing]) -> None:
+        import smtplib
+        from email.message import EmailMessage
+
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = self._sender
+        message["To"] = ", ".join(self._recipients)
+        message.set_content(text)
+        with smtplib.SMTP(self._host, self._port, timeout=30) as smtp:
+            if self._user:
+                smtp.starttls()
+                smtp.login(self._user, self._password)
+            smtp.send_message(message)
+
+
+class FileSink:
+    """Appends one JSON line per alerted listing."""
+
+    def __init__(self, path: str):
+        self._path = Path(path)
+
+    def send(self, subject: str, text: str, listings: list[CastingListing]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().isoformat(timespec="seconds")
+        with self._path.open("a") as f:
+            for l in listings:
+                f.write(json.dumps({"alerted_at": stamp, "title": l.title, "url": l.url,
+                                    "source": l.source, "location": l.location}) + "\n")
+
+
+def format_alert(listings: list[CastingListing], hidden: int = 0) -> tuple[str, str]:
+    """A short subject and text for one alert message."""
+    first = listings[0].title
+    subject = (f"Casting Scout alert: {first}" if len(listings) == 1
+               else f"Casting Scout alert: {len(listings) + hidden} new top listings")
+    lines = [f"- {l.title} ({l.location}, {l.source})\n  {l.url}" for l in listings]
+    if hidden:
+        lines.append(f"+ {hidden} more in the next digest")
+    return subject, "\n".join(lines)
+
+
+class AlertDispatcher:
+    """Sends high-value listings to push sinks as soon as they are found.
+
+    `submit` only puts a batch on a queue and never blocks the scrape; a worker
+    thread picks out the listings worth an alert (an alert category and at
+    least `min_score`, see ranking.py) and, after the first one, keeps
+    collecting for `coalesce_seconds` so a burst goes out as one message of at
+    most `max_per_message` listings. Alerts are fire-and-forget: a failed sink
+    is logged, and every alerted listing still goes in the digest, which is
+    what marks it seen. The keys alerted are saved to `alerted_path`, if
+    given, after each message, so a restarted run doesn't alert them again.
+    """
+
+    def __init__(
+        self,
+        sinks: list[Sink],
+        categories: set[CareerCategory],
+        min_score: float,
+        ranker: Ranker | None = None,
+        coalesce_seconds: float = ALERT_COALESCE_SECONDS,
+        max_per_message: int = ALERT_MAX_PER_MESSAGE,
+        max_queue: int = ALERT_QUEUE_SIZE,
+        alerted_path: str | None = None,
+    ):
+        self._sinks = sinks
+        self._categories = categories
+        self._min_score = min_score
+        self._ranker = ranker or default_ranker()
+        self._coalesce = coalesce_seconds
+        self._max_per_message = max_per_message
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._alerted_path = Path(alerted_path) if alerted_path else None
+        self._alerted: dict[str, None] = self._load_alerted()  # insertion-ordered, oldest first
+        self._thread = threading.Thread(target=self._run, name="alerts", daemon=True)
+        self._thread.start()
+
+    def submit(self, listings: list[CastingListing]) -> None:
+        """Queue freshly found (filtered, not yet seen) listings; never blocks."""
+        if not listings:
+            return
+        try:
+            self._queue.put_nowait(listings)
+        except queue.Full:
+            logger.warning(f"Alert queue full; {len(listings)} listings will only be in the digest")
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Send whatever is collected now and stop the worker."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _load_alerted(self) -> dict[str, None]:
+        if self._alerted_path is None or not self._alerted_path.exists():
+            return {}
+        try:
+            return dict.fromkeys(json.loads(self._alerted_path.read_text()))
+        except (OSError, json.JSONDecodeError):
+            logger.warning(f"Could not read {self._alerted_path}; listings may be alerted again")
+            return {}
+
+    def _save_alerted(self) -> None:
+        if self._alerted_path is None:
+            return
+        self._alerted_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._alerted_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(list(self._alerted)))
+        tmp.replace(self._alerted_path)
+
+    def _select(self, listings: list[CastingListing]) -> list[CastingListing]:
+        categories = categorize_all(listings)
+        scores = self._ranker.scores(self._ranker.features(listings, categories))
+        picked = []
+        for listing, category, score in zip(listings, categories, scores):
+            key = listing.dedup_key()
+            if category in self._categories and score >= self._min_score and key not in self._alerted:
+                self._alerted[key] = None
+                picked.append(listing)
+        while len(self._alerted) > _MAX_ALERTED:
+            del self._alerted[next(iter(self._alerted))]
+        return picked
+
+    def _run(self) -> None:
+        collected: list[CastingListing] = []
+        deadline: float | None = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is not None and item is not _STOP:
+                try:
+                    picked = self._select(item)
+                except Exception:
+                    logger.exception("Failed to pick listings to alert")
+                    picked = []
+                if picked and deadline is None:
+                    deadline = time.monotonic() + self._coalesce
+                collected.extend(picked)
+            if collected and (item is None or item is _STOP or time.monotonic() >= deadline):
+                self._send(collected)
+                collected, deadline = [], None
+            if item is _STOP:
+                return
+
+    def _send(self, listings: list[CastingListing]) -> None:
+        shown = listings[:self._max_per_message]
+        subject, text = format_alert(shown, len(listings) - len(shown))
+        for sink in self._sinks:
+            try:
+                sink.send(subject, text, shown)
+            except Exception:
+                logger.exception(f"Alert sink {type(sink).__name__} failed")
+        logger.info(f"Alerted {len(listings)} listing(s)")
+        try:
+            self._save_alerted()
+        except OSError:
+            logger.exception("Failed to save alerted keys")
+
+
+def default_sinks() -> list[Sink]:
+    """The sinks configured in config (none means alerts are off)."""
+    sinks: list[Sink] = []
+    if ALERT_WEBHOOK_URL:
+        sinks.append(WebhookSink(ALERT_WEBHOOK_URL))
+    if SMTP_HOST and ALERT_EMAILS:
+        sinks.append(SmtpSink(SMTP_HOST, SMTP_PORT, ALERT_EMAILS, SENDER_EMAIL, SMTP_USER, SMTP_PASSWORD))
+    if ALERT_FILE_PATH:
+        sinks.append(FileSink(ALERT_FILE_PATH))
+    return sinks
+
+
+def default_dispatcher() -> AlertDispatcher | None:
+    sinks = default_sinks()
+    if not sinks:
+        return None
+    categories = {CareerCategory[name.upper()] for name in ALERT_CATEGORIES}
+    return AlertDispatcher(sinks, categories, ALERT_MIN_SCORE, alerted_path=ALERTED_PATH)
@@ -0,0 +1,59 @@
+# benchmarks/bench_parse.py
+"""Measure page-parse throughput with different numbers of parse workers.
+
+Usage: python benchmarks/bench_parse.py [--pages N] [--results N] [--workers 1 2 4 8]
+
+Parses synthetic Craigslist result pages through scrapers.parse_pool. On an
+otherwise idle machine, throughput should scale close to linearly up to the
+number of cores.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapers.craigslist import CraigslistScraper  # noqa: E402
+from scrapers.parse_pool import ParsePool  # noqa: E402
+
+ITEM = """
+<li class="cl-static-search-result" title="Lead for USC thesis {i} - $150/day, shoots March 20-22">
+  <a href="https://losangeles.craigslist.org/lac/tlg/d/{i}.html">
+    <div class="title">Lead for USC thesis {i} - $150/day, shoots March 20-22</div>
+    <div class="details"><span class="location">Burbank</span><span class="date">Feb 25</span></div>
+  </a>
+</li>"""
+
+
+def _page(results: int) -> str:
+    items = "".join(ITEM.format(i=i) for i in range(results))
+    return f"<html><body><ol class='cl-static-search-results'>{items}</ol></body></html>"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=32)
+    parser.add_argument("--results", type=int, default=120)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    bodies = [_page(args.results)] * args.pages
+    scraper = CraigslistScraper()
+    baseline = None
+    for workers in args.workers:
+        pool = ParsePool(workers, min_bytes=0)
+        pool.parse(scraper.parse, bodies[:2])  # start the workers outside the timing
+        start = time.perf_counter()
+        pool.parse(scraper.parse, bodies)
+        elapsed = time.perf_counter() - start
+        pool.close()
+        rate = args.pages / elapsed
+        baseline = baseline or rate
+        print(f"  {workers} worker(s): {rate:6.1f} pages/s  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
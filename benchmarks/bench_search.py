@@ -0,0 +1,89 @@
+# benchmarks/bench_search.py
+"""Time full-text search over a synthetic listing archive.
+
+Usage: python benchmarks/bench_search.py [--listings N] [--db PATH]
+
+The archive is built once at PATH (default: a temp file) and reused on later
+runs, since loading 1M listings takes a while.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import CastingListing, CareerCategory  # noqa: E402
+from store import ListingStore  # noqa: E402
+
+# Domain words are sprinkled into otherwise Zipf-distributed filler text so
+# term frequencies look like real postings rather than a 45-word vocabulary.
+WORDS = (
+    "actor actress lead principal background extras commercial improv comedy drama "
+    "thesis student film short feature music video audition callback monologue "
+    "singer dancer host voiceover spokesperson stunt model paid unpaid copy credit "
+    "meals burbank hollywood pasadena glendale usc ucla afi chapman calarts lmu"
+).split()
+SOURCES = ("craigslist", "reddit", "backstage", "casting_networks", "facebook")
+FILLER = [f"w{i}" for i in range(20_000)]
+FILLER_WEIGHTS = [1 / (i + 1) for i in range(len(FILLER))]
+QUERIES = ("improv", "improv*", "usc thesis", "commercial burbank", "voiceover paid", "aud*")
+
+
+def _listing(i: int, rng: random.Random) -> CastingListing:
+    return CastingListing(
+        title=" ".join(rng.choices(WORDS, k=2) + rng.choices(FILLER, FILLER_WEIGHTS, k=4)),
+        source=rng.choice(SOURCES),
+        url=f"https://example.com/{i}",
+        posted_date=date.today() - timedelta(days=rng.randrange(365)),
+        location=rng.choice(("Burbank, CA", "Los Angeles, CA", "Pasadena, CA")),
+        union_status="non-union",
+        role_type=rng.choice(("principal", "background", "commercial", "other")),
+        description=" ".join(rng.choices(WORDS, k=3) + rng.choices(FILLER, FILLER_WEIGHTS, k=57)),
+        how_to_apply="Apply",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listings", type=int, default=100_000)
+    parser.add_argument("--db", default=str(Path(tempfile.gettempdir()) / "casting_scout_bench.db"))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    store = ListingStore(args.db)
+    rng = random.Random(42)
+    have = store.count()
+    if have < args.listings:
+        print(f"Loading {args.listings - have} listings into {args.db}...")
+        start = time.perf_counter()
+        for lo in range(have, args.listings, 10_000):
+            hi = min(lo + 10_000, args.listings)
+            store.add_many([_listing(i, rng) for i in range(lo, hi)])
+        print(f"  loaded in {time.perf_counter() - start:.1f}s")
+    print(f"Archive: {store.count()} listings\n")
+
+    since = date.today() - timedelta(days=30)
+    cases = [(q, {}) for q in QUERIES] + [
+        ("improv", {"category": CareerCategory.COMMERCIAL}),
+        ("improv", {"source": "craigslist", "since": since}),
+    ]
+    for terms, filters in cases:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            store.search(terms, limit=20, **filters)
+            timings.append((time.perf_counter() - start) * 1000)
+        label = terms + (f" {filters}" if filters else "")
+        print(f"  {statistics.median(timings):7.2f} ms median  {max(timings):7.2f} ms max  {label}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
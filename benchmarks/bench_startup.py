@@ -0,0 +1,79 @@
+# benchmarks/bench_startup.py
+"""Measure interpreter + import cost of `main` with `python -X importtime`.
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--top N] [--budget-ms MS]
+
+Fails if a heavy module is imported, or the median import takes over the budget.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Dependencies that must only load in the stage that needs them: third-party
+# clients and parsers, the parse pool's process machinery, the plugin
+# entry-point scan, and the metrics/breakage statistics.
+HEAVY_MODULES = (
+    "sendgrid", "bs4", "playwright", "requests",
+    "multiprocessing", "importlib.metadata", "statistics",
+)
+
+# Median cumulative `import main` time allowed, as reported by -X importtime
+BUDGET_MS = 60.0
+
+
+def import_profile() -> dict[str, tuple[int, int]]:
+    """Import `main` in a fresh interpreter. Returns {module: (self_us, cumulative_us)}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    profile: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    args = parser.parse_args()
+
+    totals = []
+    profile: dict[str, tuple[int, int]] = {}
+    for _ in range(args.runs):
+        profile = import_profile()
+        totals.append(profile["main"][1])
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"import main: median {median_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:g} ms)")
+    print(f"\nTop {args.top} modules by cumulative time (last run):")
+    ranked = sorted(profile.items(), key=lambda kv: kv[1][1], reverse=True)
+    for name, (_, cumulative_us) in ranked[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    failures = []
+    leaked = [m for m in HEAVY_MODULES if m in profile]
+    if leaked:
+        failures.append(f"heavy modules imported at startup: {', '.join(leaked)}")
+    if median_ms > args.budget_ms:
+        failures.append(f"import main took {median_ms:.1f} ms, over the {args.budget_ms:g} ms budget")
+    for failure in failures:
+        print(f"\nFAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("\nOK: no heavy modules imported at startup, and within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# breakage.py
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import statistics
+from datetime import datetime
+from pathlib import Path
+
+from config import (
+    BREAKAGE_ACCEPT_RUNS, BREAKAGE_BASELINE_RUNS, BREAKAGE_DROP_RATIO, BREAKAGE_FIELD_JUMP,
+    BREAKAGE_MIN_CANDIDATES, BREAKAGE_MIN_RUNS, BROKEN_PAGES_KEEP,
+)
+from metrics import SELECTOR_BREAKAGE, MetricsStore, SourceRun
+from scrapers.parse_pool import PageStats, total_stats
+
+logger = logging.getLogger(__name__)
+
+
+def diagnose(
+    stats: PageStats,
+    history: list[PageStats],
+    min_runs: int = BREAKAGE_MIN_RUNS,
+    drop_ratio: float = BREAKAGE_DROP_RATIO,
+    field_jump: float = BREAKAGE_FIELD_JUMP,
+    min_candidates: int = BREAKAGE_MIN_CANDIDATES,
+) -> str | None:
+    """Why `stats` look like a broken parser next to the source's `history`
+    (its recent healthy runs), or None if they don't.
+
+    Broken: the selector matched under `drop_ratio` of the usual (median)
+    number of candidates, or some field is missing from `field_jump` more of
+    the candidates than usual (a renamed .location, say). Sources with fewer
+    than `min_runs` runs of history, or usually under `min_candidates`
+    candidates, are not judged.
+    """
+    if len(history) < min_runs:
+        return None
+    usual = statistics.median(h.candidates for h in history)
+    if usual < min_candidates:
+        return None
+    if stats.candidates < drop_ratio * usual:
+        return f"matched {stats.candidates} candidates, usually {usual:g}"
+    for field, n in sorted(stats.missing.items()):
+        rate = n / stats.candidates
+        usual_rate = statistics.median(h.missing.get(field, 0) / h.candidates if h.candidates else 0.0
+                                       for h in history)
+        if rate - usual_rate >= field_jump:
+            return f"{field} missing from {rate:.0%} of {stats.candidates} candidates, usually {usual_rate:.0%}"
+    return None
+
+
+class BreakageDetector:
+    """Tells a source whose parser broke from one having a quiet day.
+
+    Each run's PageStats are compared with the source's last `baseline_runs`
+    healthy runs, which the MetricsStore keeps as part of each SourceRun.
+    When they look broken (see diagnose) the run is marked with
+    SELECTOR_BREAKAGE, the source is `flagged` so the caller can report it,
+    and the run's page bodies are saved, gzipped, under `pages_dir` for
+    offline debugging, keeping the newest `keep` pages per source. Flagged
+    runs stay out of the baseline until `accept_runs` of them come in a row;
+    then they are taken as the source's new normal (a site now showing fewer
+    cards, say), so a lasting change doesn't keep it flagged for good.
+    """
+
+    def __init__(
+        self,
+        store: MetricsStore,
+        pages_dir: str,
+        baseline_runs: int = BREAKAGE_BASELINE_RUNS,
+        accept_runs: int = BREAKAGE_ACCEPT_RUNS,
+        keep: int = BROKEN_PAGES_KEEP,
+    ):
+        self._store = store
+        self._pages_dir = Path(pages_dir)
+        self._baseline_runs = baseline_runs
+        self._accept_runs = accept_runs
+        self._keep = keep
+        self._flagged: dict[str, str] = {}
+
+    def flagged(self, source: str) -> str | None:
+        """Why the source's last checked run looked broken, if it did."""
+        return self._flagged.get(source)
+
+    def check(
+        self,
+        source: str,
+        pages: list[tuple[str, PageStats]],
+        run: SourceRun | None = None,
+        now: datetime | None = None,
+    ) -> str | None:
+        """Judge one run of `source` and return why it looks broken, if it does.
+
+        `pages` is each fetched body with its stats (BaseScraper.last_pages);
+        a run that fetched nothing (e.g. no credentials) is not judged. The
+        stats and verdict go on `run`, to be saved with the run's metrics.
+        """
+        self._flagged.pop(source, None)
+        if not pages:
+            return None
+        stats = total_stats(s for _, s in pages)
+        reason = diagnose(stats, self._baseline(source))
+        if run:
+            run.candidates, run.missing = stats.candidates, json.dumps(stats.missing, sort_keys=True)
+            if reason:
+                run.error = SELECTOR_BREAKAGE
+        if reason:
+            self._flagged[source] = reason
+            path = self._save_pages(source, [body for body, _ in pages], now or datetime.now())
+            logger.error(f"{source} parser looks broken: {reason}; page(s) saved to {path}")
+        return reason
+
+    def _baseline(self, source: str) -> list[PageStats]:
+        """The healthy runs to judge against, newest first. `accept_runs`
+        flagged runs in a row mark a lasting change: they count as healthy,
+        and the runs before them no longer count."""
+        history = self._store.parse_history(source, self._baseline_runs + self._accept_runs)
+        streak = 0
+        for i, (_, broken) in enumerate(history):
+            streak = streak + 1 if broken else 0
+            if streak >= self._accept_runs:
+                first = i + 1 - streak
+                end = next((j for j in range(i + 1, len(history)) if not history[j][1]), len(history))
+                accepted = [s for j, (s, b) in enumerate(history[:end]) if not b or j >= first]
+                return accepted[:self._baseline_runs]
+        return [stats for stats, broken in history if not broken][:self._baseline_runs]
+
+    def _save_pages(self, source: str, bodies: list[str], now: datetime) -> Path:
+        self._pages_dir.mkdir(parents=True, exist_ok=True)
+        stamp = now.strftime("%Y%m%dT%H%M%S")
+        for i, body in enumerate(bodies):
+            ext = "json" if body.lstrip().startswith("[") else "html"
+            path = self._pages_dir / f"{source}-{stamp}-{i}.{ext}.gz"
+            path.write_bytes(gzip.compress(body.encode()))
+        # Names sort by time, oldest first
+        saved = sorted(self._pages_dir.glob(f"{source}-*.gz"))
+        for old in saved[:-max(self._keep, len(bodies))]:
+            old.unlink()
+        return self._pages_dir
@@ -0,0 +1,58 @@
+# breaker.py
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Per-source circuit breaker persisted across runs.
+
+    After `threshold` consecutive failures a source is skipped until
+    `cooldown` has passed; the next attempt after that is a trial, and one
+    more failure re-opens the circuit for another cooldown.
+    """
+
+    def __init__(self, state_path: str, threshold: int, cooldown: timedelta):
+        self._path = Path(state_path)
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._state: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        if self._path.exists():
+            return json.loads(self._path.read_text())
+        return {}
+
+    def _save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.write_text(json.dumps(self._state, indent=2, sort_keys=True))
+
+    def allow(self, source: str, now: datetime | None = None) -> bool:
+        """Return False while the source's circuit is open."""
+        opened_at = self._state.get(source, {}).get("opened_at")
+        if opened_at is None:
+            return True
+        now = now or datetime.now()
+        return now >= datetime.fromisoformat(opened_at) + self._cooldown
+
+    def retry_at(self, source: str) -> datetime | None:
+        opened_at = self._state.get(source, {}).get("opened_at")
+        return datetime.fromisoformat(opened_at) + self._cooldown if opened_at else None
+
+    def record_success(self, source: str) -> None:
+        if source in self._state:
+            del self._state[source]
+            self._save()
+
+    def record_failure(self, source: str, now: datetime | None = None) -> None:
+        entry = self._state.setdefault(source, {"failures": 0})
+        entry["failures"] += 1
+        if entry["failures"] >= self._threshold:
+            entry["opened_at"] = (now or datetime.now()).isoformat(timespec="seconds")
+            logger.warning(f"Circuit opened for {source} after {entry['failures']} consecutive failures")
+        self._save()
@@ -2,29 +2,106 @@
 from __future__ import annotations
 
 import os
+from pathlib import Path
 
-from dotenv import load_dotenv
+# python-dotenv is only imported when there is a .env file to read; in CI the
+# variables come from the environment and the import is pure startup cost.
+if Path(".env").exists() or (Path(__file__).parent / ".env").exists():
+    from dotenv import load_dotenv
 
-load_dotenv()
+    load_dotenv()
 
 # --- Email ---
 SENDGRID_API_KEY: str = os.environ.get("SENDGRID_API_KEY", "")
 RECIPIENT_EMAIL: str = os.environ.get("RECIPIENT_EMAIL", "")
+# RECIPIENT_EMAIL may be a comma-separated list; everyone gets the same digest.
+RECIPIENT_EMAILS: list[str] = [e.strip() for e in RECIPIENT_EMAIL.split(",") if e.strip()]
 SENDER_EMAIL: str = os.environ.get("SENDER_EMAIL", "castingscout@noreply.com")
+SENDGRID_API_HOST: str = os.environ.get("SENDGRID_API_HOST", "https://api.sendgrid.com")
+
+# --- Outbox (queued digests, retried across runs) ---
+OUTBOX_MAX_ATTEMPTS: int = 6
+OUTBOX_BACKOFF_BASE_MINUTES: int = 10
+OUTBOX_BACKOFF_MAX_MINUTES: int = 6 * 60
+OUTBOX_WORKERS: int = 4
+
+# --- Alerts ---
+# Listings in ALERT_CATEGORIES scoring at least ALERT_MIN_SCORE (see
+# ranking.py) are pushed as soon as they're found, as well as going in the
+# digest. Each configured sink gets them; with none, alerts are off.
+ALERT_CATEGORIES: list[str] = ["PRINCIPAL", "STUDENT_FILM"]
+# A fresh principal role of unknown pay from Craigslist scores about 4.6
+ALERT_MIN_SCORE: float = 4.0
+ALERT_WEBHOOK_URL: str = os.environ.get("ALERT_WEBHOOK_URL", "")
+ALERT_EMAILS: list[str] = [e.strip() for e in os.environ.get("ALERT_EMAIL", "").split(",") if e.strip()]
+SMTP_HOST: str = os.environ.get("SMTP_HOST", "")
+SMTP_PORT: int = int(os.environ.get("SMTP_PORT", "587"))
+SMTP_USER: str = os.environ.get("SMTP_USER", "")
+SMTP_PASSWORD: str = os.environ.get("SMTP_PASSWORD", "")
+ALERT_FILE_PATH: str = os.environ.get("ALERT_FILE_PATH", "")
+# After the first alert-worthy listing, wait this long for more so a burst
+# is one message; at most ALERT_MAX_PER_MESSAGE are listed in it.
+ALERT_COALESCE_SECONDS: float = 60.0
+ALERT_MAX_PER_MESSAGE: int = 10
+# Batches waiting for the alert worker; past this they only go in the digest.
+ALERT_QUEUE_SIZE: int = 1000
 
 # --- Location filter ---
-LA_METRO_LOCATIONS: list[str] = [
-    "los angeles", "la", "burbank", "glendale", "pasadena",
-    "santa monica", "hollywood", "west hollywood", "culver city",
-    "studio city", "north hollywood", "sherman oaks", "van nuys",
-    "long beach", "inglewood", "beverly hills", "century city",
-    "downtown la", "koreatown", "silver lake", "echo park",
-    "los feliz", "atwater village", "eagle rock", "highland park",
-    "mar vista", "venice", "playa del rey", "westwood",
-    "brentwood", "encino", "tarzana", "woodland hills",
-    "calabasas", "malibu", "torrance", "redondo beach",
-    "manhattan beach", "hermosa beach", "el segundo",
-]
+# Place names, aliases and postal prefixes with coordinates; a listing's
+# location is normalized against it and kept if it lies within an active
+# market's radius (see gazetteer.py, markets.py).
+GAZETTEER_PATH: str = str(Path(__file__).parent / "data" / "gazetteer.csv")
+
+# --- Markets ---
+# Each market gets its own digest and seen-listings file. National sources
+# (Backstage, Casting Networks, Actors Access, REDDIT_SUBREDDITS) are scraped
+# once and each listing goes to every market its location names; a market's
+# own Craigslist sites, subreddits and Facebook groups feed only that market.
+# "city" is the market's place in the gazetteer; a listing belongs to the
+# market if its location is within "radius_km" of it.
+MARKETS: dict[str, dict] = {
+    "la": {
+        "city": "Los Angeles, CA",
+        "radius_km": 80,
+        "craigslist": ["losangeles"],
+        "subreddits": [],
+        "facebook_groups": [
+            "https://www.facebook.com/groups/lacastingcalls",
+            "https://www.facebook.com/groups/actorsinla",
+        ],
+    },
+    "atlanta": {
+        "city": "Atlanta, GA",
+        "radius_km": 70,
+        "craigslist": ["atlanta"],
+        "subreddits": [],
+        "facebook_groups": [],
+    },
+    "nyc": {
+        "city": "New York, NY",
+        "radius_km": 50,
+        "craigslist": ["newyork"],
+        "subreddits": [],
+        "facebook_groups": [],
+    },
+    "vancouver": {
+        "city": "Vancouver, BC",
+        "radius_km": 50,
+        "craigslist": ["vancouver"],
+        "subreddits": [],
+        "facebook_groups": [],
+    },
+}
+# Markets to scrape and send digests for, e.g. MARKETS=la,atlanta.
+ACTIVE_MARKETS: list[str] = [m.strip() for m in os.environ.get("MARKETS", "la").split(",") if m.strip()]
+# This market keeps the original seen-listings file and RECIPIENT_EMAIL.
+DEFAULT_MARKET: str = "la"
+# Another market's digest goes to RECIPIENT_EMAIL_<MARKET> (e.g.
+# RECIPIENT_EMAIL_NYC), or to RECIPIENT_EMAIL if that is unset.
+MARKET_RECIPIENTS: dict[str, list[str]] = {
+    name: [e.strip() for e in os.environ.get(f"RECIPIENT_EMAIL_{name.upper()}", "").split(",") if e.strip()]
+    for name in MARKETS
+}
 
 # --- Union filter ---
 NON_UNION_KEYWORDS: list[str] = [
@@ -34,8 +111,41 @@ NON_UNION_KEYWORDS: list[str] = [
 
 # --- Freshness ---
 FRESHNESS_HOURS: int = 48
+# A month/day with no year that is further than this in the past is read as
+# next year (a December post's "shoots Jan 5").
+DEADLINE_PAST_GRACE_DAYS: int = 60
+
+# --- Digest ---
+# Within each category the digest shows the DIGEST_TOP_K best listings, by a
+# weighted sum of features each scaled 0..1 (see ranking.py).
+DIGEST_TOP_K: int = int(os.environ.get("DIGEST_TOP_K", "15"))
+# Gmail clips HTML bodies over ~102KB; past this size each category shows
+# fewer listings.
+DIGEST_MAX_BYTES: int = 100_000
+# Style the HTML with one <style> block of shared classes instead of inline
+# styles on every element (~15% smaller; some older clients ignore it).
+DIGEST_COMPACT: bool = os.environ.get("DIGEST_COMPACT", "") == "1"
+RANKING_WEIGHTS: dict[str, float] = {
+    "category": 1.0,
+    "pay": 2.0,
+    "deadline": 1.0,
+    "source": 1.0,
+    "school": 1.5,
+    "freshness": 2.0,
+}
+# How much each source's listings are trusted to be real, current calls.
+SOURCE_RELIABILITY: dict[str, float] = {
+    "actors_access": 0.9,
+    "backstage": 0.9,
+    "casting_networks": 0.9,
+    "craigslist": 0.5,
+    "facebook": 0.4,
+    "reddit": 0.4,
+}
 
 # --- Scraper toggles ---
+# Sources are registered in scrapers/registry.py (or by installed plugins);
+# one not listed here runs unless its ScraperSpec says otherwise.
 SCRAPERS_ENABLED: dict[str, bool] = {
     "backstage": False,       # Needs live DOM selectors
     "casting_networks": False, # Needs live DOM selectors
@@ -45,9 +155,102 @@ SCRAPERS_ENABLED: dict[str, bool] = {
     "facebook": False,        # Requires cookies
 }
 
+# --- Daemon mode (`python main.py daemon`) ---
+# Each source's ScraperSpec sets its minutes between polls: fast-moving boards
+# are polled often, browser-driven sources are expensive and change slowly.
+# Override per source here, e.g. {"craigslist": 10}.
+POLL_INTERVAL_MINUTES: dict[str, int] = {}
+DEFAULT_POLL_INTERVAL_MINUTES: int = 60
+# How often the accumulated new listings are sent as one digest.
+DIGEST_INTERVAL_MINUTES: int = int(os.environ.get("DIGEST_INTERVAL_MINUTES", "1440"))
+
+# --- Run metrics (`python main.py stats`) ---
+# A source's latest YIELD_RECENT_RUNS successful runs parsing, on average,
+# under YIELD_DROP_RATIO of its median over the YIELD_BASELINE_DAYS before
+# is reported as a yield drop: usually a broken DOM selector.
+YIELD_RECENT_RUNS: int = 3
+YIELD_BASELINE_DAYS: int = 14
+YIELD_DROP_RATIO: float = 0.5
+# Sources whose baseline median is below this are too sparse to judge.
+YIELD_MIN_BASELINE: float = 5.0
+
+# --- Selector breakage (see breakage.py) ---
+# A run whose parser matched under BREAKAGE_DROP_RATIO of the candidates
+# (cards, rows) of its median over the last BREAKAGE_BASELINE_RUNS healthy
+# runs, or whose candidates lack a field BREAKAGE_FIELD_JUMP more often than
+# usual, is reported among the failed sources (its listings still go out)
+# and its pages are saved to BROKEN_PAGES_DIR. After BREAKAGE_ACCEPT_RUNS
+# flagged runs in a row, those runs become the new baseline.
+BREAKAGE_BASELINE_RUNS: int = 10
+BREAKAGE_MIN_RUNS: int = 3
+BREAKAGE_ACCEPT_RUNS: int = 5
+BREAKAGE_DROP_RATIO: float = 0.25
+BREAKAGE_FIELD_JUMP: float = 0.5
+# Sources usually matching fewer candidates than this are too sparse to judge.
+BREAKAGE_MIN_CANDIDATES: int = 5
+# Saved pages kept per source
+BROKEN_PAGES_KEEP: int = 20
+
+# --- Dashboard (`python main.py serve`) ---
+# Read-only web view and JSON API over the listing archive (see dashboard.py).
+DASHBOARD_HOST: str = os.environ.get("DASHBOARD_HOST", "127.0.0.1")
+DASHBOARD_PORT: int = int(os.environ.get("DASHBOARD_PORT", "8080"))
+DASHBOARD_PAGE_SIZE: int = 50
+DASHBOARD_MAX_PAGE_SIZE: int = 500
+# Days of per-day totals served by default, and how long they are cached.
+DASHBOARD_STATS_DAYS: int = 30
+DASHBOARD_CACHE_SECONDS: float = 60.0
+
+# --- Parsing ---
+# Worker processes for parsing scraped pages (1 parses inline, in-process).
+PARSE_WORKERS: int = int(os.environ.get("PARSE_WORKERS", str(min(os.cpu_count() or 1, 8))))
+# Starting the workers takes about half a second (each re-imports bs4), and
+# inline parsing runs at about 1 MB/s, so a scrape with less page text than
+# this is parsed inline unless the workers are already running (a daemon).
+PARSE_POOL_MIN_BYTES: int = 2_000_000
+# Parsed results of recently seen page bodies; an unchanged page isn't re-parsed.
+PARSE_CACHE_MAX_MB: int = 16
+
+# --- Rate limiting & retries (per host) ---
+# Sustained requests/second per host; bursts of up to RATE_LIMIT_BURST are allowed.
+RATE_LIMITS: dict[str, float] = {
+    "www.reddit.com": 0.5,
+}
+DEFAULT_RATE_LIMIT: float = 1.0
+RATE_LIMIT_BURST: int = 3
+HTTP_MAX_RETRIES: int = 3
+BACKOFF_BASE_SECONDS: float = 2.0
+BACKOFF_MAX_SECONDS: float = 60.0
+# A Retry-After longer than this is treated as a failure instead of waited out.
+MAX_RETRY_AFTER_SECONDS: float = 120.0
+
+# --- Circuit breaker (per source) ---
+# After this many consecutive failed runs a source is skipped for the cooldown.
+BREAKER_FAILURE_THRESHOLD: int = 3
+BREAKER_COOLDOWN_MINUTES: int = 6 * 60
+
 # --- Reddit ---
+# National subreddits; regional ones belong in their market (MARKETS)
 REDDIT_SUBREDDITS: list[str] = ["actingjobs", "filmmakers"]
 
+# --- Facebook ---
+# Each group's feed is scrolled until this many posts in a row were already
+# read (earlier in the run, or by a run in the last FACEBOOK_POSTS_DAYS),
+# sent, or older than FRESHNESS_HOURS, the feed stops growing for
+# FACEBOOK_IDLE_ROUNDS steps, or FACEBOOK_MAX_SCROLLS steps have run.
+FACEBOOK_MAX_SCROLLS: int = 15
+FACEBOOK_SCROLL_PAUSE_MS: int = 1500
+FACEBOOK_IDLE_ROUNDS: int = 3
+FACEBOOK_STOP_AFTER_KNOWN: int = 3
+FACEBOOK_POSTS_DAYS: int = 14
+
+# --- Actors Access ---
+# The logged-in session is reused across runs; the form login only runs when
+# the saved session is rejected. Index and breakdown pages load this many at
+# a time, in one browser context.
+ACTORS_ACCESS_CONCURRENCY: int = 4
+ACTORS_ACCESS_MAX_PAGES: int = 20
+
 # --- Profile filter (exclude listings that clearly don't match) ---
 EXCLUDE_KEYWORDS: list[str] = [
     # Gender-specific (not male)
@@ -71,5 +274,48 @@ EXCLUDE_KEYWORDS: list[str] = [
     "sportsbook promoter", "intern wanted",
 ]
 
+# --- Categorization rules ---
+# Ordered: the first matching rule decides a listing's CareerCategory. A rule
+# matches if the listing's role_type is one of "role_types", any of its
+# "keywords" appears in the title/description/school text, or — with
+# "schools": true — a top film school (models.TOP_FILM_SCHOOLS) is named.
+# Set CATEGORY_RULES_FILE to a JSON file {"rules": [...], "default": "..."}
+# to tune categories without a code change.
+CATEGORY_RULES: list[dict] = [
+    {"category": "STUDENT_FILM", "schools": True},
+    {"category": "PRINCIPAL", "role_types": ["principal", "lead", "supporting", "speaking"]},
+    {"category": "COMMERCIAL", "role_types": ["commercial"], "keywords": ["commercial"]},
+    {"category": "BACKGROUND", "role_types": ["background", "extra", "extras"]},
+    {"category": "OPEN_CALL", "role_types": ["open call"], "keywords": ["open call", "workshop"]},
+]
+CATEGORY_DEFAULT: str = "SHORT_INDIE"
+CATEGORY_RULES_FILE: str = os.environ.get("CATEGORY_RULES_FILE", "")
+
+# --- Seen listings (see dedup.py) ---
+# Days a sent listing's key stays in the seen file, so it isn't sent again;
+# Facebook groups repost the same call for weeks, so it needs a longer memory.
+SEEN_RETENTION_DAYS: int = 30
+SEEN_RETENTION_BY_SOURCE: dict[str, int] = {"facebook": 90}
+# Expired keys are compacted into a gzipped archive, kept this long, which
+# dedup still checks for keys missing from the seen file (0: no archive, so
+# keys are forgotten once past their retention).
+SEEN_ARCHIVE_DAYS: int = 365
+
 # --- Data ---
 SEEN_LISTINGS_PATH: str = "data/seen_listings.json"
+CIRCUIT_BREAKER_PATH: str = "data/circuit_breaker.json"
+# Contains recipient addresses; not committed (see .gitignore).
+OUTBOX_PATH: str = "data/outbox.json"
+# Keys of listings already alerted, so a restart doesn't alert them again.
+ALERTED_PATH: str = "data/alerted.json"
+# Archive of every scraped listing, for `python main.py query`.
+LISTINGS_DB_PATH: str = "data/listings.db"
+PARSE_CACHE_PATH: str = "data/parse_cache.db"
+# Per-source duration, size, yield and errors of every run.
+METRICS_DB_PATH: str = "data/metrics.db"
+# Gzipped page bodies from runs that looked broken, for offline debugging.
+BROKEN_PAGES_DIR: str = "data/broken_pages"
+# Ids of the Facebook posts recent runs have read.
+FACEBOOK_POSTS_PATH: str = "data/facebook_posts.json"
+# Session cookies; not committed (see .gitignore).
+ACTORS_ACCESS_STATE_PATH: str = "data/actors_access_state.json"
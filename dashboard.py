@@ -0,0 +1,327 @@
+# dashboard.py
+from __future__ import annotations
+
+import asyncio
+import html
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+
+from config import (
+    DASHBOARD_CACHE_SECONDS, DASHBOARD_MAX_PAGE_SIZE, DASHBOARD_PAGE_SIZE, DASHBOARD_STATS_DAYS,
+)
+from mailer.formatter import CATEGORY_LABELS
+from models import CastingListing, CareerCategory
+from store import ListingStore
+
+logger = logging.getLogger(__name__)
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+
+class _BadRequest(ValueError):
+    pass
+
+
+def _listing_json(listing: CastingListing) -> dict:
+    return {
+        "title": listing.title,
+        "source": listing.source,
+        "url": listing.url,
+        "posted_date": listing.posted_date.isoformat(),
+        "location": listing.location,
+        "category": listing.categorize().name.lower(),
+        "role_type": listing.role_type,
+        "union_status": listing.union_status,
+        "compensation": listing.compensation,
+        "deadline": listing.deadline.isoformat() if listing.deadline else None,
+        "school_or_production": listing.school_or_production,
+        "description": listing.description,
+        "how_to_apply": listing.how_to_apply,
+    }
+
+
+class Dashboard:
+    """Read-only ASGI app over the listing archive.
+
+    GET /api/listings  paginated JSON; filters category, source, since, until,
+                       page and per_page
+    GET /api/stats     listings first seen per day, by category and source
+    GET /              the same as an HTML page
+
+    It only reads the store, opened read-only so it never migrates or
+    recomputes rows under a running scraper: nothing here scrapes, and
+    per-day totals come from the store's daily_counts table, cached for
+    DASHBOARD_CACHE_SECONDS. The store is opened on the first request, on the
+    server's event loop thread; its indexed queries are quick enough to run
+    there directly. Listing links are only emitted for http(s) URLs.
+    """
+
+    def __init__(self, db_path: str, clock: Callable[[], float] = time.monotonic):
+        self._db_path = db_path
+        self._store: ListingStore | None = None
+        self._clock = clock
+        self._stats: tuple[float, date, list[dict]] | None = None
+
+    @property
+    def store(self) -> ListingStore:
+        if self._store is None:
+            self._store = ListingStore(self._db_path, read_only=True)
+        return self._store
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        params = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+        try:
+            if scope["method"] not in ("GET", "HEAD"):
+                status, content_type, body = HTTPStatus.METHOD_NOT_ALLOWED, "text/plain", b"GET only"
+            elif scope["path"] == "/api/listings":
+                status, content_type, body = HTTPStatus.OK, "application/json", _json(self.listings(params))
+            elif scope["path"] == "/api/stats":
+                status, content_type, body = HTTPStatus.OK, "application/json", _json(self.stats(params))
+            elif scope["path"] == "/":
+                status, content_type, body = HTTPStatus.OK, "text/html; charset=utf-8", self.page(params).encode()
+            else:
+                status, content_type, body = HTTPStatus.NOT_FOUND, "text/plain", b"Not found"
+        except _BadRequest as e:
+            status, content_type, body = HTTPStatus.BAD_REQUEST, "application/json", _json({"error": str(e)})
+        except Exception:
+            logger.exception(f"Dashboard request {scope['path']} failed")
+            status, content_type, body = HTTPStatus.INTERNAL_SERVER_ERROR, "text/plain", b"Internal error"
+
+        await send({
+            "type": "http.response.start",
+            "status": int(status),
+            "headers": [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def listings(self, params: dict[str, str]) -> dict:
+        page = _int(params, "page", 1, minimum=1)
+        per_page = min(_int(params, "per_page", DASHBOARD_PAGE_SIZE, minimum=1), DASHBOARD_MAX_PAGE_SIZE)
+        # One extra row says whether there is a next page, without a COUNT(*)
+        rows = self.store.query(
+            category=_category(params),
+            source=params.get("source") or None,
+            since=_date(params, "since"),
+            until=_date(params, "until"),
+            limit=per_page + 1,
+            offset=(page - 1) * per_page,
+        )
+        return {
+            "page": page,
+            "per_page": per_page,
+            "next_page": page + 1 if len(rows) > per_page else None,
+            "listings": [_listing_json(l) for l in rows[:per_page]],
+        }
+
+    def stats(self, params: dict[str, str]) -> dict:
+        days = _int(params, "days", DASHBOARD_STATS_DAYS, minimum=1)
+        today = date.today()
+        # Cached for the longest window asked for; shorter windows are a slice
+        if (self._stats is None or self._clock() - self._stats[0] > DASHBOARD_CACHE_SECONDS
+                or self._stats[1] != today or len(self._stats[2]) < days):
+            self._stats = (self._clock(), today, self._daily(today, max(days, DASHBOARD_STATS_DAYS)))
+        return {"days": self._stats[2][-days:]}
+
+    def _daily(self, today: date, days: int) -> list[dict]:
+        first = today - timedelta(days=days - 1)
+        totals: dict[date, dict] = {
+            first + timedelta(days=i): {"total": 0, "categories": defaultdict(int), "sources": defaultdict(int)}
+            for i in range(days)
+        }
+        for day, category, source, n in self.store.daily_counts(since=first):
+            if day in totals:
+                totals[day]["total"] += n
+                totals[day]["categories"][category.name.lower()] += n
+                totals[day]["sources"][source] += n
+        return [
+            {"date": day.isoformat(), "total": t["total"],
+             "categories": dict(t["categories"]), "sources": dict(t["sources"])}
+            for day, t in totals.items()
+        ]
+
+    def page(self, params: dict[str, str]) -> str:
+        data = self.listings(params)
+        days = self.stats({"days": "14"})["days"]
+        esc = html.escape
+
+        options = "".join(
+            f"<option value='{c.name.lower()}'{' selected' if params.get('category') == c.name.lower() else ''}>"
+            f"{esc(CATEGORY_LABELS[c])}</option>"
+            for c in CareerCategory
+        )
+        form = f"""<form>
+<select name="category"><option value="">All categories</option>{options}</select>
+<input name="source" placeholder="source" value="{esc(params.get('source', ''))}">
+<input name="since" type="date" value="{esc(params.get('since', ''))}">
+<input name="until" type="date" value="{esc(params.get('until', ''))}">
+<button>Filter</button>
+</form>"""
+
+        rows = "".join(
+            f"<tr><td>{l['posted_date']}</td><td>{esc(l['category'])}</td><td>{esc(l['source'])}</td>"
+            f"<td>{esc(l['location'])}</td><td>{_link(l['url'], l['title'])}</td></tr>"
+            for l in data["listings"]
+        )
+        pager = ""
+        if data["page"] > 1:
+            pager += f"<a href='?{esc(urlencode({**params, 'page': data['page'] - 1}))}'>&larr; Newer</a> "
+        if data["next_page"]:
+            pager += f"<a href='?{esc(urlencode({**params, 'page': data['next_page']}))}'>Older &rarr;</a>"
+
+        day_rows = "".join(
+            f"<tr><td>{d['date']}</td><td>{d['total']}</td>"
+            + "".join(f"<td>{d['categories'].get(c.name.lower(), 0)}</td>" for c in CareerCategory)
+            + "</tr>"
+            for d in reversed(days)
+        )
+        day_head = "".join(f"<th>{esc(c.name.lower().replace('_', ' '))}</th>" for c in CareerCategory)
+
+        return f"""<!doctype html>
+<html><head><meta charset="utf-8"><title>Casting Scout</title>
+<style>
+body{{font-family:Arial,sans-serif;margin:20px;color:#333}}
+table{{border-collapse:collapse;margin-bottom:24px}}
+td,th{{padding:4px 8px;border-bottom:1px solid #eee;text-align:left;font-size:14px}}
+a{{color:#1a73e8}}
+</style></head><body>
+<h1>Casting Scout</h1>
+{form}
+<h2>Listings</h2>
+<table><tr><th>Posted</th><th>Category</th><th>Source</th><th>Location</th><th>Title</th></tr>{rows}</table>
+<p>{pager}</p>
+<h2>Found per day</h2>
+<table><tr><th>Day</th><th>Total</th>{day_head}</tr>{day_rows}</table>
+</body></html>"""
+
+
+def _link(url: str, text: str) -> str:
+    """An escaped link to `url`, or just the text if it isn't http(s) (e.g. javascript:)."""
+    if urlsplit(url.strip()).scheme.lower() not in ("http", "https"):
+        return html.escape(text)
+    return f"<a href=\"{html.escape(url)}\">{html.escape(text)}</a>"
+
+
+def _json(data: dict) -> bytes:
+    return json.dumps(data).encode()
+
+
+def _int(params: dict[str, str], name: str, default: int, minimum: int) -> int:
+    try:
+        value = int(params.get(name) or default)
+    except ValueError:
+        raise _BadRequest(f"{name} must be a number") from None
+    if value < minimum:
+        raise _BadRequest(f"{name} must be at least {minimum}")
+    return value
+
+
+def _date(params: dict[str, str], name: str) -> date | None:
+    if not params.get(name):
+        return None
+    try:
+        return date.fromisoformat(params[name])
+    except ValueError:
+        raise _BadRequest(f"{name} must be a date (YYYY-MM-DD)") from None
+
+
+def _category(params: dict[str, str]) -> CareerCategory | None:
+    if not params.get("category"):
+        return None
+    try:
+        return CareerCategory[params["category"].upper()]
+    except KeyError:
+        raise _BadRequest(f"unknown category {params['category']!r}") from None
+
+
+def serve(app: Dashboard, host: str, port: int) -> None:
+    """Serve `app` with uvicorn if it is installed, else with a minimal
+    stdlib asyncio HTTP/1.1 server (GET only, one request per connection)."""
+    try:
+        import uvicorn
+    except ImportError:
+        uvicorn = None
+    if uvicorn is not None:
+        uvicorn.run(app, host=host, port=port)
+        return
+
+    logger.info(f"Dashboard at http://{host}:{port}/ (uvicorn not installed; using the stdlib server)")
+    try:
+        asyncio.run(_serve_stdlib(app, host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        app.close()
+
+
+async def _serve_stdlib(app: Dashboard, host: str, port: int) -> None:
+    server = await asyncio.start_server(lambda r, w: _handle(app, r, w), host, port)
+    async with server:
+        await server.serve_forever()
+
+
+async def _handle(app: Dashboard, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        method, target, _ = request_line.split(" ", 2)
+        headers = []
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers.append((name.strip().lower().encode(), value.strip().encode()))
+    except ValueError:
+        writer.close()
+        return
+
+    path, _, query = target.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": unquote(path), "raw_path": path.encode(),
+        "query_string": query.encode(), "headers": headers,
+        "client": writer.get_extra_info("peername"), "server": writer.get_extra_info("sockname"),
+    }
+    response: dict[str, Any] = {}
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            response.update(message)
+        elif message["type"] == "http.response.body":
+            status = HTTPStatus(response["status"])
+            head = [f"HTTP/1.1 {status.value} {status.phrase}"]
+            head += [f"{k.decode()}: {v.decode()}" for k, v in response.get("headers", [])]
+            head.append("connection: close")
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + message.get("body", b""))
+
+    await app(scope, receive, send)
+    await writer.drain()
+    writer.close()
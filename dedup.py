@@ -1,26 +1,76 @@
 # dedup.py
 from __future__ import annotations
 
+import gzip
 import json
+import logging
 from datetime import date, timedelta
 from pathlib import Path
 
+from config import SEEN_ARCHIVE_DAYS, SEEN_RETENTION_BY_SOURCE, SEEN_RETENTION_DAYS
 from models import CastingListing
 
+logger = logging.getLogger(__name__)
+
 
 class Deduplicator:
-    def __init__(self, seen_path: str):
+    """Keys of listings already sent, in per-day segments.
+
+    The seen file maps day -> source -> keys marked that day, so expiry drops
+    whole segments: a source's segment goes once it is older than that
+    source's retention (`retention`, else `default_retention` days), and only
+    one date per day is compared, never one per key. Expired segments are
+    compacted into gzipped monthly files under `<seen file>_archive/`, kept
+    for `archive_days`; a key found there still counts as seen, so the
+    archive is only read when a key is missing from the seen file. A legacy
+    flat {key: day} file is read as segments of an unknown source.
+    """
+
+    def __init__(
+        self,
+        seen_path: str,
+        retention: dict[str, int] | None = None,
+        default_retention: int = SEEN_RETENTION_DAYS,
+        archive_days: int = SEEN_ARCHIVE_DAYS,
+    ):
         self._path = Path(seen_path)
-        self._seen: dict[str, str] = self._load()
+        self._archive_dir = self._path.with_name(f"{self._path.stem}_archive")
+        self._retention = SEEN_RETENTION_BY_SOURCE if retention is None else retention
+        self._default_retention = default_retention
+        self._archive_days = archive_days
+        # day -> source -> keys, oldest day first; and key -> latest day
+        self._days: dict[str, dict[str, list[str]]] = {}
+        self._seen: dict[str, str] = {}
+        self._archived: dict[str, str] | None = None  # loaded on the first miss
+        self._load()
 
-    def _load(self) -> dict[str, str]:
-        if self._path.exists():
-            return json.loads(self._path.read_text())
-        return {}
+    def _load(self) -> None:
+        if not self._path.exists():
+            return
+        data = json.loads(self._path.read_text())
+        if any(isinstance(v, str) for v in data.values()):
+            logger.info(f"Converting {self._path} to per-day segments")
+            days: dict[str, dict[str, list[str]]] = {}
+            for key, day in data.items():
+                days.setdefault(day, {}).setdefault("", []).append(key)
+            data = days
+        for day in sorted(data):
+            self._days[day] = data[day]
+            for keys in data[day].values():
+                self._seen.update(dict.fromkeys(keys, day))
 
     def _save(self) -> None:
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._path.write_text(json.dumps(self._seen, indent=2))
+        self._path.write_text(json.dumps(self._days, indent=2))
+
+    def flush(self) -> None:
+        """Persist the in-memory seen map (used on daemon shutdown)."""
+        self._save()
+
+    def is_seen(self, key: str) -> bool:
+        """Whether a listing with this dedup key has already been sent, in
+        the retention window or, past it, the archive."""
+        return key in self._seen or key in self._archive()
 
     def deduplicate(self, listings: list[CastingListing]) -> list[CastingListing]:
         """Return only listings not previously seen. Also dedup within the batch."""
@@ -28,7 +78,7 @@ class Deduplicator:
         seen_in_batch: set[str] = set()
         for listing in listings:
             key = listing.dedup_key()
-            if key not in self._seen and key not in seen_in_batch:
+            if key not in seen_in_batch and not self.is_seen(key):
                 result.append(listing)
                 seen_in_batch.add(key)
         return result
@@ -36,15 +86,78 @@ class Deduplicator:
     def mark_seen(self, listings: list[CastingListing]) -> None:
         """Record listings as seen and persist to disk."""
         today = date.today().isoformat()
+        segment = self._days.setdefault(today, {})
         for listing in listings:
-            self._seen[listing.dedup_key()] = today
+            key = listing.dedup_key()
+            if self._seen.get(key) != today:
+                segment.setdefault(listing.source, []).append(key)
+                self._seen[key] = today
+        if not segment:
+            del self._days[today]
         self._save()
 
-    def cleanup(self, max_age_days: int = 30) -> None:
-        """Remove seen entries older than max_age_days."""
-        cutoff = date.today() - timedelta(days=max_age_days)
-        self._seen = {
-            k: v for k, v in self._seen.items()
-            if date.fromisoformat(v) >= cutoff
-        }
+    def retention_days(self, source: str) -> int:
+        return self._retention.get(source, self._default_retention)
+
+    def cleanup(self, max_age_days: int | None = None, today: date | None = None) -> None:
+        """Expire segments older than their source's retention (or, if given,
+        `max_age_days` for every source) into the archive."""
+        today = today or date.today()
+        shortest = max_age_days if max_age_days is not None else min(
+            [self._default_retention, *self._retention.values()]
+        )
+        expired: dict[str, list[str]] = {}
+        for day in list(self._days):
+            age = (today - date.fromisoformat(day)).days
+            if age <= shortest:
+                break  # days are in order, so the rest are newer
+            segment = self._days[day]
+            for source in list(segment):
+                if age > (max_age_days if max_age_days is not None else self.retention_days(source)):
+                    keys = segment.pop(source)
+                    expired.setdefault(day, []).extend(keys)
+                    for key in keys:
+                        if self._seen.get(key) == day:
+                            del self._seen[key]
+            if not segment:
+                del self._days[day]
+        if not expired:
+            return
         self._save()
+        if self._archive_days > 0:
+            self._compact(expired, today)
+        logger.info(f"Expired {sum(map(len, expired.values()))} seen keys from {len(expired)} day(s)")
+
+    def _compact(self, expired: dict[str, list[str]], today: date) -> None:
+        """Merge expired segments into their months' archive files, and drop
+        months past archive_days."""
+        self._archive_dir.mkdir(parents=True, exist_ok=True)
+        by_month: dict[str, dict[str, list[str]]] = {}
+        for day, keys in expired.items():
+            by_month.setdefault(day[:7], {})[day] = keys
+        for month, days in by_month.items():
+            path = self._archive_dir / f"{month}.json.gz"
+            merged = json.loads(gzip.decompress(path.read_bytes())) if path.exists() else {}
+            for day, keys in days.items():
+                merged[day] = list(dict.fromkeys([*merged.get(day, []), *keys]))
+            path.write_bytes(gzip.compress(json.dumps(merged, separators=(",", ":")).encode()))
+            if self._archived is not None:
+                for day, keys in days.items():
+                    for key in keys:
+                        if self._archived.get(key, "") < day:
+                            self._archived[key] = day
+
+        oldest = (today - timedelta(days=self._archive_days)).isoformat()[:7]
+        for path in self._archive_dir.glob("*.json.gz"):
+            if path.name[:7] < oldest:
+                path.unlink()
+                self._archived = None
+
+    def _archive(self) -> dict[str, str]:
+        """key -> last day, over every archive file."""
+        if self._archived is None:
+            self._archived = {}
+            for path in sorted(self._archive_dir.glob("*.json.gz")):
+                for day, keys in sorted(json.loads(gzip.decompress(path.read_bytes())).items()):
+                    self._archived.update(dict.fromkeys(keys, day))
+        return self._archived
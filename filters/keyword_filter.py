@@ -3,28 +3,37 @@ from __future__ import annotations
 
 from datetime import date, timedelta
 
-from config import LA_METRO_LOCATIONS, NON_UNION_KEYWORDS, FRESHNESS_HOURS, EXCLUDE_KEYWORDS
+from config import NON_UNION_KEYWORDS, FRESHNESS_HOURS, EXCLUDE_KEYWORDS
+from markets import LocationRouter, default_router
 from models import CastingListing
 
 
 class KeywordFilter:
-    """V1 filter: keyword matching on location, union status, freshness, deadline, and profile."""
+    """V1 filter: keyword matching on location, union status, freshness, deadline, and profile.
+
+    A listing passes the location check if it belongs to an active market
+    (see markets.LocationRouter).
+    """
+
+    def __init__(self, router: LocationRouter | None = None):
+        self._router = router or default_router()
 
     def filter(self, listings: list[CastingListing]) -> list[CastingListing]:
         return [l for l in listings if self._passes(l)]
 
     def _passes(self, listing: CastingListing) -> bool:
+        # Cheap date comparisons first, so stale and expired calls never reach
+        # the text scans below.
         return (
-            self._location_ok(listing)
-            and self._union_ok(listing)
-            and self._fresh_enough(listing)
+            self._fresh_enough(listing)
             and self._not_expired(listing)
+            and self._location_ok(listing)
+            and self._union_ok(listing)
             and self._profile_ok(listing)
         )
 
     def _location_ok(self, listing: CastingListing) -> bool:
-        loc = listing.location.lower()
-        return any(city in loc for city in LA_METRO_LOCATIONS)
+        return bool(self._router.route(listing))
 
     def _union_ok(self, listing: CastingListing) -> bool:
         status = listing.union_status.lower().strip()
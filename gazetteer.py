@@ -0,0 +1,131 @@
+# gazetteer.py
+from __future__ import annotations
+
+import csv
+import hashlib
+import math
+import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+
+from config import GAZETTEER_PATH
+
+_PUNCTUATION = ",.;:!?()[]{}<>\"'`*~|"
+
+# A US ZIP (its first three digits) or a Canadian postal code (its first two characters)
+_ZIP_RE = re.compile(r"(?<![\d$,.])(\d{3})\d{2}(?:-\d{4})?(?!\d)|\b([a-z]\d)[a-z] ?\d[a-z]\d\b")
+
+# Within one text the most specific name wins: a ZIP, then a neighbourhood or
+# nearby city, then a market's own city name ("Studio City, LA" -> Studio City).
+_KIND_RANK = {"zip": 0, "place": 1, "city": 2}
+
+_CACHE_SIZE = 4096
+
+
+def words(lowered: str) -> list[str]:
+    """Split lowercased text into words the way every place/term index expects."""
+    return [w.strip(_PUNCTUATION) for w in lowered.replace("/", " ").split()]
+
+
+class Place(NamedTuple):
+    name: str  # canonical "City, ST"
+    lat: float
+    lon: float
+
+
+def distance_km(a: Place, b: Place) -> float:
+    """Great-circle distance between two places."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a.lat, a.lon, b.lat, b.lon))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(h))
+
+
+class Gazetteer:
+    """Place names, aliases and postal prefixes -> canonical place with coordinates.
+
+    Names are indexed by their first word (the top level of a word trie; the
+    few multi-word names sharing a first word are compared directly), so
+    normalizing a location is one split and a dict lookup per word, however
+    many names there are. The table is small enough to load into memory.
+    """
+
+    def __init__(self, rows: Iterable[tuple[str, str, str, float, float]]):
+        self._places: dict[str, Place] = {}
+        self._zips: dict[str, Place] = {}
+        self._names: dict[str, list[str]] = {}  # canonical name -> its names
+        self._ranks: dict[str, int] = {}
+        self._index: dict[str, list[tuple[tuple[str, ...], int, Place]]] = {}
+        digest = hashlib.sha256()
+        for name, canonical, kind, lat, lon in rows:
+            digest.update(f"{name}\0{canonical}\0{kind}\0{lat}\0{lon}\n".encode())
+            place = self._places.setdefault(canonical, Place(canonical, float(lat), float(lon)))
+            if kind == "zip":
+                self._zips[name.removeprefix("zip:")] = place
+                continue
+            self._names.setdefault(canonical, []).append(name)
+            self._ranks[canonical] = _KIND_RANK[kind]
+            first, *rest = words(name.lower())
+            self._index.setdefault(first, []).append((tuple(rest), _KIND_RANK[kind], place))
+        for entries in self._index.values():
+            entries.sort(key=lambda e: len(e[0]), reverse=True)
+        # Identifies the places, so locations normalized with others can be redone
+        self.fingerprint = digest.hexdigest()[:16]
+        # Scraped locations repeat a lot ("Los Angeles, CA"), so most lookups are a hit
+        self._cache: dict[str, Place | None] = {}
+
+    @classmethod
+    def load(cls, path: str) -> Gazetteer:
+        with open(path, newline="") as f:
+            reader = csv.reader(line for line in f if not line.startswith("#"))
+            next(reader)  # header
+            return cls(tuple(row) for row in reader if row)
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    def place(self, name: str) -> Place | None:
+        """The place with this canonical name."""
+        return self._places.get(name)
+
+    def lookup(self, text: str) -> Place | None:
+        """The most specific place named in `text`, if any."""
+        try:
+            return self._cache[text]
+        except KeyError:
+            if len(self._cache) >= _CACHE_SIZE:
+                self._cache.clear()
+            place = self._cache[text] = self._lookup(text)
+            return place
+
+    def places(self) -> list[Place]:
+        return list(self._places.values())
+
+    def terms(self) -> list[tuple[str, tuple[str, ...]]]:
+        """(canonical name, its names) for every named place, most specific kind first."""
+        return [(name, tuple(names))
+                for name, names in sorted(self._names.items(), key=lambda item: self._ranks[item[0]])]
+
+    def _lookup(self, text: str) -> Place | None:
+        lowered = text.lower()
+        zip_match = _ZIP_RE.search(lowered)
+        if zip_match:
+            place = self._zips.get(zip_match.group(1) or zip_match.group(2))
+            if place is not None:
+                return place
+
+        best: Place | None = None
+        best_rank = len(_KIND_RANK)
+        found = words(lowered)
+        for i, word in enumerate(found):
+            for rest, rank, place in self._index.get(word, ()):
+                if tuple(found[i + 1:i + 1 + len(rest)]) == rest:
+                    # The longest name starting here; "manhattan beach", not "manhattan"
+                    if rank < best_rank:
+                        best, best_rank = place, rank
+                    break
+        return best
+
+
+@lru_cache(maxsize=1)
+def default_gazetteer() -> Gazetteer:
+    return Gazetteer.load(GAZETTEER_PATH)
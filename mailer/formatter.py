@@ -1,10 +1,14 @@
 # mailer/formatter.py
 from __future__ import annotations
 
+from collections import Counter
 from datetime import date
-from itertools import groupby
+from typing import NamedTuple
 
+from config import DIGEST_COMPACT, DIGEST_MAX_BYTES, DIGEST_TOP_K
 from models import CastingListing, CareerCategory
+from ranking import default_ranker
+from rules import categorize_all
 
 CATEGORY_LABELS = {
     CareerCategory.PRINCIPAL: "Principal / Speaking Roles",
@@ -24,98 +28,219 @@ CATEGORY_DESCRIPTIONS = {
     CareerCategory.OPEN_CALL: "Networking & practice",
 }
 
+# Every element's look, by class name. The full digest repeats these as
+# inline styles; the compact one declares them once in a <style> block.
+_STYLES = {
+    "body": "font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;",
+    "h1": "color: #333;",
+    "muted": "color:#666;",
+    "rule": "border: 1px solid #eee;",
+    "section": "margin-bottom: 24px;",
+    "h2": "color:#333; border-bottom: 2px solid #1a73e8; padding-bottom: 4px;",
+    "desc": "color:#666; margin-top:0; font-size:14px;",
+    "card": "margin-bottom: 16px; padding: 12px; background: #f9f9f9; border-radius: 8px;",
+    "badge": "background:#4CAF50;color:white;padding:2px 6px;border-radius:3px;font-size:12px;",
+    "blurb": "color:#444; font-size: 14px;",
+    "link": "color:#1a73e8;",
+    "note": "color:#888; font-size:13px;",
+    "footer": "color:#999; font-size:12px;",
+}
+
+# name -> the element attribute that applies it, per mode
+_ATTRS = {
+    False: {name: f'style="{css}"' for name, css in _STYLES.items()},
+    True: {name: f'class="{name}"' for name in _STYLES},
+}
+
+_COMPACT_CSS = "<head><style>" + "".join(
+    f".{name}{{{css.replace(': ', ':').replace('; ', ';')}}}" for name, css in _STYLES.items()
+) + "</style></head>"
+
+# Room kept for a section's closing tags and its "+ N more" note
+_SECTION_TAIL_BYTES = 200
+
+
+class Digest(NamedTuple):
+    subject: str
+    html: str
+    text: str  # the text/plain alternative
+    # The listings shown in it; the rest (past DIGEST_TOP_K or the size
+    # budget) were only counted ("+ N more") and are left for a later digest
+    shown: tuple[CastingListing, ...] = ()
+
 
 def format_digest(
     listings: list[CastingListing],
     failed_sources: list[str] | None = None,
+    market: str | None = None,
 ) -> tuple[str, str]:
-    """Format listings into an email subject and HTML body.
+    """Format listings into an email subject and HTML body (see render_digest).
 
     Returns:
         (subject, html_body)
     """
+    digest = render_digest(listings, failed_sources, market)
+    return digest.subject, digest.html
+
+
+def render_digest(
+    listings: list[CastingListing],
+    failed_sources: list[str] | None = None,
+    market: str | None = None,
+    compact: bool = DIGEST_COMPACT,
+    max_bytes: int = DIGEST_MAX_BYTES,
+) -> Digest:
+    """Format listings into a subject, an HTML body and a plain-text body.
+
+    `market` names the digest's city ("Atlanta") when several markets are sent.
+    Each category shows its config.DIGEST_TOP_K best listings (see ranking.py),
+    best first, and says how many more there were. `compact` styles the HTML
+    with shared CSS classes instead of inline styles. The HTML is kept under
+    about `max_bytes` by showing fewer listings per category; each category
+    still shows its best one. Only the `shown` listings should be marked seen.
+    """
     today = date.today().strftime("%b %d")
     count = len(listings)
+    where = f" in {market}" if market else ""
 
     if count == 0:
-        subject = f"Casting Scout — No New Opportunities ({today})"
-        html = _empty_template(today, failed_sources)
-        return subject, html
+        subject = f"Casting Scout — No New Opportunities{where} ({today})"
+        return Digest(subject, *_empty_template(today, failed_sources, compact))
 
-    subject = f"Casting Scout — {count} New Opportunit{'y' if count == 1 else 'ies'} ({today})"
+    subject = f"Casting Scout — {count} New Opportunit{'y' if count == 1 else 'ies'}{where} ({today})"
 
-    # Sort and group by career category
-    sorted_listings = sorted(listings, key=lambda l: l.categorize().value)
-    grouped = {}
-    for cat, group in groupby(sorted_listings, key=lambda l: l.categorize()):
-        grouped[cat] = list(group)
+    categories = categorize_all(listings)
+    grouped = default_ranker().top_k(listings, DIGEST_TOP_K, categories)
+    totals = Counter(categories)
 
-    html = _build_html(today, count, grouped, failed_sources)
-    return subject, html
+    html, text, shown = _build(today, count, grouped, totals, failed_sources, market or "LA", compact, max_bytes)
+    return Digest(subject, html, text, tuple(shown))
 
 
-def _empty_template(today: str, failed_sources: list[str] | None) -> str:
-    fail_note = ""
+def _empty_template(today: str, failed_sources: list[str] | None, compact: bool) -> tuple[str, str]:
+    a = _ATTRS[compact]
+    fail_note = fail_text = ""
     if failed_sources:
-        fail_note = f"<p style='color:#888;'>Note: {', '.join(failed_sources)} were unavailable today.</p>"
-    return f"""<html><body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-<h1 style="color: #333;">Casting Scout</h1>
-<p>No new casting opportunities found today ({today}). Keep checking your direct sources!</p>
+        fail_note = f"<p {a['note']}>Note: {', '.join(failed_sources)} were unavailable today.</p>"
+        fail_text = f"\n\nNote: {', '.join(failed_sources)} were unavailable today."
+    message = f"No new casting opportunities found today ({today}). Keep checking your direct sources!"
+    html = f"""<html>{_COMPACT_CSS if compact else ""}<body {a['body']}>
+<h1 {a['h1']}>Casting Scout</h1>
+<p>{message}</p>
 {fail_note}
 </body></html>"""
+    return html, f"Casting Scout\n\n{message}{fail_text}\n"
 
 
-def _build_html(
+def _build(
     today: str,
     count: int,
     grouped: dict[CareerCategory, list[CastingListing]],
+    totals: dict[CareerCategory, int],
     failed_sources: list[str] | None,
-) -> str:
-    sections = []
+    market: str,
+    compact: bool,
+    max_bytes: int,
+) -> tuple[str, str, list[CastingListing]]:
+    """Render the HTML and text bodies together, one listing at a time.
+    Also returns the listings that fit."""
+    a = _ATTRS[compact]
+    opportunities = f"opportunit{'y' if count == 1 else 'ies'}"
+
+    fail_note = fail_text = ""
+    if failed_sources:
+        fail_note = f"<p {a['note']}>Unavailable today: {', '.join(failed_sources)}</p>"
+        fail_text = f"Unavailable today: {', '.join(failed_sources)}\n\n"
+
+    head = f"""<html>{_COMPACT_CSS if compact else ""}<body {a['body']}>
+<h1 {a['h1']}>Casting Scout</h1>
+<p {a['muted']}>{count} new {opportunities} found — {today}</p>
+<hr {a['rule']}>
+"""
+    tail = f"""
+{fail_note}
+<hr {a['rule']}>
+<p {a['footer']}>Casting Scout — your daily {market} casting digest</p>
+</body></html>"""
+    html_parts = [head]
+    text_parts = [f"Casting Scout — {count} new {opportunities} — {today}\n\n"]
+
+    # Each category may spend an equal share of what's left of the budget;
+    # what one doesn't use rolls over to the next.
+    remaining = max_bytes - len(head.encode()) - len(tail.encode())
+    sections = [cat for cat in CareerCategory if cat in grouped]
     listing_num = 0
+    shown: list[CastingListing] = []
 
-    for cat in CareerCategory:
-        if cat not in grouped:
-            continue
-        cat_listings = grouped[cat]
+    for n, cat in enumerate(sections):
         label = CATEGORY_LABELS[cat]
         desc = CATEGORY_DESCRIPTIONS[cat]
-        items = []
-        for listing in cat_listings:
+        section_head = f"""
+        <div {a['section']}>
+            <h2 {a['h2']}>{label}</h2>
+            <p {a['desc']}>{desc}</p>"""
+        share = remaining // (len(sections) - n)
+        spent = len(section_head.encode()) + _SECTION_TAIL_BYTES
+        items, item_texts = [], []
+        for listing in grouped[cat]:
+            item = _item_html(listing, listing_num + 1, a)
+            size = len(item.encode())
+            if items and spent + size > share:
+                break
+            spent += size
             listing_num += 1
-            school_badge = ""
-            if listing.school_or_production:
-                school_badge = f" <span style='background:#4CAF50;color:white;padding:2px 6px;border-radius:3px;font-size:12px;'>{listing.school_or_production}</span>"
-
-            comp = f"<br>Compensation: {listing.compensation}" if listing.compensation else ""
-            deadline = f" | Deadline: {listing.deadline.strftime('%b %d')}" if listing.deadline else ""
-
-            items.append(f"""
-            <div style="margin-bottom: 16px; padding: 12px; background: #f9f9f9; border-radius: 8px;">
-                <strong>{listing_num}. {listing.title}</strong>{school_badge}<br>
-                Location: {listing.location} | Role: {listing.role_type.title()}{comp}<br>
-                <span style="color:#666;">Source: {listing.source.title()}{deadline}</span><br>
-                <span style="color:#444; font-size: 14px;">{listing.description[:200]}{'...' if len(listing.description) > 200 else ''}</span><br>
-                <a href="{listing.url}" style="color:#1a73e8;">Apply / View Details</a>
-            </div>""")
-
-        sections.append(f"""
-        <div style="margin-bottom: 24px;">
-            <h2 style="color:#333; border-bottom: 2px solid #1a73e8; padding-bottom: 4px;">{label}</h2>
-            <p style="color:#666; margin-top:0; font-size:14px;">{desc}</p>
+            items.append(item)
+            item_texts.append(_item_text(listing, listing_num))
+            shown.append(listing)
+        remaining -= spent
+
+        more = more_text = ""
+        hidden = totals[cat] - len(items)
+        if hidden:
+            more = f"<p {a['note']}>+ {hidden} more {label.lower()} not shown</p>"
+            more_text = f"+ {hidden} more not shown\n\n"
+
+        html_parts.append(f"""{section_head}
             {''.join(items)}
+            {more}
         </div>""")
+        text_parts.append(f"{label.upper()}\n{desc}\n\n{''.join(item_texts)}{more_text}")
 
-    fail_note = ""
-    if failed_sources:
-        fail_note = f"<p style='color:#888; font-size:13px;'>Unavailable today: {', '.join(failed_sources)}</p>"
+    html_parts.append(tail)
+    text_parts.append(f"{fail_text}Casting Scout — your daily {market} casting digest\n")
+    return "".join(html_parts), "".join(text_parts), shown
 
-    return f"""<html><body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
-<h1 style="color: #333;">Casting Scout</h1>
-<p style="color:#666;">{count} new opportunit{'y' if count == 1 else 'ies'} found — {today}</p>
-<hr style="border: 1px solid #eee;">
-{''.join(sections)}
-{fail_note}
-<hr style="border: 1px solid #eee;">
-<p style="color:#999; font-size:12px;">Casting Scout — your daily LA casting digest</p>
-</body></html>"""
+
+def _blurb(listing: CastingListing) -> str:
+    return f"{listing.description[:200]}{'...' if len(listing.description) > 200 else ''}"
+
+
+def _item_html(listing: CastingListing, num: int, a: dict[str, str]) -> str:
+    school_badge = ""
+    if listing.school_or_production:
+        school_badge = f" <span {a['badge']}>{listing.school_or_production}</span>"
+
+    comp = f"<br>Compensation: {listing.compensation}" if listing.compensation else ""
+    deadline = f" | Deadline: {listing.deadline.strftime('%b %d')}" if listing.deadline else ""
+
+    return f"""
+            <div {a['card']}>
+                <strong>{num}. {listing.title}</strong>{school_badge}<br>
+                Location: {listing.location} | Role: {listing.role_type.title()}{comp}<br>
+                <span {a['muted']}>Source: {listing.source.title()}{deadline}</span><br>
+                <span {a['blurb']}>{_blurb(listing)}</span><br>
+                <a href="{listing.url}" {a['link']}>Apply / View Details</a>
+            </div>"""
+
+
+def _item_text(listing: CastingListing, num: int) -> str:
+    school = f" [{listing.school_or_production}]" if listing.school_or_production else ""
+    comp = f" | {listing.compensation}" if listing.compensation else ""
+    deadline = f" | Deadline: {listing.deadline.strftime('%b %d')}" if listing.deadline else ""
+    return (
+        f"{num}. {listing.title}{school}\n"
+        f"   {listing.location} | {listing.role_type.title()}{comp}\n"
+        f"   Source: {listing.source.title()}{deadline}\n"
+        f"   {_blurb(listing)}\n"
+        f"   {listing.url}\n\n"
+    )
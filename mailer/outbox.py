@@ -0,0 +1,172 @@
+# mailer/outbox.py
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENT = "sent"
+DEAD = "dead"
+
+
+@dataclass
+class OutboxEntry:
+    id: str
+    subject: str
+    html: str
+    to_email: str
+    from_email: str
+    created_at: str
+    next_attempt: str
+    attempts: int = 0
+    status: str = PENDING
+    sent_at: str | None = None
+    text: str = ""  # text/plain alternative; entries queued before it have none
+
+
+def digest_id(subject: str, html: str, to_email: str) -> str:
+    """Idempotency key: the same digest to the same recipient is only sent once."""
+    raw = f"{to_email}|{subject}|{html}".lower()
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+class Outbox:
+    """Persistent queue of outgoing digests with retry and backoff.
+
+    Entries survive across runs, so a failed send is retried by the next run
+    (or the daemon's next tick) instead of blocking the current one.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int,
+        backoff_base: timedelta,
+        backoff_max: timedelta,
+    ):
+        self._path = Path(path)
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._entries: dict[str, OutboxEntry] = self._load()
+
+    def _load(self) -> dict[str, OutboxEntry]:
+        if self._path.exists():
+            raw = json.loads(self._path.read_text())
+            return {e["id"]: OutboxEntry(**e) for e in raw}
+        return {}
+
+    def _save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        data = [asdict(e) for e in self._entries.values()]
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2))
+        tmp.replace(self._path)
+
+    @property
+    def entries(self) -> list[OutboxEntry]:
+        return list(self._entries.values())
+
+    def enqueue(self, subject: str, html: str, to_email: str, from_email: str,
+                text: str = "", now: datetime | None = None) -> str:
+        """Queue a digest for delivery. Re-queuing an identical digest is a no-op."""
+        key = digest_id(subject, html, to_email)
+        if key in self._entries:
+            logger.info(f"Digest {key} already queued ({self._entries[key].status})")
+            return key
+        stamp = (now or datetime.now()).isoformat(timespec="seconds")
+        self._entries[key] = OutboxEntry(
+            id=key, subject=subject, html=html, to_email=to_email, from_email=from_email,
+            created_at=stamp, next_attempt=stamp, text=text,
+        )
+        self._save()
+        return key
+
+    def due(self, now: datetime | None = None) -> list[OutboxEntry]:
+        now = now or datetime.now()
+        return [
+            e for e in self._entries.values()
+            if e.status == PENDING and datetime.fromisoformat(e.next_attempt) <= now
+        ]
+
+    def drain(
+        self,
+        send: Callable[[list[OutboxEntry]], dict[str, bool]],
+        now: datetime | None = None,
+        workers: int = 4,
+    ) -> tuple[int, int]:
+        """Attempt every due entry once. Returns (sent, still_pending).
+
+        Due entries with identical content are handed to `send` together so
+        they can go out as one multi-recipient request; `send` returns
+        {to_email: delivered}. Distinct digests are sent concurrently. Each
+        group's result is persisted as soon as it arrives, so a crash mid-drain
+        never causes an already-delivered digest to be sent again.
+        """
+        now = now or datetime.now()
+        due = self.due(now)
+        if not due:
+            return 0, self._count_pending()
+
+        groups: dict[tuple[str, str, str, str], list[OutboxEntry]] = {}
+        for entry in due:
+            groups.setdefault((entry.subject, entry.html, entry.text, entry.from_email), []).append(entry)
+
+        def attempt(group: list[OutboxEntry]) -> None:
+            try:
+                results = send(group)
+            except Exception:
+                logger.exception(f"Sending digest to {len(group)} recipient(s) failed")
+                results = {}
+            with self._lock:
+                for entry in group:
+                    self._record(entry, results.get(entry.to_email, False), now)
+                self._save()
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(groups)))) as pool:
+            list(pool.map(attempt, groups.values()))
+
+        sent = sum(1 for e in due if e.status == SENT)
+        return sent, self._count_pending()
+
+    def _record(self, entry: OutboxEntry, ok: bool, now: datetime) -> None:
+        entry.attempts += 1
+        if ok:
+            entry.status = SENT
+            entry.sent_at = now.isoformat(timespec="seconds")
+            logger.info(f"Digest {entry.id} delivered to {entry.to_email}")
+        elif entry.attempts >= self._max_attempts:
+            entry.status = DEAD
+            logger.error(f"Digest {entry.id} to {entry.to_email} dropped after {entry.attempts} attempts")
+        else:
+            delay = min(self._backoff_max, self._backoff_base * 2 ** (entry.attempts - 1))
+            delay *= random.uniform(0.5, 1.0)
+            entry.next_attempt = (now + delay).isoformat(timespec="seconds")
+            logger.warning(f"Digest {entry.id} failed (attempt {entry.attempts}); "
+                           f"retrying after {entry.next_attempt}")
+
+    def _count_pending(self) -> int:
+        return sum(1 for e in self._entries.values() if e.status == PENDING)
+
+    def prune(self, max_age_days: int = 14, now: datetime | None = None) -> None:
+        """Forget sent/dead entries older than max_age_days (keeps pending ones)."""
+        cutoff = (now or datetime.now()) - timedelta(days=max_age_days)
+        stale = [
+            k for k, e in self._entries.items()
+            if e.status != PENDING and datetime.fromisoformat(e.created_at) < cutoff
+        ]
+        if stale:
+            for k in stale:
+                del self._entries[k]
+            self._save()
@@ -1,14 +1,40 @@
 # mailer/sender.py
 from __future__ import annotations
 
+import json
 import logging
-import time
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+if TYPE_CHECKING:
+    from sendgrid import SendGridAPIClient
+    from sendgrid.helpers.mail import Mail
 
 logger = logging.getLogger(__name__)
 
+SENDGRID_HOST = "https://api.sendgrid.com"
+DIGEST_ID_HEADER = "X-Casting-Scout-Digest-Id"
+# SendGrid accepts at most 1000 personalizations per mail/send request.
+MAX_PERSONALIZATIONS = 1000
+
+_EMAIL_RE = re.compile(r"^[^@\s,;<>]+@[^@\s,;<>]+\.[^@\s,;<>]+$")
+# The "field" of a 400 error about one recipient, e.g. "personalizations.3.to.0.email"
+_RECIPIENT_FIELD_RE = re.compile(r"^personalizations\.(\d+)\.(?:to|cc|bcc)\b")
+
+
+@lru_cache(maxsize=4)
+def get_client(api_key: str, host: str = SENDGRID_HOST) -> SendGridAPIClient:
+    """Return a SendGrid client, cached per key/host so it is built once.
+
+    Only the client object is reused: it sends through urllib, which opens a
+    new HTTPS connection for every request, so batching recipients into few
+    requests (see send_batch) is what saves round trips.
+    """
+    # sendgrid is heavy to import; only pay for it when actually sending.
+    from sendgrid import SendGridAPIClient
+    return SendGridAPIClient(api_key=api_key, host=host)
+
 
 def send_email(
     subject: str,
@@ -16,24 +42,116 @@ def send_email(
     api_key: str,
     to_email: str,
     from_email: str = "castingscout@noreply.com",
-    retry: bool = True,
+    host: str = SENDGRID_HOST,
+    digest_id: str | None = None,
 ) -> bool:
-    """Send an HTML email via SendGrid. Returns True on success."""
+    """Send an HTML email via SendGrid in a single attempt. Returns True on success.
+
+    Retries are the outbox's job (see mailer.outbox); this never sleeps.
+    """
+    results = send_batch(
+        subject, html_body, api_key, {to_email: digest_id}, from_email, host,
+    )
+    return results[to_email]
+
+
+def send_batch(
+    subject: str,
+    html_body: str,
+    api_key: str,
+    recipients: dict[str, str | None],
+    from_email: str = "castingscout@noreply.com",
+    host: str = SENDGRID_HOST,
+    text_body: str | None = None,
+) -> dict[str, bool]:
+    """Send one digest to many recipients using SendGrid personalizations.
+
+    `recipients` maps each address to its digest id (sent as a per-recipient
+    header). Recipients are grouped into as few requests as the API allows;
+    each sees only their own address. Returns {address: delivered}. Malformed
+    addresses are skipped, and when a request is rejected for recipients the
+    error names, it is resent without them, so one bad address doesn't fail
+    the rest; any other rejection fails the request. With `text_body` the
+    mail is multipart, with a text/plain alternative to the HTML.
+    """
+    results: dict[str, bool] = {}
+    valid: list[tuple[str, str | None]] = []
+    for email, key in recipients.items():
+        if _EMAIL_RE.match(email.strip()):
+            valid.append((email, key))
+        else:
+            logger.error(f"Skipping malformed recipient address: {email!r}")
+            results[email] = False
+
+    client = get_client(api_key, host)
+    for i in range(0, len(valid), MAX_PERSONALIZATIONS):
+        chunk = valid[i:i + MAX_PERSONALIZATIONS]
+        results.update(_send_chunk(client, subject, html_body, text_body, from_email, chunk))
+    return results
+
+
+def _build_message(
+    subject: str,
+    html_body: str,
+    text_body: str | None,
+    from_email: str,
+    recipients: list[tuple[str, str | None]],
+) -> Mail:
+    from sendgrid.helpers.mail import Header, Mail, Personalization, To
+
     message = Mail(
-        from_email=from_email,
-        to_emails=to_email,
-        subject=subject,
-        html_content=html_body,
+        from_email=from_email, subject=subject, plain_text_content=text_body or None, html_content=html_body,
     )
+    for i, (email, key) in enumerate(recipients):
+        personalization = Personalization()
+        personalization.add_to(To(email))
+        if key:
+            personalization.add_header(Header(DIGEST_ID_HEADER, key))
+        message.add_personalization(personalization, index=i)
+    return message
+
+
+def _send_chunk(
+    client: SendGridAPIClient,
+    subject: str,
+    html_body: str,
+    text_body: str | None,
+    from_email: str,
+    recipients: list[tuple[str, str | None]],
+) -> dict[str, bool]:
+    try:
+        response = client.send(_build_message(subject, html_body, text_body, from_email, recipients))
+        logger.info(f"Email sent to {len(recipients)} recipient(s): status {response.status_code}")
+        return {email: True for email, _ in recipients}
+    except Exception as e:
+        rejected = _rejected_recipients(e, len(recipients))
+        if rejected:
+            for i in sorted(rejected):
+                logger.error(f"SendGrid rejected recipient {recipients[i][0]!r}")
+            rest = [r for i, r in enumerate(recipients) if i not in rejected]
+            results = {recipients[i][0]: False for i in rejected}
+            if rest:
+                results.update(_send_chunk(client, subject, html_body, text_body, from_email, rest))
+            return results
+        logger.exception(f"Failed to send email to {len(recipients)} recipient(s)")
+        return {email: False for email, _ in recipients}
+
+
+def _rejected_recipients(error: Exception, count: int) -> set[int]:
+    """Indexes of the recipients a 400 response names as invalid, if that's all it rejects.
+
+    Empty when the error is anything else (a bad key, a malformed message,
+    a server error): resending to fewer recipients wouldn't help, so the
+    whole request fails instead of costing a request per split.
+    """
+    if getattr(error, "status_code", None) != 400:
+        return set()
     try:
-        sg = SendGridAPIClient(api_key)
-        response = sg.send(message)
-        logger.info(f"Email sent: status {response.status_code}")
-        return True
-    except Exception:
-        logger.exception("Failed to send email")
-        if retry:
-            logger.info("Retrying in 5 minutes...")
-            time.sleep(300)
-            return send_email(subject, html_body, api_key, to_email, from_email, retry=False)
-        return False
+        errors = json.loads(error.body)["errors"]
+        fields = [_RECIPIENT_FIELD_RE.match(err.get("field") or "") for err in errors]
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return set()
+    if not fields or not all(fields):
+        return set()
+    rejected = {int(field.group(1)) for field in fields}
+    return rejected if max(rejected) < count else set()
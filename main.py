@@ -1,19 +1,41 @@
 # main.py
 from __future__ import annotations
 
+import argparse
 import logging
 import sys
+import time
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Callable
 
 from config import (
-    SENDGRID_API_KEY, RECIPIENT_EMAIL, SENDER_EMAIL,
-    SCRAPERS_ENABLED, SEEN_LISTINGS_PATH,
+    SENDGRID_API_KEY, RECIPIENT_EMAILS, SENDER_EMAIL, SENDGRID_API_HOST,
+    DIGEST_INTERVAL_MINUTES, MARKET_RECIPIENTS,
+    CIRCUIT_BREAKER_PATH, BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN_MINUTES,
+    OUTBOX_PATH, OUTBOX_MAX_ATTEMPTS, OUTBOX_BACKOFF_BASE_MINUTES,
+    OUTBOX_BACKOFF_MAX_MINUTES, OUTBOX_WORKERS, LISTINGS_DB_PATH,
+    DASHBOARD_HOST, DASHBOARD_PORT, METRICS_DB_PATH, BROKEN_PAGES_DIR,
+    YIELD_RECENT_RUNS, YIELD_BASELINE_DAYS, YIELD_DROP_RATIO, YIELD_MIN_BASELINE,
 )
+from breaker import CircuitBreaker
 from dedup import Deduplicator
-from mailer.formatter import format_digest
-from mailer.sender import send_email
+from mailer.formatter import render_digest
+from mailer.outbox import Outbox, OutboxEntry
+from mailer.sender import send_batch
 from filters.keyword_filter import KeywordFilter
-from models import CastingListing
-from scrapers.base import BaseScraper
+from markets import active_markets, all_markets, default_router
+from models import CastingListing, CareerCategory
+from store import ListingStore
+
+# Imported where they are used: the metrics and breakage modules bring in the
+# parse pool (multiprocessing), alerts the ranker, and the registry scans
+# installed plugins, none of which `query` or `search` need.
+if TYPE_CHECKING:
+    from alerts import AlertDispatcher
+    from breakage import BreakageDetector
+    from metrics import MetricsStore, RunMetrics
+    from scrapers.base import BaseScraper
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,81 +44,457 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def get_scrapers() -> list[BaseScraper]:
-    """Return enabled scraper instances."""
-    scrapers: list[BaseScraper] = []
-    if SCRAPERS_ENABLED.get("craigslist"):
-        from scrapers.craigslist import CraigslistScraper
-        scrapers.append(CraigslistScraper())
-    if SCRAPERS_ENABLED.get("reddit"):
-        from scrapers.reddit import RedditScraper
-        scrapers.append(RedditScraper())
-    if SCRAPERS_ENABLED.get("backstage"):
-        from scrapers.backstage import BackstageScraper
-        scrapers.append(BackstageScraper())
-    if SCRAPERS_ENABLED.get("casting_networks"):
-        from scrapers.casting_networks import CastingNetworksScraper
-        scrapers.append(CastingNetworksScraper())
-    if SCRAPERS_ENABLED.get("actors_access"):
-        from scrapers.actors_access import ActorsAccessScraper
-        scrapers.append(ActorsAccessScraper())
-    if SCRAPERS_ENABLED.get("facebook"):
-        from scrapers.facebook import FacebookScraper
-        scrapers.append(FacebookScraper())
-    return scrapers
+def get_scrapers(is_seen: Callable[[str], bool] | None = None) -> list[BaseScraper]:
+    """Return enabled scraper instances, in run order (see scrapers.registry).
 
+    `is_seen` (a dedup-key lookup) lets incremental scrapers (Facebook) stop
+    at posts already sent.
+    """
+    from scrapers.registry import enabled_specs
+
+    return [spec.create(is_seen=is_seen) for spec in enabled_specs()]
+
+
+def get_deduplicators() -> dict[str, Deduplicator]:
+    """One seen store per active market."""
+    return {m.name: Deduplicator(m.seen_path) for m in active_markets()}
+
+
+def _seen_anywhere(dedups: dict[str, Deduplicator]) -> Callable[[str], bool]:
+    return lambda key: any(d.is_seen(key) for d in dedups.values())
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        CIRCUIT_BREAKER_PATH,
+        threshold=BREAKER_FAILURE_THRESHOLD,
+        cooldown=timedelta(minutes=BREAKER_COOLDOWN_MINUTES),
+    )
+
+
+def get_listing_store() -> ListingStore:
+    return ListingStore(LISTINGS_DB_PATH)
+
+
+def get_metrics_store() -> MetricsStore:
+    from metrics import MetricsStore
+
+    return MetricsStore(METRICS_DB_PATH)
+
+
+def save_metrics(metrics: RunMetrics, store: MetricsStore | None = None) -> None:
+    """Write the run's per-source metrics in one transaction."""
+    runs = metrics.take()
+    if not runs:
+        return
+    own = store is None
+    store = store or get_metrics_store()
+    try:
+        store.record(runs)
+    except Exception:
+        logger.exception("Failed to save run metrics")
+    finally:
+        if own:
+            store.close()
+
+
+def get_breakage_detector(store: MetricsStore) -> BreakageDetector:
+    from breakage import BreakageDetector
+
+    return BreakageDetector(store, BROKEN_PAGES_DIR)
 
-def run() -> None:
-    logger.info("Casting Scout starting...")
 
-    # 1. Scrape all sources
+def get_alert_dispatcher() -> AlertDispatcher | None:
+    """The real-time alert channel, or None if no alert sink is configured."""
+    from alerts import default_dispatcher
+
+    return default_dispatcher()
+
+
+def scrape_source(
+    scraper: BaseScraper,
+    breaker: CircuitBreaker | None = None,
+    store: ListingStore | None = None,
+    metrics: RunMetrics | None = None,
+    detector: BreakageDetector | None = None,
+) -> list[CastingListing] | None:
+    """Run one scraper and archive what it found.
+
+    Returns None if it failed or its circuit is open. A source whose parser
+    looks broken (see breakage.py) still returns what it parsed; the
+    `detector` flags it for the failed-sources note.
+    """
+    name = scraper.source_name
+    run = metrics.begin(name) if metrics else None
+    if breaker and not breaker.allow(name):
+        logger.warning(f"Skipping {name}: circuit open until {breaker.retry_at(name):%Y-%m-%d %H:%M}")
+        if run:
+            from metrics import CIRCUIT_OPEN
+
+            run.error = CIRCUIT_OPEN
+        return None
+    started = time.monotonic()
+    try:
+        logger.info(f"Scraping {name}...")
+        listings = scraper.scrape()
+    except Exception as e:
+        logger.exception(f"Scraper {name} failed")
+        if run:
+            run.duration, run.error = time.monotonic() - started, type(e).__name__
+        if breaker:
+            breaker.record_failure(name)
+        return None
+    if run:
+        run.duration = time.monotonic() - started
+        run.bytes, run.parsed = scraper.fetched_bytes, len(listings)
+    if breaker:
+        breaker.record_success(name)
+    if detector and scraper.reports_structure:
+        detector.check(name, scraper.last_pages, run)
+    logger.info(f"  Found {len(listings)} listings from {name}")
+    if store:
+        store.add_many(listings)
+    return listings
+
+
+def scrape_all(
+    scrapers: list[BaseScraper],
+    breaker: CircuitBreaker | None = None,
+    store: ListingStore | None = None,
+    on_listings: Callable[[list[CastingListing]], None] | None = None,
+    metrics: RunMetrics | None = None,
+    detector: BreakageDetector | None = None,
+) -> tuple[list[CastingListing], list[str]]:
+    """Run each scraper once. Returns (listings, names of sources that failed).
+
+    `on_listings` gets each source's listings as soon as it finishes.
+    """
+    from scrapers.registry import run_order
+
     all_listings: list[CastingListing] = []
     failed_sources: list[str] = []
 
-    for scraper in get_scrapers():
-        try:
-            logger.info(f"Scraping {scraper.source_name}...")
-            listings = scraper.scrape()
-            logger.info(f"  Found {len(listings)} listings from {scraper.source_name}")
-            all_listings.extend(listings)
-        except Exception:
-            logger.exception(f"Scraper {scraper.source_name} failed")
+    for scraper in run_order(scrapers):
+        listings = scrape_source(scraper, breaker, store, metrics, detector)
+        if listings is None or (detector and detector.flagged(scraper.source_name)):
             failed_sources.append(scraper.source_name)
+        if listings is not None:
+            all_listings.extend(listings)
+            if on_listings:
+                on_listings(listings)
 
-    logger.info(f"Total raw listings: {len(all_listings)}")
+    return all_listings, failed_sources
+
+
+def get_outbox() -> Outbox:
+    return Outbox(
+        OUTBOX_PATH,
+        max_attempts=OUTBOX_MAX_ATTEMPTS,
+        backoff_base=timedelta(minutes=OUTBOX_BACKOFF_BASE_MINUTES),
+        backoff_max=timedelta(minutes=OUTBOX_BACKOFF_MAX_MINUTES),
+    )
 
-    # 2. Filter
-    f = KeywordFilter()
-    filtered = f.filter(all_listings)
-    logger.info(f"After filtering: {len(filtered)}")
 
-    # 3. Deduplicate
-    dedup = Deduplicator(SEEN_LISTINGS_PATH)
-    dedup.cleanup()
-    new_listings = dedup.deduplicate(filtered)
-    logger.info(f"After dedup: {len(new_listings)}")
+def _send_entries(entries: list[OutboxEntry]) -> dict[str, bool]:
+    """Send one digest to every recipient in `entries` (all share content)."""
+    first = entries[0]
+    return send_batch(
+        first.subject, first.html, SENDGRID_API_KEY,
+        {e.to_email: e.id for e in entries}, first.from_email, host=SENDGRID_API_HOST,
+        text_body=first.text,
+    )
 
-    # 4. Format email
-    subject, html = format_digest(new_listings, failed_sources if failed_sources else None)
 
-    # 5. Send (skip if all scrapers failed and no listings)
-    if not all_listings and failed_sources:
-        logger.error("All scrapers failed. No email sent.")
-        sys.exit(1)
+def drain_outbox(outbox: Outbox | None = None) -> None:
+    """Send every queued digest that is due; failures stay queued with backoff."""
+    if not SENDGRID_API_KEY:
+        return
+    outbox = outbox or get_outbox()
+    if not outbox.due():
+        return
+    sent, pending = outbox.drain(_send_entries, workers=OUTBOX_WORKERS)
+    if pending:
+        logger.warning(f"Outbox: {sent} sent, {pending} still queued for retry")
+    outbox.prune()
 
-    if not SENDGRID_API_KEY or not RECIPIENT_EMAIL:
+
+def deliver_digest(
+    listings: list[CastingListing], failed_sources: list[str], market: str | None = None,
+) -> list[CastingListing] | None:
+    """Format the digest and queue it for delivery (or print it).
+
+    `market` picks the recipients (see config.MARKET_RECIPIENTS) and, when
+    several markets are active, names the city in the subject.
+
+    Returns the listings the digest shows once it is durably queued (the
+    rest didn't fit; see render_digest); the actual send is attempted
+    immediately and retried by later runs if it fails.
+    """
+    label = None
+    if market and len(active_markets()) > 1:
+        label = all_markets()[market].city.partition(",")[0]
+    digest = render_digest(listings, failed_sources if failed_sources else None, market=label)
+    recipients = MARKET_RECIPIENTS.get(market or "") or RECIPIENT_EMAILS
+
+    if not SENDGRID_API_KEY or not recipients:
         logger.warning("SendGrid not configured. Printing email to stdout instead.")
-        print(f"Subject: {subject}\n\n{html}")
-    else:
-        success = send_email(subject, html, SENDGRID_API_KEY, RECIPIENT_EMAIL, SENDER_EMAIL)
-        if not success:
-            logger.error("Failed to send email.")
+        print(f"Subject: {digest.subject}\n\n{digest.text}")
+        return list(digest.shown)
+
+    outbox = get_outbox()
+    for recipient in recipients:
+        outbox.enqueue(digest.subject, digest.html, recipient, SENDER_EMAIL, text=digest.text)
+    drain_outbox(outbox)
+    return list(digest.shown)
+
+
+def close_resources() -> None:
+    """Release the shared HTTP session, browser, parse workers and parse cache.
+
+    Checks sys.modules so a run that never needed them doesn't import them.
+    """
+    if "scrapers.session" in sys.modules:
+        sys.modules["scrapers.session"].close_session()
+    if "scrapers.browser" in sys.modules:
+        sys.modules["scrapers.browser"].browser_pool.close()
+    if "scrapers.parse_pool" in sys.modules:
+        sys.modules["scrapers.parse_pool"].parse_pool.close()
+    if "scrapers.parse_cache" in sys.modules:
+        sys.modules["scrapers.parse_cache"].parse_cache.close()
+
+
+def run() -> None:
+    from metrics import RunMetrics
+
+    logger.info("Casting Scout starting...")
+
+    # 0. Retry digests queued by earlier runs
+    drain_outbox()
+
+    dedups = get_deduplicators()
+    seen = _seen_anywhere(dedups)
+    f = KeywordFilter()
+    metrics = RunMetrics()
+
+    # 1. Scrape all sources once (and archive everything found); new
+    # high-value listings are alerted as each source finishes
+    alerts = get_alert_dispatcher()
+
+    def alert_new(found: list[CastingListing]) -> None:
+        alerts.submit([l for l in f.filter(found) if not seen(l.dedup_key())])
+
+    store, metrics_store = get_listing_store(), get_metrics_store()
+    try:
+        all_listings, failed_sources = scrape_all(
+            get_scrapers(seen), get_circuit_breaker(), store, alert_new if alerts else None, metrics,
+            get_breakage_detector(metrics_store),
+        )
+    finally:
+        store.close()
+        metrics_store.close()
+        close_resources()
+        if alerts:
+            alerts.close()
+    logger.info(f"Total raw listings: {len(all_listings)}")
+
+    # Metrics are saved however the rest of the run ends, so a failed
+    # delivery still records what every source did
+    try:
+        # 2. Filter (listings in no active market are dropped here)
+        filtered = f.filter(all_listings)
+        metrics.count_passed(filtered)
+        logger.info(f"After filtering: {len(filtered)}")
+
+        if not all_listings and failed_sources:
+            logger.error("All scrapers failed. No email sent.")
             sys.exit(1)
 
-    # 6. Mark as seen
-    dedup.mark_seen(new_listings)
-    logger.info(f"Done! Sent {len(new_listings)} listings.")
+        # 3. Per market: deduplicate, send, then mark what the digest showed as
+        # seen (it is queued, so it will go out exactly once); listings it had no
+        # room for stay unseen for the next run
+        sent = 0
+        for market, listings in default_router().split(filtered).items():
+            dedup = dedups[market]
+            dedup.cleanup()
+            new_listings = dedup.deduplicate(listings)
+            metrics.count_new(new_listings)
+            logger.info(f"{market}: {len(new_listings)} new after dedup")
+            shown = deliver_digest(new_listings, failed_sources, market) or []
+            if len(shown) < len(new_listings):
+                logger.info(f"{market}: {len(new_listings) - len(shown)} listing(s) left for the next digest")
+            dedup.mark_seen(shown)
+            sent += len(shown)
+    finally:
+        save_metrics(metrics)
+    logger.info(f"Done! Sent {sent} listings.")
+
+
+def run_daemon() -> None:
+    from metrics import RunMetrics
+    from scheduler import Daemon
+    from scrapers.registry import all_specs, run_order
+
+    dedups = get_deduplicators()
+    scrapers = get_scrapers(_seen_anywhere(dedups))
+    store = get_listing_store()
+    alerts = get_alert_dispatcher()
+    metrics, metrics_store = RunMetrics(), get_metrics_store()
+    detector = get_breakage_detector(metrics_store)
+
+    def after_tick() -> None:
+        drain_outbox()
+        save_metrics(metrics, metrics_store)
+
+    specs = all_specs()
+    intervals = {s.source_name: specs[s.source_name].interval_seconds for s in scrapers}
+    daemon = Daemon(
+        scrapers=scrapers,
+        dedup=dedups,
+        keyword_filter=KeywordFilter(),
+        deliver=deliver_digest,
+        scrape=partial(scrape_source, breaker=get_circuit_breaker(), store=store, metrics=metrics,
+                       detector=detector),
+        after_tick=after_tick,
+        intervals=intervals,
+        order=run_order,
+        route=default_router().route,
+        alert=alerts.submit if alerts else None,
+        metrics=metrics,
+        flagged=detector.flagged,
+        digest_interval=60 * DIGEST_INTERVAL_MINUTES,
+    )
+    try:
+        daemon.run_forever()
+    finally:
+        store.close()
+        metrics_store.close()
+        close_resources()
+        if alerts:
+            alerts.close()
+
+
+def query_archive(args: argparse.Namespace) -> None:
+    store = get_listing_store()
+    try:
+        listings = store.query(
+            category=CareerCategory[args.category.upper()] if args.category else None,
+            source=args.source,
+            location=args.location,
+            since=date.today() - timedelta(days=args.days) if args.days else None,
+            text=args.text,
+            limit=args.limit,
+        )
+    finally:
+        store.close()
+    for l in listings:
+        print(f"{l.posted_date}  {l.categorize().name.lower():<12} {l.source:<16} {l.location:<24} {l.title}")
+        print(f"{'':12}{l.url}")
+    print(f"{len(listings)} listing(s)")
+
+
+def search_archive(args: argparse.Namespace) -> None:
+    store = get_listing_store()
+    try:
+        results = store.search(
+            args.terms,
+            category=CareerCategory[args.category.upper()] if args.category else None,
+            source=args.source,
+            since=date.today() - timedelta(days=args.days) if args.days else None,
+            limit=args.limit,
+        )
+    finally:
+        store.close()
+    for l, score in results:
+        print(f"{score:7.2f}  {l.posted_date}  {l.categorize().name.lower():<12} {l.source:<16} {l.title}")
+        print(f"{'':9}{l.url}")
+    print(f"{len(results)} match(es)")
+
+
+def serve_dashboard(args: argparse.Namespace) -> None:
+    from dashboard import Dashboard, serve
+
+    serve(Dashboard(LISTINGS_DB_PATH), args.host, args.port)
+
+
+def show_stats(args: argparse.Namespace) -> None:
+    now = datetime.now()
+    store = get_metrics_store()
+    try:
+        summary = store.summary(now - timedelta(days=args.days))
+        daily = store.daily(args.source, now - timedelta(days=args.days)) if args.source else []
+        drops = store.yield_drops(
+            now, recent_runs=YIELD_RECENT_RUNS, baseline_days=YIELD_BASELINE_DAYS,
+            ratio=YIELD_DROP_RATIO, min_baseline=YIELD_MIN_BASELINE,
+        )
+    finally:
+        store.close()
+
+    print(f"Last {args.days} day(s):")
+    print(f"{'source':<18} {'runs':>5} {'fails':>5} {'avg s':>7} {'avg KB':>8} {'parsed':>7} {'passed':>7} {'new':>6}  last error")
+    for s in summary:
+        print(f"{s.source:<18} {s.runs:>5} {s.failures:>5} {s.duration:>7.1f} {s.bytes / 1024:>8.0f} "
+              f"{s.parsed:>7.1f} {s.passed:>7} {s.new:>6}  {s.last_error or ''}".rstrip())
+    if daily:
+        print(f"\n{args.source} by day:")
+        for d in daily:
+            bar = "#" * min(60, round(d.parsed))
+            print(f"{d.day}  {d.runs:>3} run(s) {d.failures:>3} failed  {d.parsed:>6.1f} parsed  {d.new:>4} new  {bar}")
+    for drop in drops:
+        print(f"\nYield drop: {drop.source} parsed {drop.recent:.1f}/run lately, against a median of "
+              f"{drop.baseline:.1f}; its selectors may have broken.")
+
+
+def list_sources(args: argparse.Namespace) -> None:
+    from scrapers.registry import all_specs
+
+    for spec in sorted(all_specs().values(), key=lambda s: s.name):
+        traits = [t for t, on in (("browser", spec.needs_browser), ("auth", spec.needs_auth)) if on]
+        print(f"{spec.name:<18} {'on' if spec.is_enabled else 'off':<4} "
+              f"every {spec.interval_seconds / 60:>4.0f}m  {spec.cost.name.lower():<7} {', '.join(traits)}".rstrip())
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Casting Scout casting-call digest")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("run", help="scrape once and send the digest (default)")
+    sub.add_parser("daemon", help="poll sources on their own intervals and send periodic digests")
+    q = sub.add_parser("query", help="query the local archive of scraped listings")
+    q.add_argument("--category", choices=[c.name.lower() for c in CareerCategory])
+    q.add_argument("--source")
+    q.add_argument("--location", help="city prefix, e.g. burbank")
+    q.add_argument("--days", type=int, help="only listings posted in the last N days")
+    q.add_argument("--text", help="substring of title or description")
+    q.add_argument("--limit", type=int, default=50)
+    s = sub.add_parser("search", help="full-text search of archived listings, best match first")
+    s.add_argument("terms", help="all terms must match; end a term with * for a prefix match")
+    s.add_argument("--category", choices=[c.name.lower() for c in CareerCategory])
+    s.add_argument("--source")
+    s.add_argument("--days", type=int, help="only listings posted in the last N days")
+    s.add_argument("--limit", type=int, default=20)
+    sub.add_parser("sources", help="list registered sources and whether they are enabled")
+    m = sub.add_parser("stats", help="per-source run history, and sources whose yield dropped")
+    m.add_argument("--days", type=int, default=7)
+    m.add_argument("--source", help="also show this source's yield by day")
+    d = sub.add_parser("serve", help="serve a local dashboard and JSON API over the archive")
+    d.add_argument("--host", default=DASHBOARD_HOST)
+    d.add_argument("--port", type=int, default=DASHBOARD_PORT)
+    args = parser.parse_args(argv)
+
+    if args.command == "daemon":
+        run_daemon()
+    elif args.command == "query":
+        query_archive(args)
+    elif args.command == "search":
+        search_archive(args)
+    elif args.command == "sources":
+        list_sources(args)
+    elif args.command == "stats":
+        show_stats(args)
+    elif args.command == "serve":
+        serve_dashboard(args)
+    else:
+        run()
 
 
 if __name__ == "__main__":
-    run()
+    main()
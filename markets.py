@@ -0,0 +1,134 @@
+# markets.py
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from config import ACTIVE_MARKETS, DEFAULT_MARKET, MARKETS, SEEN_LISTINGS_PATH
+from gazetteer import Gazetteer, default_gazetteer, distance_km
+from models import CastingListing
+
+
+@dataclass(frozen=True)
+class Market:
+    """A metro area with its own digest (see config.MARKETS)."""
+
+    name: str
+    city: str  # its place in the gazetteer
+    radius_km: float
+    craigslist: tuple[str, ...]
+    subreddits: tuple[str, ...]
+    facebook_groups: tuple[str, ...]
+
+    @property
+    def craigslist_urls(self) -> list[str]:
+        return [f"https://{host}.craigslist.org" for host in self.craigslist]
+
+    @property
+    def url_prefixes(self) -> list[str]:
+        """Where this market's own sources post; listings from them are its alone."""
+        return [
+            *(f"{url}/" for url in self.craigslist_urls),
+            *(f"https://www.reddit.com/r/{sub}/" for sub in self.subreddits),
+            *(f"{group.rstrip('/')}/" for group in self.facebook_groups),
+        ]
+
+    @property
+    def seen_path(self) -> str:
+        if self.name == DEFAULT_MARKET:
+            return SEEN_LISTINGS_PATH
+        path = Path(SEEN_LISTINGS_PATH)
+        return str(path.with_name(f"{path.stem}_{self.name}{path.suffix}"))
+
+
+def parse_markets(entries: dict[str, dict]) -> dict[str, Market]:
+    markets = {}
+    for name, entry in entries.items():
+        try:
+            markets[name] = Market(
+                name=name,
+                city=entry["city"],
+                radius_km=float(entry["radius_km"]),
+                craigslist=tuple(entry.get("craigslist", ())),
+                subreddits=tuple(entry.get("subreddits", ())),
+                facebook_groups=tuple(entry.get("facebook_groups", ())),
+            )
+        except KeyError as e:
+            raise ValueError(f"Market {name!r}: missing {e}") from None
+    return markets
+
+
+@lru_cache(maxsize=1)
+def all_markets() -> dict[str, Market]:
+    return parse_markets(MARKETS)
+
+
+def active_markets() -> list[Market]:
+    """The markets named in config.ACTIVE_MARKETS, in that order."""
+    markets = all_markets()
+    unknown = [name for name in ACTIVE_MARKETS if name not in markets]
+    if unknown:
+        raise ValueError(f"Unknown market(s) {unknown}; known: {sorted(markets)}")
+    return [markets[name] for name in ACTIVE_MARKETS]
+
+
+def _alternation(terms: list[str]) -> str:
+    # Longest first, so a longer prefix wins
+    return "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True))
+
+
+class LocationRouter:
+    """Decides which markets a listing belongs to.
+
+    A listing from a market's own source (its Craigslist site, subreddit or
+    Facebook group) belongs to that market, by URL prefix. Any other listing's
+    location is normalized to a gazetteer place and belongs to every market
+    within whose radius that place lies; the markets of each place are worked
+    out once, up front, so routing is a regex match and dict lookups.
+    """
+
+    def __init__(self, markets: list[Market], gazetteer: Gazetteer | None = None):
+        self._names = [m.name for m in markets]
+        self._gazetteer = gazetteer or default_gazetteer()
+
+        self._by_prefix: dict[str, list[str]] = {}
+        for market in markets:
+            for prefix in market.url_prefixes:
+                self._by_prefix.setdefault(prefix, []).append(market.name)
+        self._prefix_re = re.compile(f"^(?:{_alternation(list(self._by_prefix))})") if self._by_prefix else None
+
+        centers = {}
+        for market in markets:
+            centers[market.name] = self._gazetteer.place(market.city)
+            if centers[market.name] is None:
+                raise ValueError(f"Market {market.name!r}: {market.city!r} is not in the gazetteer")
+        self._by_place: dict[str, list[str]] = {
+            place.name: [m.name for m in markets if distance_km(place, centers[m.name]) <= m.radius_km]
+            for place in self._gazetteer.places()
+        }
+
+    def route(self, listing: CastingListing) -> list[str]:
+        """Names of the markets `listing` belongs to, in market order."""
+        if self._prefix_re is not None:
+            match = self._prefix_re.match(listing.url)
+            if match:
+                return self._by_prefix[match.group()]
+        if not listing.location:
+            return []
+        place = self._gazetteer.lookup(listing.location)
+        return self._by_place[place.name] if place else []
+
+    def split(self, listings: list[CastingListing]) -> dict[str, list[CastingListing]]:
+        """Each market's listings; a listing may go to several, or none."""
+        by_market: dict[str, list[CastingListing]] = {name: [] for name in self._names}
+        for listing in listings:
+            for name in self.route(listing):
+                by_market[name].append(listing)
+        return by_market
+
+
+@lru_cache(maxsize=1)
+def default_router() -> LocationRouter:
+    return LocationRouter(active_markets())
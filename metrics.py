@@ -0,0 +1,217 @@
+# metrics.py
+from __future__ import annotations
+
+import json
+import sqlite3
+import statistics
+from collections import Counter
+from dataclasses import astuple, dataclass, fields
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from models import CastingListing
+from scrapers.parse_pool import PageStats
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS source_runs (
+    started_at TEXT NOT NULL,
+    source TEXT NOT NULL,
+    duration REAL NOT NULL,
+    bytes INTEGER NOT NULL,
+    parsed INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    new INTEGER NOT NULL,
+    error TEXT,
+    candidates INTEGER,
+    missing TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_source_runs_source ON source_runs (source, started_at);
+CREATE INDEX IF NOT EXISTS idx_source_runs_started ON source_runs (started_at);
+"""
+
+# Recorded as a source's error when its circuit was open and it wasn't run
+CIRCUIT_OPEN = "CircuitOpen"
+# ... and when its parser looked broken (its listings still went through)
+SELECTOR_BREAKAGE = "SelectorBreakage"
+
+
+@dataclass
+class SourceRun:
+    """One source's numbers for one run (or daemon poll)."""
+
+    started_at: str  # ISO timestamp
+    source: str
+    duration: float = 0.0  # seconds
+    bytes: int = 0  # size of the fetched page bodies
+    parsed: int = 0  # listings parsed
+    passed: int = 0  # ... that passed the filters
+    new: int = 0  # ... that were new after dedup
+    error: str | None = None  # exception class, if it failed
+    # What the parser's selectors matched, for sources that report it (see breakage.py)
+    candidates: int | None = None
+    missing: str | None = None  # JSON {field: candidates without it}
+
+
+_COLUMNS = tuple(f.name for f in fields(SourceRun))
+
+
+class RunMetrics:
+    """Collects SourceRuns in memory during a run; `take` hands them over for
+    one bulk write (see MetricsStore.record)."""
+
+    def __init__(self):
+        self._runs: dict[str, SourceRun] = {}
+        self._new_keys: set[str] = set()
+
+    def begin(self, source: str, now: datetime | None = None) -> SourceRun:
+        run = SourceRun((now or datetime.now()).isoformat(timespec="seconds"), source)
+        self._runs[source] = run
+        return run
+
+    def count_passed(self, listings: list[CastingListing]) -> None:
+        for source, n in Counter(l.source for l in listings).items():
+            if source in self._runs:
+                self._runs[source].passed += n
+
+    def count_new(self, listings: list[CastingListing]) -> None:
+        """Count new listings; one new in several markets counts once."""
+        fresh = [l for l in listings if l.dedup_key() not in self._new_keys]
+        self._new_keys.update(l.dedup_key() for l in fresh)
+        for source, n in Counter(l.source for l in fresh).items():
+            if source in self._runs:
+                self._runs[source].new += n
+
+    def take(self) -> list[SourceRun]:
+        runs = list(self._runs.values())
+        self._runs.clear()
+        self._new_keys.clear()
+        return runs
+
+
+class SourceSummary(NamedTuple):
+    source: str
+    runs: int
+    failures: int
+    duration: float  # mean seconds per run
+    bytes: float  # mean per successful run
+    parsed: float  # mean per successful run
+    passed: int  # totals
+    new: int
+    last_error: str | None
+
+
+class DayYield(NamedTuple):
+    day: str
+    runs: int
+    failures: int
+    parsed: float  # mean per successful run
+    new: int
+
+
+class YieldDrop(NamedTuple):
+    source: str
+    recent: float  # mean listings parsed over the recent runs
+    baseline: float  # median over the baseline window before them
+
+
+class MetricsStore:
+    """Per-source run history in SQLite, one row per source per run."""
+
+    def __init__(self, db_path: str):
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(_SCHEMA)
+        # Databases from before the parse stats columns
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(source_runs)")}
+        for name, kind in (("candidates", "INTEGER"), ("missing", "TEXT")):
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE source_runs ADD COLUMN {name} {kind}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def record(self, runs: list[SourceRun]) -> None:
+        """Append a run's rows in one transaction."""
+        if not runs:
+            return
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO source_runs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                [astuple(r) for r in runs],
+            )
+
+    def parse_history(self, source: str, limit: int) -> list[tuple[PageStats, bool]]:
+        """The parse stats of the source's last `limit` runs that report them,
+        newest first, each with whether it was flagged as a breakage."""
+        rows = self._conn.execute(
+            "SELECT candidates, missing, error FROM source_runs "
+            "WHERE source = ? AND candidates IS NOT NULL AND (error IS NULL OR error = ?) "
+            "ORDER BY started_at DESC LIMIT ?",
+            (source, SELECTOR_BREAKAGE, limit),
+        ).fetchall()
+        return [(PageStats(candidates, json.loads(missing or "{}")), error is not None)
+                for candidates, missing, error in rows]
+
+    def summary(self, since: datetime) -> list[SourceSummary]:
+        rows = self._conn.execute(
+            """
+            SELECT source, COUNT(*), COUNT(error), AVG(duration),
+                   AVG(CASE WHEN error IS NULL THEN bytes END),
+                   AVG(CASE WHEN error IS NULL THEN parsed END),
+                   SUM(passed), SUM(new),
+                   (SELECT error FROM source_runs e WHERE e.source = r.source AND e.error IS NOT NULL
+                    ORDER BY started_at DESC LIMIT 1)
+            FROM source_runs r WHERE started_at >= ? GROUP BY source ORDER BY source
+            """,
+            (since.isoformat(timespec="seconds"),),
+        ).fetchall()
+        return [SourceSummary(s, n, f, d or 0.0, b or 0.0, p or 0.0, ps or 0, nw or 0, e)
+                for s, n, f, d, b, p, ps, nw, e in rows]
+
+    def daily(self, source: str, since: datetime) -> list[DayYield]:
+        rows = self._conn.execute(
+            """
+            SELECT substr(started_at, 1, 10) AS day, COUNT(*), COUNT(error),
+                   AVG(CASE WHEN error IS NULL THEN parsed END), SUM(new)
+            FROM source_runs WHERE source = ? AND started_at >= ? GROUP BY day ORDER BY day
+            """,
+            (source, since.isoformat(timespec="seconds")),
+        ).fetchall()
+        return [DayYield(day, n, f, p or 0.0, nw or 0) for day, n, f, p, nw in rows]
+
+    def yield_drops(
+        self,
+        now: datetime | None = None,
+        recent_runs: int = 3,
+        baseline_days: int = 14,
+        ratio: float = 0.5,
+        min_baseline: float = 5.0,
+    ) -> list[YieldDrop]:
+        """Sources whose last `recent_runs` successful runs parsed, on average,
+        under `ratio` times their median over the `baseline_days` before.
+
+        A working source that suddenly parses next to nothing usually has a
+        broken selector rather than a quiet day. Sources whose baseline median
+        is under `min_baseline` are too sparse to judge.
+        """
+        since = (now or datetime.now()) - timedelta(days=baseline_days)
+        by_source: dict[str, list[int]] = {}
+        for source, parsed in self._conn.execute(
+            "SELECT source, parsed FROM source_runs WHERE error IS NULL AND started_at >= ? "
+            "ORDER BY source, started_at",
+            (since.isoformat(timespec="seconds"),),
+        ):
+            by_source.setdefault(source, []).append(parsed)
+
+        drops = []
+        for source, counts in by_source.items():
+            baseline, recent = counts[:-recent_runs], counts[-recent_runs:]
+            if len(baseline) < recent_runs:
+                continue
+            median = statistics.median(baseline)
+            mean = statistics.fmean(recent)
+            if median >= min_baseline and mean < ratio * median:
+                drops.append(YieldDrop(source, mean, median))
+        return drops
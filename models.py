@@ -20,6 +20,12 @@ class CareerCategory(IntEnum):
 TOP_FILM_SCHOOLS = {"usc", "ucla", "afi", "calarts", "cal arts", "chapman", "loyola marymount", "lmu"}
 
 
+def listing_key(url: str, title: str) -> str:
+    """Deduplication key for a listing's URL and title (see CastingListing.dedup_key)."""
+    raw = f"{url}|{title}".lower().strip()
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
 @dataclass
 class CastingListing:
     title: str
@@ -37,34 +43,9 @@ class CastingListing:
 
     def dedup_key(self) -> str:
         """Generate a deduplication key from URL and title."""
-        raw = f"{self.url}|{self.title}".lower().strip()
-        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+        return listing_key(self.url, self.title)
 
     def categorize(self) -> CareerCategory:
-        """Assign a career-value category to this listing."""
-        text = f"{self.title} {self.description} {self.school_or_production or ''}".lower()
-
-        # Check for top film school association
-        if self.school_or_production:
-            if self.school_or_production.lower() in TOP_FILM_SCHOOLS:
-                return CareerCategory.STUDENT_FILM
-        for school in TOP_FILM_SCHOOLS:
-            if school in text:
-                return CareerCategory.STUDENT_FILM
-
-        role = self.role_type.lower()
-
-        if role in ("principal", "lead", "supporting", "speaking"):
-            return CareerCategory.PRINCIPAL
-
-        if role == "commercial" or "commercial" in text:
-            return CareerCategory.COMMERCIAL
-
-        if role in ("background", "extra", "extras"):
-            return CareerCategory.BACKGROUND
-
-        if "open call" in text or "workshop" in text or role == "open call":
-            return CareerCategory.OPEN_CALL
-
-        # Default: short/indie
-        return CareerCategory.SHORT_INDIE
+        """Assign a career-value category using the configured rules (see rules.py)."""
+        from rules import default_engine
+        return default_engine().categorize(self)
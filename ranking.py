@@ -0,0 +1,132 @@
+# ranking.py
+from __future__ import annotations
+
+import heapq
+import re
+from array import array
+from datetime import date
+from functools import lru_cache
+
+from config import FRESHNESS_HOURS, RANKING_WEIGHTS, SOURCE_RELIABILITY
+from models import CastingListing, CareerCategory, TOP_FILM_SCHOOLS
+from rules import categorize_all
+
+# Every feature is scaled to 0..1, higher is better.
+FEATURES: tuple[str, ...] = ("category", "pay", "deadline", "source", "school", "freshness")
+
+_PAY_RE = re.compile(r"\$\s?(\d[\d,]*)")
+
+# scrapers.extract's compensation labels; a dollar amount outranks them all
+_PAY_LABELS = {
+    "unpaid": 0.0,
+    "copy/credit": 0.2,
+    "copy/credit/meals": 0.25,
+    "deferred pay": 0.3,
+    "paid": 0.7,
+}
+_PAY_UNKNOWN = 0.4
+_DEADLINE_UNKNOWN = 0.3
+_SOURCE_UNKNOWN = 0.5
+
+
+def _pay(compensation: str | None) -> float:
+    if not compensation:
+        return _PAY_UNKNOWN
+    match = _PAY_RE.search(compensation)
+    if match:
+        # $100 -> 0.8, $1000 or more -> 1.0
+        amount = float(match.group(1).replace(",", ""))
+        return min(1.0, 0.75 + amount / 4000)
+    return _PAY_LABELS.get(compensation.lower(), _PAY_UNKNOWN)
+
+
+def _deadline(deadline: date | None, today: date) -> float:
+    # Sooner is more urgent; a passed deadline is worth nothing
+    if deadline is None:
+        return _DEADLINE_UNKNOWN
+    days = (deadline - today).days
+    return 0.0 if days < 0 else 1.0 / (1.0 + days / 7)
+
+
+def _school(school: str | None) -> float:
+    if not school:
+        return 0.0
+    return 1.0 if school.lower() in TOP_FILM_SCHOOLS else 0.5
+
+
+def _freshness(posted: date, today: date) -> float:
+    # Halves every FRESHNESS_HOURS
+    hours = max(0, (today - posted).days) * 24
+    return 0.5 ** (hours / FRESHNESS_HOURS)
+
+
+class Ranker:
+    """Scores listings with a weighted sum of precomputed features.
+
+    Features are computed once per listing into a flat array (one row of
+    len(FEATURES) per listing); scoring is then a dot product per row, and
+    top_k keeps a k-sized heap per category instead of sorting everything.
+    """
+
+    def __init__(self, weights: dict[str, float], reliability: dict[str, float] | None = None):
+        unknown = set(weights) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Ranking weights: unknown features {sorted(unknown)}; known: {list(FEATURES)}")
+        self._weights = [float(weights.get(name, 0.0)) for name in FEATURES]
+        self._reliability = reliability or {}
+
+    def features(
+        self,
+        listings: list[CastingListing],
+        categories: list[CareerCategory],
+        today: date | None = None,
+    ) -> array:
+        """Flat feature rows for `listings`, in FEATURES order."""
+        today = today or date.today()
+        worst = max(CareerCategory)
+        rows = array("d")
+        for listing, category in zip(listings, categories):
+            rows.extend((
+                (worst - category) / (worst - 1),
+                _pay(listing.compensation),
+                _deadline(listing.deadline, today),
+                self._reliability.get(listing.source, _SOURCE_UNKNOWN),
+                _school(listing.school_or_production),
+                _freshness(listing.posted_date, today),
+            ))
+        return rows
+
+    def scores(self, rows: array) -> list[float]:
+        weights = self._weights
+        width = len(weights)
+        return [
+            sum(w * f for w, f in zip(weights, rows[i:i + width]))
+            for i in range(0, len(rows), width)
+        ]
+
+    def top_k(
+        self,
+        listings: list[CastingListing],
+        k: int,
+        categories: list[CareerCategory] | None = None,
+        today: date | None = None,
+    ) -> dict[CareerCategory, list[CastingListing]]:
+        """The best `k` listings of each category, best first; ties keep input order.
+
+        Pass `categories` (one per listing) if the caller already has them.
+        """
+        if categories is None:
+            categories = categorize_all(listings)
+        scores = self.scores(self.features(listings, categories, today))
+        by_category: dict[CareerCategory, list[int]] = {}
+        for i, category in enumerate(categories):
+            by_category.setdefault(category, []).append(i)
+        return {
+            category: [listings[i] for i in heapq.nlargest(k, indexes, key=scores.__getitem__)]
+            for category, indexes in by_category.items()
+        }
+
+
+@lru_cache(maxsize=1)
+def default_ranker() -> Ranker:
+    return Ranker(RANKING_WEIGHTS, SOURCE_RELIABILITY)
@@ -0,0 +1,138 @@
+# rules.py
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from config import CATEGORY_RULES, CATEGORY_DEFAULT, CATEGORY_RULES_FILE
+from models import CastingListing, CareerCategory, TOP_FILM_SCHOOLS
+
+_RULE_KEYS = {"category", "role_types", "keywords", "schools"}
+# Part of the fingerprint: bump when keyword matching itself changes, so
+# categories stored under the old matching are redone.
+_MATCH_VERSION = 2
+
+
+@dataclass(frozen=True)
+class Rule:
+    category: CareerCategory
+    role_types: frozenset[str] = frozenset()
+    keywords: tuple[str, ...] = ()
+    schools: bool = False
+
+
+def parse_rules(raw: list[dict]) -> list[Rule]:
+    """Validate rule dicts (as in config.CATEGORY_RULES) into Rule objects."""
+    rules = []
+    for i, entry in enumerate(raw):
+        unknown = set(entry) - _RULE_KEYS
+        if unknown:
+            raise ValueError(f"Category rule {i}: unknown keys {sorted(unknown)}")
+        try:
+            category = CareerCategory[entry["category"].upper()]
+        except KeyError:
+            raise ValueError(f"Category rule {i}: unknown category {entry.get('category')!r}") from None
+        rules.append(Rule(
+            category=category,
+            role_types=frozenset(r.lower() for r in entry.get("role_types", ())),
+            keywords=tuple(k.lower() for k in entry.get("keywords", ())),
+            schools=bool(entry.get("schools", False)),
+        ))
+    return rules
+
+
+class RuleEngine:
+    """Ordered category rules compiled into a decision table.
+
+    role_type and exact school values are resolved with one dict lookup each,
+    which bounds the answer; only the earlier rules that could still beat it
+    check their keywords. Keywords match whole words ("usc" not in "muscle"),
+    but each is first found with a C-level `in` check and only a hit runs the
+    rule's word-boundary regex: scanning every text with one regex alternation
+    over all keywords measured ~2.5x slower (see benchmarks/bench_rules.py).
+    """
+
+    def __init__(
+        self,
+        rules: list[Rule],
+        default: CareerCategory,
+        schools: set[str] = TOP_FILM_SCHOOLS,
+    ):
+        self._rules = rules
+        self._default = default
+        # role_type -> index of the first rule that claims it
+        self._role_index: dict[str, int] = {}
+        # exact school_or_production value -> index of the first schools rule
+        self._school_index: dict[str, int] = {}
+        # keywords checked for each rule, in rule order, and the regex that
+        # confirms a substring hit is a whole word
+        self._keywords: list[tuple[str, ...]] = []
+        self._whole_words: list[re.Pattern | None] = []
+        for i, rule in enumerate(rules):
+            for role in rule.role_types:
+                self._role_index.setdefault(role, i)
+            keywords = list(rule.keywords)
+            if rule.schools:
+                for school in schools:
+                    self._school_index.setdefault(school, i)
+                keywords.extend(sorted(schools))
+            keywords = tuple(dict.fromkeys(keywords))
+            self._keywords.append(keywords)
+            self._whole_words.append(re.compile(
+                r"(?<!\w)(?:" + "|".join(map(re.escape, keywords)) + r")(?!\w)"
+            ) if keywords else None)
+        self._categories = [r.category for r in rules] + [default]
+        # Identifies the rules, so categories stored under others can be redone
+        spec = [[r.category.name, sorted(r.role_types), list(r.keywords), r.schools] for r in rules]
+        self.fingerprint = hashlib.sha256(
+            json.dumps([_MATCH_VERSION, spec, default.name, sorted(schools)]).encode()
+        ).hexdigest()[:16]
+
+    def categorize(self, listing: CastingListing) -> CareerCategory:
+        best = len(self._rules)
+        if listing.school_or_production:
+            best = self._school_index.get(listing.school_or_production.lower(), best)
+        best = min(best, self._role_index.get(listing.role_type.lower(), best))
+
+        text = None
+        for i in range(best):
+            keywords = self._keywords[i]
+            if not keywords:
+                continue
+            if text is None:
+                text = f"{listing.title} {listing.description} {listing.school_or_production or ''}".lower()
+            for keyword in keywords:
+                if keyword in text:
+                    if self._whole_words[i].search(text):
+                        return self._categories[i]
+                    break  # only inside other words; the regex checked them all
+        return self._categories[best]
+
+    def categorize_all(self, listings: list[CastingListing]) -> list[CareerCategory]:
+        """Categorize a batch of listings, skipping the per-call engine lookup."""
+        categorize = self.categorize
+        return [categorize(l) for l in listings]
+
+
+def load_engine(rules_file: str = "") -> RuleEngine:
+    """Build an engine from a JSON rules file, or from config if none is given."""
+    raw_rules, default = CATEGORY_RULES, CATEGORY_DEFAULT
+    if rules_file:
+        data = json.loads(Path(rules_file).read_text())
+        raw_rules = data["rules"]
+        default = data.get("default", CATEGORY_DEFAULT)
+    return RuleEngine(parse_rules(raw_rules), CareerCategory[default.upper()])
+
+
+@lru_cache(maxsize=1)
+def default_engine() -> RuleEngine:
+    return load_engine(CATEGORY_RULES_FILE)
+
+
+def categorize_all(listings: list[CastingListing]) -> list[CareerCategory]:
+    """Categorize a batch of listings with the configured rules."""
+    return default_engine().categorize_all(listings)
@@ -0,0 +1,189 @@
+# scheduler.py
+from __future__ import annotations
+
+import heapq
+import logging
+import signal
+import threading
+import time
+from typing import Callable
+
+from dedup import Deduplicator
+from filters.keyword_filter import KeywordFilter
+from metrics import RunMetrics
+from models import CastingListing
+from scrapers.base import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+# (listings, failed_sources, market or None) -> the listings the digest
+# showed, or None if it couldn't be handed off
+DeliverFn = Callable[[list[CastingListing], list[str], str | None], list[CastingListing] | None]
+# Runs one scraper; returns None if it failed or was skipped.
+ScrapeFn = Callable[[BaseScraper], list[CastingListing] | None]
+
+
+class Daemon:
+    """In-process scheduler for long-running mode.
+
+    Each source is polled on its own interval; new listings accumulate in
+    memory and are delivered as one digest every `digest_interval` seconds.
+    The seen store, HTTP session and browser stay warm between polls.
+    Listings are only marked seen once their digest is handed to `deliver`, so
+    pending listings lost on shutdown are picked up again on the next start;
+    those the digest had no room for stay pending for the next one.
+
+    `dedup` may instead map market names to their seen stores; each market
+    then keeps its own pending digest, `route` says which markets a listing
+    belongs to, and `deliver` is called once per market with its name. Every
+    source is still polled once, whatever the number of markets.
+    `after_tick` runs after every tick (used to drain the mail outbox).
+    `order` arranges the sources due in one tick (see scrapers.registry.run_order).
+    `alert` gets each poll's new listings straight away (see alerts.py); they
+    stay pending for the digest all the same. `metrics` is credited with
+    each poll's listings that pass the filter and are new. `flagged` says
+    whether a source's last poll looked like a broken parser (see
+    breakage.py); it is reported as failed, but its listings still count.
+    """
+
+    def __init__(
+        self,
+        scrapers: list[BaseScraper],
+        dedup: Deduplicator | dict[str, Deduplicator],
+        keyword_filter: KeywordFilter,
+        deliver: DeliverFn,
+        scrape: ScrapeFn,
+        intervals: dict[str, float],
+        digest_interval: float,
+        after_tick: Callable[[], None] | None = None,
+        order: Callable[[list[BaseScraper]], list[BaseScraper]] | None = None,
+        route: Callable[[CastingListing], list[str]] | None = None,
+        alert: Callable[[list[CastingListing]], None] | None = None,
+        metrics: RunMetrics | None = None,
+        flagged: Callable[[str], str | None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        # One lane per market; a single unnamed lane (None) without markets
+        self._dedups: dict[str | None, Deduplicator] = dedup if isinstance(dedup, dict) else {None: dedup}
+        self._route = route
+        self._alert = alert
+        self._metrics = metrics
+        self._flagged = flagged
+        self._filter = keyword_filter
+        self._deliver = deliver
+        self._scrape = scrape
+        self._after_tick = after_tick
+        self._order = order
+        self._intervals = intervals
+        self._digest_interval = digest_interval
+        self._clock = clock
+        self._stop = threading.Event()
+
+        self._pending: dict[str | None, dict[str, CastingListing]] = {lane: {} for lane in self._dedups}
+        self._failed_sources: list[str] = []
+
+        now = clock()
+        # (due_time, seq, scraper); seq breaks ties so scrapers are never compared
+        self._queue: list[tuple[float, int, BaseScraper]] = [
+            (now, i, s) for i, s in enumerate(scrapers)
+        ]
+        heapq.heapify(self._queue)
+        self._seq = len(scrapers)
+        self._next_digest = now + digest_interval
+
+    @property
+    def pending(self) -> list[CastingListing]:
+        return [l for lane in self._pending.values() for l in lane.values()]
+
+    def tick(self) -> float:
+        """Run every source that is due and send the digest if due.
+
+        Returns seconds until the next scheduled event.
+        """
+        now = self._clock()
+        due_now: list[BaseScraper] = []
+        while self._queue and self._queue[0][0] <= now:
+            due_now.append(heapq.heappop(self._queue)[2])
+        for scraper in self._order(due_now) if self._order else due_now:
+            self._poll(scraper)
+            due = now + self._intervals[scraper.source_name]
+            heapq.heappush(self._queue, (due, self._seq, scraper))
+            self._seq += 1
+
+        if now >= self._next_digest:
+            self._send_digest()
+            self._next_digest = now + self._digest_interval
+
+        if self._after_tick:
+            self._after_tick()
+
+        next_event = min(self._queue[0][0], self._next_digest) if self._queue else self._next_digest
+        return max(0.0, next_event - self._clock())
+
+    def _poll(self, scraper: BaseScraper) -> None:
+        listings = self._scrape(scraper)
+        failed = listings is None or (self._flagged and self._flagged(scraper.source_name))
+        if failed and scraper.source_name not in self._failed_sources:
+            self._failed_sources.append(scraper.source_name)
+        if listings is None:
+            return
+
+        passed = self._filter.filter(listings)
+        if self._route is None:
+            lanes = {lane: passed for lane in self._dedups}
+        else:
+            lanes = {lane: [] for lane in self._dedups}
+            for listing in passed:
+                for lane in self._route(listing):
+                    if lane in lanes:
+                        lanes[lane].append(listing)
+
+        found: list[CastingListing] = []
+        for lane, routed in lanes.items():
+            pending = self._pending[lane]
+            new = [l for l in self._dedups[lane].deduplicate(routed) if l.dedup_key() not in pending]
+            for listing in new:
+                pending[listing.dedup_key()] = listing
+            found.extend(new)
+        if self._metrics:
+            self._metrics.count_passed(passed)
+            self._metrics.count_new(found)
+        if self._alert and found:
+            self._alert(found)
+        logger.info(f"  {scraper.source_name}: {len(listings)} found, {len(found)} new "
+                    f"({len(self.pending)} pending)")
+
+    def _send_digest(self) -> None:
+        delivered_all = True
+        for lane, dedup in self._dedups.items():
+            listings = list(self._pending[lane].values())
+            shown = self._deliver(listings, self._failed_sources, lane)
+            if shown is None:
+                logger.error(f"Digest delivery failed{f' for {lane}' if lane else ''}; "
+                             f"keeping {len(listings)} listings pending")
+                delivered_all = False
+                continue
+            dedup.mark_seen(shown)
+            dedup.cleanup()
+            for listing in shown:
+                self._pending[lane].pop(listing.dedup_key(), None)
+        if delivered_all:
+            self._failed_sources = []
+
+    def stop(self, *_: object) -> None:
+        """Request a graceful shutdown (safe to call from a signal handler)."""
+        logger.info("Shutdown requested")
+        self._stop.set()
+
+    def run_forever(self) -> None:
+        previous = {sig: signal.signal(sig, self.stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+        logger.info("Daemon started")
+        try:
+            while not self._stop.is_set():
+                self._stop.wait(self.tick())
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+            for dedup in self._dedups.values():
+                dedup.flush()
+        logger.info(f"Daemon stopped ({len(self.pending)} undelivered listings will be re-found)")
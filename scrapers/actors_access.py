@@ -1,87 +1,235 @@
 # scrapers/actors_access.py
 from __future__ import annotations
 
+import json
 import logging
 import os
-from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from bs4 import BeautifulSoup
 
+from config import ACTORS_ACCESS_CONCURRENCY, ACTORS_ACCESS_MAX_PAGES, ACTORS_ACCESS_STATE_PATH
 from models import CastingListing
 from scrapers.base import BaseScraper
+from scrapers.browser import browser_pool
+from scrapers.dates import parse_today
+from scrapers.extract import extract_all
+from scrapers.parse_pool import PageStats
+
+if TYPE_CHECKING:
+    from playwright.sync_api import BrowserContext, Page
 
 logger = logging.getLogger(__name__)
 
 ACTORS_ACCESS_URL = "https://www.actorsaccess.com/projects"
 
+# Actors Access uses various layouts; these are best-guess selectors
+_PROJECT_SELECTOR = ".project-listing, .project-item, tr.project-row"
+_PROJECT_KEYS = ("title", "url", "text")
+
+# Runs in the page: the projects on one index page, and links to other index pages
+_INDEX_JS = """
+(selector) => ({
+    projects: Array.from(document.querySelectorAll(selector))
+        .map(p => p.querySelector("a[href]")).filter(a => a)
+        .map(a => ({title: a.textContent.trim(), url: a.href})),
+    pages: Array.from(document.querySelectorAll(".pagination a[href], a.page-link[href]"))
+        .map(a => a.href),
+})
+"""
+
+# Runs in the page: the text of one breakdown (project detail) page
+_BREAKDOWN_JS = """
+() => {
+    const main = document.querySelector(".breakdown, #breakdown, main") || document.body;
+    return main ? main.innerText : "";
+}
+"""
+
+
+def _needs_login(page: Page) -> bool:
+    """Whether the site bounced us to its login form (no or expired session)."""
+    return "login" in page.url.lower() or page.query_selector('input[type="password"]') is not None
+
+
+def _login(page: Page, email: str, password: str) -> None:
+    page.goto("https://www.actorsaccess.com/", wait_until="networkidle", timeout=60000)
+    page.fill('input[name="email"], input[type="email"]', email)
+    page.fill('input[name="password"], input[type="password"]', password)
+    page.click('button[type="submit"], input[type="submit"]')
+    page.wait_for_load_state("networkidle", timeout=30000)
+
+
+def _save_state(context: BrowserContext) -> None:
+    path = Path(ACTORS_ACCESS_STATE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    context.storage_state(path=str(path))
+    os.chmod(path, 0o600)
+
+
+def _visit_all(
+    context: BrowserContext, urls: list[str], limit: int, script: str, arg: Any = None,
+) -> dict[str, Any]:
+    """Evaluate `script` on every url, up to `limit` pages at a time.
+
+    Each batch starts all its navigations before waiting on any, so the pages
+    load in parallel. Pages that fail are logged and left out of the result.
+    """
+    results: dict[str, Any] = {}
+    if not urls:
+        return results
+    pages = [context.new_page() for _ in range(min(limit, len(urls)))]
+    try:
+        for start in range(0, len(urls), len(pages)):
+            batch: list[tuple[Page, str]] = []
+            for page, url in zip(pages, urls[start:start + len(pages)]):
+                try:
+                    page.goto(url, wait_until="commit", timeout=30000)
+                    batch.append((page, url))
+                except Exception:
+                    logger.exception(f"Actors Access failed for {url}")
+            for page, url in batch:
+                try:
+                    page.wait_for_load_state("domcontentloaded", timeout=30000)
+                    results[url] = page.evaluate(script, arg)
+                except Exception:
+                    logger.exception(f"Actors Access failed for {url}")
+    finally:
+        for page in pages:
+            page.close()
+    return results
+
 
 class ActorsAccessScraper(BaseScraper):
-    """Best-effort scraper for Actors Access. Requires login credentials."""
+    """Best-effort scraper for Actors Access. Requires login credentials.
+
+    The logged-in browser state is saved to ACTORS_ACCESS_STATE_PATH and
+    reused, so the login form only runs when the saved session is rejected.
+    """
+
+    parser_version = 3
+    reports_structure = True
+    concurrency = ACTORS_ACCESS_CONCURRENCY
 
     @property
     def source_name(self) -> str:
         return "actors_access"
 
-    def scrape(self) -> list[CastingListing]:
+    def fetch(self) -> list[str]:
+        """Returns one JSON list of projects (with breakdown text) per index page."""
         email = os.environ.get("ACTORS_ACCESS_EMAIL", "")
         password = os.environ.get("ACTORS_ACCESS_PASSWORD", "")
         if not email or not password:
             logger.info("Actors Access credentials not configured, skipping")
             return []
 
-        try:
-            from playwright.sync_api import sync_playwright
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-
-                # Attempt login
-                page.goto("https://www.actorsaccess.com/", wait_until="networkidle", timeout=60000)
-                page.fill('input[name="email"], input[type="email"]', email)
-                page.fill('input[name="password"], input[type="password"]', password)
-                page.click('button[type="submit"], input[type="submit"]')
-                page.wait_for_load_state("networkidle", timeout=30000)
-
-                # Navigate to projects
-                page.goto(ACTORS_ACCESS_URL, wait_until="networkidle", timeout=60000)
+        state = ACTORS_ACCESS_STATE_PATH if os.path.exists(ACTORS_ACCESS_STATE_PATH) else None
+        with browser_pool.context(storage_state=state) as context:
+            page = context.new_page()
+            page.goto(ACTORS_ACCESS_URL, wait_until="domcontentloaded", timeout=60000)
+            if _needs_login(page):
+                logger.info("Actors Access session missing or expired; logging in")
+                _login(page, email, password)
+                page.goto(ACTORS_ACCESS_URL, wait_until="domcontentloaded", timeout=60000)
+                if _needs_login(page):
+                    raise RuntimeError("Actors Access login failed")
+            indexes = {ACTORS_ACCESS_URL: page.evaluate(_INDEX_JS, _PROJECT_SELECTOR)}
+            if not indexes[ACTORS_ACCESS_URL]["projects"]:
+                # Parsed as HTML (no projects), so breakage detection sees the page
+                logger.warning("Actors Access: no projects found in page; falling back to full HTML")
                 html = page.content()
-                browser.close()
-                return self.parse_html(html)
-        except Exception:
-            logger.exception("Actors Access scraper failed")
-            return []
+                page.close()
+                _save_state(context)
+                return [html]
+            page.close()
+
+            # Index pages: follow pagination links wave by wave, up to the cap
+            frontier = indexes[ACTORS_ACCESS_URL]["pages"]
+            while frontier and len(indexes) < ACTORS_ACCESS_MAX_PAGES:
+                todo = list(dict.fromkeys(u for u in frontier if u not in indexes))
+                todo = todo[:ACTORS_ACCESS_MAX_PAGES - len(indexes)]
+                found = _visit_all(context, todo, self.concurrency, _INDEX_JS, _PROJECT_SELECTOR)
+                indexes.update(found)
+                indexes.update({url: {"projects": [], "pages": []} for url in todo if url not in found})
+                frontier = [u for result in found.values() for u in result["pages"]]
+
+            # Breakdown pages for every project, each once
+            groups: list[list[dict]] = []
+            urls: dict[str, None] = {}
+            for result in indexes.values():
+                group = [p for p in result["projects"] if p["url"] not in urls]
+                urls.update(dict.fromkeys(p["url"] for p in group))
+                groups.append(group)
+            details = _visit_all(context, list(urls), self.concurrency, _BREAKDOWN_JS)
+
+            # Saved after every run so refreshed session cookies carry over
+            _save_state(context)
+
+        logger.info(f"Actors Access: {len(urls)} project(s) on {len(indexes)} page(s), "
+                    f"{len(details)} breakdown(s) read")
+        return [
+            json.dumps([{**p, "text": details.get(p["url"], "")} for p in group])
+            for group in groups if group
+        ]
+
+    def parse(self, body: str) -> list[CastingListing]:
+        return self._projects_to_listings(self._projects(body))
+
+    def parse_stats(self, body: str) -> tuple[list[CastingListing], PageStats]:
+        projects = self._projects(body)
+        missing = {key: sum(1 for p in projects if not p.get(key)) for key in _PROJECT_KEYS}
+        return (self._projects_to_listings(projects),
+                PageStats(len(projects), {key: n for key, n in missing.items() if n}))
 
     def parse_html(self, html: str) -> list[CastingListing]:
         """Parse Actors Access project listings. Selectors need live verification."""
-        soup = BeautifulSoup(html, "html.parser")
-        listings: list[CastingListing] = []
-
-        # Actors Access uses various layouts; these are best-guess selectors
-        projects = soup.select(".project-listing, .project-item, tr.project-row")
+        return self._projects_to_listings(self._projects(html))
+
+    def _projects(self, body: str) -> list[dict]:
+        """The project dicts in a fetched body: fetch()'s JSON, or index page HTML."""
+        if body.lstrip().startswith("["):
+            return json.loads(body)
+        soup = BeautifulSoup(body, "html.parser")
+        projects: list[dict] = []
+        for project in soup.select(_PROJECT_SELECTOR):
+            link = project.find("a")
+            if link:
+                projects.append({"title": link.get_text(strip=True), "url": link.get("href", "")})
+        return projects
+
+    def _projects_to_listings(self, projects: list[dict]) -> list[CastingListing]:
+        rows: list[tuple[str, str, str]] = []
         for project in projects:
             try:
-                link = project.find("a")
-                if not link:
+                href = project.get("url") or ""
+                title = " ".join((project.get("title") or "").split())
+                if not href or not title:
                     continue
-                href = link.get("href", "")
                 url = href if href.startswith("http") else f"https://www.actorsaccess.com{href}"
-                title = link.get_text(strip=True)
-                if not title:
-                    continue
-
-                listings.append(CastingListing(
-                    title=title,
-                    source="actors_access",
-                    url=url,
-                    posted_date=date.today(),
-                    location="Los Angeles, CA",
-                    union_status="non-union",
-                    role_type="other",
-                    description=title,
-                    how_to_apply=f"Apply on Actors Access: {url}",
-                ))
+                text = " ".join((project.get("text") or "").split())
+                rows.append((title, url, text))
             except Exception:
                 logger.exception("Failed to parse Actors Access project")
                 continue
 
+        # The breakdown text, when fetched, is where the location, pay and dates are
+        listings: list[CastingListing] = []
+        for (title, url, text), extracted in zip(
+            rows, extract_all(f"{title} {text}" for title, _, text in rows)
+        ):
+            listings.append(CastingListing(
+                title=title,
+                source="actors_access",
+                url=url,
+                posted_date=parse_today(),
+                location=extracted.location or "Los Angeles, CA",
+                union_status=extracted.union_status or "non-union",
+                role_type=extracted.role_type,
+                description=text[:500] or title,
+                how_to_apply=f"Apply on Actors Access: {url}",
+                compensation=extracted.compensation,
+                deadline=extracted.deadline,
+                school_or_production=extracted.school,
+            ))
         return listings
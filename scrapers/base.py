@@ -3,8 +3,12 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
+from datetime import date
 
 from models import CastingListing
+from scrapers.dates import resolve_dates
+from scrapers.parse_cache import parse_cache, parse_key
+from scrapers.parse_pool import PageStats, from_row, parse_pool
 
 logger = logging.getLogger(__name__)
 
@@ -12,12 +16,74 @@ logger = logging.getLogger(__name__)
 class BaseScraper(ABC):
     """Interface all scrapers implement."""
 
+    # Bump when parse() (or scrapers.extract) output changes, so cached
+    # results from the old parser are not reused.
+    parser_version: int = 2
+
+    # Pages or requests fetch() may have in flight at once; set from the
+    # source's ScraperSpec (see scrapers.registry).
+    concurrency: int = 1
+
+    # Size of the page bodies the last scrape() fetched, for run metrics
+    fetched_bytes: int = 0
+
+    # Each page body the last scrape() fetched, with what its parser matched,
+    # for breakage detection (see breakage.py)
+    last_pages: list[tuple[str, PageStats]] = []
+
+    # Whether parse_stats counts what a card or row selector matched; only
+    # such sources are judged for breakage (the default just counts listings).
+    reports_structure: bool = False
+
     @property
     @abstractmethod
     def source_name(self) -> str:
         ...
 
-    @abstractmethod
     def scrape(self) -> list[CastingListing]:
-        """Fetch and parse listings. Returns empty list on failure."""
+        """Fetch and parse listings.
+
+        Raises if the source could not be fetched, so the caller can report it
+        and feed the circuit breaker. Returns an empty list when the source is
+        simply not configured (e.g. missing credentials).
+        """
+        bodies = self.fetch()
+        self.fetched_bytes = sum(len(body) for body in bodies or ())
+        self.last_pages = []
+        if not bodies:
+            return []
+        keys = [parse_key(self.source_name, self.parser_version, body) for body in bodies]
+        pages = parse_cache.get_many(keys)
+        misses = {key: body for key, body in zip(keys, bodies) if key not in pages}
+        if misses:
+            parsed = dict(zip(misses, parse_pool.parse_pages(self.parse_stats, list(misses.values()))))
+            parse_cache.put_many(parsed)
+            pages.update(parsed)
+        logger.info(f"{self.source_name}: {len(bodies) - len(misses)} of {len(bodies)} page(s) unchanged")
+        self.last_pages = [(body, pages[key].stats) for key, body in zip(keys, bodies)]
+        today = date.today()
+        return [resolve_dates(from_row(row), today) for key in keys for row in pages[key].rows]
+
+    @abstractmethod
+    def fetch(self) -> list[str]:
+        """Download the raw page bodies to parse (I/O only)."""
         ...
+
+    @abstractmethod
+    def parse(self, body: str) -> list[CastingListing]:
+        """Parse one page body into listings.
+
+        May run in a worker process (see scrapers.parse_pool), so it must be
+        pure: no network, browser or other instance state.
+        """
+        ...
+
+    def parse_stats(self, body: str) -> tuple[list[CastingListing], PageStats]:
+        """Parse one page body and report what the parser matched.
+
+        The default counts each listing as a candidate. Parsers built on a
+        card or row selector override it to count what the selector matched
+        and which fields those candidates lacked.
+        """
+        listings = self.parse(body)
+        return listings, PageStats(len(listings), {})
@@ -0,0 +1,63 @@
+# scrapers/browser.py
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """Headless Chromium shared by all browser-based scrapers.
+
+    The browser is launched on first use and kept until close(), so a one-shot
+    run launches it at most once and daemon mode keeps it warm between polls.
+    Playwright's sync API is bound to the thread that started it; use the pool
+    from a single thread.
+    """
+
+    def __init__(self) -> None:
+        self._playwright: Any = None
+        self._browser: Browser | None = None
+
+    def browser(self) -> Browser:
+        if self._browser is None or not self._browser.is_connected():
+            from playwright.sync_api import sync_playwright
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            logger.info("Launching headless Chromium")
+            self._browser = self._playwright.chromium.launch(headless=True)
+        return self._browser
+
+    @contextmanager
+    def context(self, **kwargs: Any) -> Iterator[BrowserContext]:
+        """Yield a fresh, isolated browser context; closed on exit."""
+        context = self.browser().new_context(**kwargs)
+        try:
+            yield context
+        finally:
+            context.close()
+
+    @contextmanager
+    def page(self, **kwargs: Any) -> Iterator[Page]:
+        """Yield a page in its own fresh context; closed on exit."""
+        with self.context(**kwargs) as context:
+            yield context.new_page()
+
+    def close(self) -> None:
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                logger.exception("Failed to close browser")
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,190 @@
+# scrapers/cards.py
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from bs4 import BeautifulSoup
+
+from models import CastingListing
+from scrapers.dates import parse_today
+from scrapers.extract import extract_all
+from scrapers.parse_pool import PageStats
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page, Response
+
+logger = logging.getLogger(__name__)
+
+# A card is a plain dict: {"title", "href", "location", "union", "role"}; any
+# value may be None. It is what the browser ships back, what the parse cache
+# stores and what both the JSON and HTML paths produce.
+_CARD_KEYS = ("title", "href", "location", "union", "role")
+
+
+@dataclass(frozen=True)
+class CardSite:
+    """Where one listing site keeps its cards, in its DOM and its own API."""
+
+    source: str
+    base_url: str
+    apply_label: str
+    card: str  # CSS selector for one listing card
+    title: str | None = None  # within a card; defaults to the first link's text
+    location: str | None = None
+    union: str | None = None
+    role: str | None = None
+    # Site XHR/fetch responses matching this are read as JSON instead of the DOM
+    api_url: re.Pattern[str] | None = None
+    # Card key -> candidate field names in an API object
+    api_fields: tuple[tuple[str, tuple[str, ...]], ...] = ()
+
+
+# Runs in the page: one pass over the DOM, returning only the card fields.
+_EXTRACT_CARDS_JS = """
+(site) => Array.from(document.querySelectorAll(site.card)).map(card => {
+    const text = sel => {
+        const el = sel ? card.querySelector(sel) : null;
+        return el ? el.textContent.trim() : null;
+    };
+    const link = card.querySelector("a");
+    return {
+        title: text(site.title) || (link ? link.textContent.trim() : null)
+            || card.textContent.trim().slice(0, 100),
+        href: link ? link.getAttribute("href") : null,
+        location: text(site.location),
+        union: text(site.union),
+        role: text(site.role),
+    };
+})
+"""
+
+
+def _selectors(site: CardSite) -> dict[str, str | None]:
+    return {"card": site.card, "title": site.title, "location": site.location,
+            "union": site.union, "role": site.role}
+
+
+def fetch_cards(page: Page, site: CardSite, url: str) -> str:
+    """Load `url` and return its cards as a JSON array, or the raw HTML if
+    neither the site's API responses nor the in-page extraction yield any."""
+    responses: list[Response] = []
+    if site.api_url is not None:
+        page.on("response", lambda r: responses.append(r) if site.api_url.search(r.url) else None)
+    page.goto(url, wait_until="networkidle", timeout=60000)
+
+    cards: list[dict] = []
+    for response in responses:
+        try:
+            cards.extend(cards_from_json(response.json(), site))
+        except Exception:
+            logger.debug(f"{site.source}: ignoring non-JSON response {response.url}")
+    if cards:
+        logger.info(f"{site.source}: {len(cards)} cards from {len(responses)} API response(s)")
+        return json.dumps(cards)
+
+    try:
+        cards = page.evaluate(_EXTRACT_CARDS_JS, _selectors(site))
+    except Exception:
+        logger.exception(f"{site.source}: in-page card extraction failed")
+    if cards:
+        return json.dumps(cards)
+
+    logger.warning(f"{site.source}: no cards found in page; falling back to full HTML")
+    return page.content()
+
+
+def cards_from_json(data: Any, site: CardSite) -> list[dict]:
+    """Find card-shaped objects (a title and a link) anywhere in an API payload."""
+    cards: list[dict] = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            card = {}
+            for key, candidates in site.api_fields:
+                card[key] = next(
+                    (node[c] for c in candidates if isinstance(node.get(c), str) and node[c]), None
+                )
+            if card.get("title") and card.get("href"):
+                cards.append({k: card.get(k) for k in _CARD_KEYS})
+            else:
+                stack.extend(reversed(list(node.values())))
+    return cards
+
+
+def cards_from_html(html: str, site: CardSite) -> list[dict]:
+    """The HTML fallback: the same fields _EXTRACT_CARDS_JS reads, via BeautifulSoup."""
+    soup = BeautifulSoup(html, "html.parser")
+    cards: list[dict] = []
+    for card in soup.select(site.card):
+        def text(selector: str | None) -> str | None:
+            el = card.select_one(selector) if selector else None
+            return el.get_text(" ", strip=True) if el else None
+
+        link = card.find("a")
+        cards.append({
+            "title": text(site.title) or (link.get_text(" ", strip=True) if link else None)
+            or card.get_text(" ", strip=True)[:100],
+            "href": link.get("href") if link else None,
+            "location": text(site.location),
+            "union": text(site.union),
+            "role": text(site.role),
+        })
+    return cards
+
+
+def parse_cards(body: str, site: CardSite) -> list[CastingListing]:
+    """Parse what fetch_cards returned: a JSON card array, or HTML."""
+    return parse_cards_stats(body, site)[0]
+
+
+def parse_cards_stats(body: str, site: CardSite) -> tuple[list[CastingListing], PageStats]:
+    """parse_cards, plus how many cards there were and which fields they lacked."""
+    cards = json.loads(body) if body.lstrip().startswith("[") else cards_from_html(body, site)
+    return cards_to_listings(cards, site), card_stats(cards)
+
+
+def card_stats(cards: list[dict]) -> PageStats:
+    missing = {key: sum(1 for card in cards if not card.get(key)) for key in _CARD_KEYS}
+    return PageStats(len(cards), {key: n for key, n in missing.items() if n})
+
+
+def cards_to_listings(cards: list[dict], site: CardSite) -> list[CastingListing]:
+    # Structured card fields win; the title text fills any gaps
+    rows: list[tuple[str, str, dict]] = []
+    for card in cards:
+        try:
+            href = card.get("href") or ""
+            title = " ".join((card.get("title") or "").split())
+            if not href or not title:
+                continue
+            url = href if href.startswith("http") else f"{site.base_url}{href}"
+            rows.append((title, url, card))
+        except Exception:
+            logger.exception(f"Failed to parse {site.source} card")
+            continue
+
+    listings: list[CastingListing] = []
+    for (title, url, card), extracted in zip(rows, extract_all(r[0] for r in rows)):
+        role = card.get("role")
+        listings.append(CastingListing(
+            title=title,
+            source=site.source,
+            url=url,
+            posted_date=parse_today(),
+            location=card.get("location") or extracted.location or "Los Angeles, CA",
+            union_status=card.get("union") or extracted.union_status or "non-union",
+            role_type=role.strip().lower() if role else extracted.role_type,
+            description=title,
+            how_to_apply=f"{site.apply_label}: {url}",
+            compensation=extracted.compensation,
+            deadline=extracted.deadline,
+            school_or_production=extracted.school,
+        ))
+    return listings
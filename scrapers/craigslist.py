@@ -3,16 +3,25 @@ from __future__ import annotations
 
 import logging
 from datetime import date, datetime
+from urllib.parse import urlsplit
 
-import requests
 from bs4 import BeautifulSoup
 
+from markets import active_markets, all_markets
 from models import CastingListing
 from scrapers.base import BaseScraper
+from scrapers.dates import parse_today, posted_on
+from scrapers.extract import extract_all
+from scrapers.session import fetch
 
 logger = logging.getLogger(__name__)
 
-CRAIGSLIST_URL = "https://losangeles.craigslist.org/search/tlg"
+# Talent gigs search, on each active market's Craigslist site(s)
+SEARCH_PATH = "/search/tlg"
+DEFAULT_SITE = "https://losangeles.craigslist.org"
+
+# Site -> its market's city, for posts that give no neighbourhood
+_SITE_CITY = {site: m.city for m in all_markets().values() for site in m.craigslist_urls}
 
 
 class CraigslistScraper(BaseScraper):
@@ -20,21 +29,32 @@ class CraigslistScraper(BaseScraper):
     def source_name(self) -> str:
         return "craigslist"
 
-    def scrape(self) -> list[CastingListing]:
-        try:
-            resp = requests.get(CRAIGSLIST_URL, timeout=30, headers={
-                "User-Agent": "Mozilla/5.0 (compatible; CastingScout/1.0)"
-            })
-            resp.raise_for_status()
-            return self.parse_html(resp.text)
-        except Exception:
-            logger.exception("Craigslist scraper failed")
-            return []
+    def fetch(self) -> list[str]:
+        sites = [site for market in active_markets() for site in market.craigslist_urls]
+        bodies: list[str] = []
+        errors: list[Exception] = []
+        for site in sites:
+            try:
+                resp = fetch(f"{site}{SEARCH_PATH}", headers={
+                    "User-Agent": "Mozilla/5.0 (compatible; CastingScout/1.0)"
+                })
+                bodies.append(resp.text)
+            except Exception as e:
+                logger.warning(f"Craigslist scraper failed for {site}: {e}")
+                errors.append(e)
+        if errors and len(errors) == len(sites):
+            raise errors[-1]
+        return bodies
+
+    def parse(self, body: str) -> list[CastingListing]:
+        return self.parse_html(body)
 
     def parse_html(self, html: str) -> list[CastingListing]:
         """Parse Craigslist talent gigs HTML into CastingListing objects."""
         soup = BeautifulSoup(html, "html.parser")
-        listings: list[CastingListing] = []
+        canonical = soup.find("link", rel="canonical")
+        page_site = _site(canonical.get("href", "")) if canonical else None
+        rows: list[tuple[str, str, str, date]] = []
 
         results = soup.select("li.cl-static-search-result")
         for item in results:
@@ -42,72 +62,56 @@ class CraigslistScraper(BaseScraper):
                 link = item.find("a")
                 if not link:
                     continue
-                url = link.get("href", "")
+                href = link.get("href", "")
+                url = href if href.startswith("http") else f"{page_site or DEFAULT_SITE}{href}"
                 title_el = item.select_one(".title")
                 title = title_el.get_text(strip=True) if title_el else item.get("title", "")
-                if not title or not url:
+                if not title or not href:
                     continue
 
                 location_el = item.select_one(".location")
-                location = location_el.get_text(strip=True) if location_el else "Los Angeles"
+                location = (location_el.get_text(strip=True) if location_el
+                            else _SITE_CITY.get(_site(url), "Los Angeles, CA"))
 
                 date_el = item.select_one(".date")
-                posted = self._parse_date(date_el.get_text(strip=True)) if date_el else date.today()
-
-                role_type = self._infer_role_type(title)
-                school = self._detect_school(title)
-
-                listings.append(CastingListing(
-                    title=title,
-                    source="craigslist",
-                    url=url if url.startswith("http") else f"https://losangeles.craigslist.org{url}",
-                    posted_date=posted,
-                    location=location,
-                    union_status="",  # Craigslist rarely specifies
-                    role_type=role_type,
-                    description=title,  # Full description requires visiting each post
-                    how_to_apply=f"Reply on Craigslist: {url}",
-                    school_or_production=school,
-                ))
+                posted = self._parse_date(date_el.get_text(strip=True)) if date_el else parse_today()
+                rows.append((title, url, location, posted))
             except Exception:
                 logger.exception("Failed to parse Craigslist listing")
                 continue
 
+        listings: list[CastingListing] = []
+        for (title, url, location, posted), extracted in zip(rows, extract_all(r[0] for r in rows)):
+            listings.append(CastingListing(
+                title=title,
+                source="craigslist",
+                url=url,
+                posted_date=posted,
+                location=location,
+                union_status=extracted.union_status,
+                role_type=extracted.role_type,
+                description=title,  # Full description requires visiting each post
+                how_to_apply=f"Reply on Craigslist: {url}",
+                compensation=extracted.compensation,
+                deadline=extracted.deadline,
+                school_or_production=extracted.school,
+            ))
         return listings
 
     def _parse_date(self, text: str) -> date:
-        """Parse Craigslist date strings like 'Feb 25' or '2/25'."""
-        try:
-            current_year = date.today().year
-            for fmt in ("%b %d", "%m/%d"):
-                try:
-                    parsed = datetime.strptime(text.strip(), fmt).replace(year=current_year)
-                    return parsed.date()
-                except ValueError:
-                    continue
-        except Exception:
-            pass
-        return date.today()
-
-    def _infer_role_type(self, title: str) -> str:
-        t = title.lower()
-        if any(w in t for w in ("background", "extra", "extras", "bg")):
-            return "background"
-        if any(w in t for w in ("lead", "principal", "starring")):
-            return "principal"
-        if any(w in t for w in ("commercial", "spot", "ad ")):
-            return "commercial"
-        if any(w in t for w in ("voice", "vo ", "voiceover")):
-            return "voice"
-        return "other"
-
-    def _detect_school(self, title: str) -> str | None:
-        t = title.lower()
-        schools = {"usc": "USC", "ucla": "UCLA", "afi": "AFI", "calarts": "CalArts",
-                    "chapman": "Chapman", "lmu": "LMU", "loyola marymount": "LMU"}
-        for key, name in schools.items():
-            if key in t:
-                return name
-        if "student film" in t:
-            return "Student Film"
-        return None
+        """Parse Craigslist date strings like 'Feb 25' or '2/25' (the latest
+        such day not after today)."""
+        for fmt in ("%b %d", "%m/%d"):
+            try:
+                # Any leap year, so "Feb 29" parses
+                parsed = datetime.strptime(f"{text.strip()} 2000", f"{fmt} %Y")
+            except ValueError:
+                continue
+            return posted_on(parsed.month, parsed.day)
+        return parse_today()
+
+
+def _site(url: str) -> str:
+    """'https://atlanta.craigslist.org/atl/tlg/d/1.html' -> 'https://atlanta.craigslist.org'"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
@@ -0,0 +1,79 @@
+# scrapers/dates.py
+from __future__ import annotations
+
+import dataclasses
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, timedelta
+
+from config import DEADLINE_PAST_GRACE_DAYS
+from models import CastingListing
+
+# Parsing for the parse cache (see scrapers.parse_pool) defers the dates that
+# depend on the day, so a page parses the same whatever the day and its result
+# can be reused on later days: "today" comes out as TODAY, and a month/day
+# without a year in YEARLESS_YEAR (a leap year, so Feb 29 fits).
+# resolve_dates() turns them into real dates on the day they are read.
+TODAY = date.min
+YEARLESS_YEAR = 4
+_deferred: ContextVar[bool] = ContextVar("deferred_dates", default=False)
+
+
+@contextmanager
+def deferred_dates():
+    """Defer day-dependent dates within the block (see TODAY)."""
+    token = _deferred.set(True)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+
+
+def parse_today() -> date:
+    """The day parsers call "today": date.today(), or TODAY while deferred."""
+    return TODAY if _deferred.get() else date.today()
+
+
+def posted_on(month: int, day: int) -> date:
+    """A posting date given as a month/day, for parsers (see resolve_dates)."""
+    if _deferred.get():
+        return date(YEARLESS_YEAR, month, day)
+    try:
+        return latest(month, day, date.today())
+    except ValueError:  # Feb 29 outside a leap year
+        return date.today()
+
+
+def resolve_dates(listing: CastingListing, today: date | None = None) -> CastingListing:
+    """The listing with any deferred dates resolved against `today`."""
+    today = today or date.today()
+    posted, deadline = listing.posted_date, listing.deadline
+    if posted == TODAY:
+        posted = today
+    elif posted.year == YEARLESS_YEAR:
+        try:
+            posted = latest(posted.month, posted.day, today)
+        except ValueError:
+            posted = today
+    if deadline is not None and deadline.year == YEARLESS_YEAR:
+        try:
+            deadline = upcoming(deadline.month, deadline.day, today)
+        except ValueError:
+            deadline = None
+    if posted is listing.posted_date and deadline is listing.deadline:
+        return listing
+    return dataclasses.replace(listing, posted_date=posted, deadline=deadline)
+
+
+def upcoming(month: int, day: int, today: date) -> date:
+    """A month/day deadline: this year, or next if it's well past."""
+    resolved = date(today.year, month, day)
+    if resolved < today - timedelta(days=DEADLINE_PAST_GRACE_DAYS):
+        resolved = date(today.year + 1, month, day)
+    return resolved
+
+
+def latest(month: int, day: int, today: date) -> date:
+    """A month/day posting date: the last one not after today."""
+    resolved = date(today.year, month, day)
+    return resolved if resolved <= today else date(today.year - 1, month, day)
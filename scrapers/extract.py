@@ -0,0 +1,217 @@
+# scrapers/extract.py
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+
+from gazetteer import default_gazetteer, words as _words
+from scrapers.dates import TODAY, YEARLESS_YEAR, parse_today, upcoming
+
+
+class Extracted(NamedTuple):
+    location: str
+    role_type: str
+    school: str | None
+    union_status: str
+    compensation: str | None
+    deadline: date | None
+
+
+# Positions in Extracted, and each field's value when no term matches
+_LOCATION, _ROLE_TYPE, _SCHOOL, _UNION_STATUS, _COMPENSATION = range(5)
+_DEFAULTS = ("", "other", None, "", None)
+
+# Term tables: (field, [(value, terms), ...]). Within a field an earlier value
+# beats a later one wherever it appears in the text, so a named neighbourhood
+# wins over plain "LA". Place names come from the gazetteer.
+_TABLES: list[tuple[int, list[tuple[str, tuple[str, ...]]]]] = [
+    (_LOCATION, default_gazetteer().terms()),
+    (_ROLE_TYPE, [
+        ("background", ("background", "extra", "extras", "bg", "stand-in", "stand-ins")),
+        ("principal", ("lead", "leads", "principal", "principals", "starring", "supporting")),
+        ("commercial", ("commercial", "commercials", "spot", "ad", "ads")),
+        ("voice", ("voice", "voiceover", "voice-over", "vo", "v.o.")),
+    ]),
+    (_SCHOOL, [
+        ("USC", ("usc",)), ("UCLA", ("ucla",)), ("AFI", ("afi",)),
+        ("CalArts", ("calarts", "cal arts")), ("Chapman", ("chapman",)),
+        ("LMU", ("lmu", "loyola marymount")),
+        ("Student Film", ("student film", "student films", "student short")),
+    ]),
+    (_UNION_STATUS, [
+        ("non-union", ("non-union", "nonunion", "non union", "no union",
+                       "any union status", "open to all")),
+        ("SAG-AFTRA", ("sag", "aftra", "sag-aftra", "union only")),
+    ]),
+    # Dollar amounts are found separately (_PAY_RE) and take precedence
+    (_COMPENSATION, [
+        ("Unpaid", ("unpaid", "no pay", "not paid", "volunteer")),
+        ("Deferred pay", ("deferred", "deferred pay")),
+        ("Copy/credit/meals", ("copy credit meals", "copy credit and meals", "copy credit & meals")),
+        ("Copy/credit", ("copy credit", "copy and credit", "copy & credit")),
+        ("Paid", ("paid", "paying", "pays")),
+    ]),
+]
+
+
+def _build_index() -> dict[str, list[tuple[tuple[str, ...], int, int, str]]]:
+    """first word -> [(remaining words, field, rank, value)], longest phrase first."""
+    index: dict[str, list[tuple[tuple[str, ...], int, int, str]]] = {}
+    for field, table in _TABLES:
+        for rank, (value, terms) in enumerate(table):
+            for term in terms:
+                first, *rest = _words(term.lower())
+                index.setdefault(first, []).append((tuple(rest), field, rank, value))
+    for entries in index.values():
+        entries.sort(key=lambda e: len(e[0]), reverse=True)
+    return index
+
+
+# Every term is indexed by its first word, so a text is split once and each
+# word costs one dict lookup however many terms there are. Terms only match
+# whole words: "lead" no longer fires on "misleading", "extra" on "extraordinary".
+_INDEX = _build_index()
+
+
+_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1
+)}
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+# "march 20", "mar. 20th, 2026", "3/20", "3/20/26", and ranges "march 20-22",
+# "3/20 - 3/22", "march 30 to april 2". A range resolves to its last day.
+_DATE = (
+    rf"(?:{_MONTH}\s+\d{{1,2}}|\d{{1,2}}/\d{{1,2}}(?:/\d{{2,4}})?)(?:st|nd|rd|th)?"
+    rf"(?:\s*(?:-|–|to|thru|through)\s*(?:{_MONTH}\s+)?(?:\d{{1,2}}/)?\d{{1,2}}(?:st|nd|rd|th)?)?"
+    rf"(?:,?\s+\d{{4}})?"
+)
+# A date right after a submission cue is the deadline; otherwise the last
+# shoot/audition date is, since the call is over once the shoot is.
+_DATE_RE = re.compile(
+    r"\b(?:(?P<submit>submit|submissions?|apply|applications?|deadline|due|respond|reply)"
+    r"|(?P<shoot>shoots?|shooting|filming|films|shoot dates?|auditions?|callbacks?))\b"
+    rf"[^.!?\n\d]{{0,30}}?(?P<date>{_DATE})"
+)
+_DATE_PART_RE = re.compile(
+    r"(?:(?P<month>[a-z]+)\.?\s+)?(?:(?P<num_month>\d{1,2})/)?(?P<day>\d{1,2})(?:st|nd|rd|th)?"
+    r"(?:/(?P<short_year>\d{2,4}))?"
+)
+_YEAR_RE = re.compile(r"\b(\d{4})$")
+
+_PAY_RE = re.compile(
+    r"\$\s?(?P<amount>\d[\d,]*(?:\.\d\d)?)"
+    r"(?:\s*(?:/|per|an?)\s*(?P<unit>day|hr|hour|week|wk|episode|session)\b|\s+(?P<flat>flat)\b)?"
+)
+_PAY_UNITS = {"hour": "hr", "week": "wk"}
+
+
+@lru_cache(maxsize=1)
+def fingerprint() -> str:
+    """Identifies the term tables (place names included) and patterns
+    extract() matches with, so parses made with others aren't reused."""
+    spec = [_TABLES, _DATE_RE.pattern, _DATE_PART_RE.pattern, _PAY_RE.pattern, _PAY_UNITS]
+    return hashlib.sha256(json.dumps(spec).encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(phrase: str, today: date) -> date | None:
+    """Resolve a matched _DATE phrase to a date (the last day of a range).
+
+    Postings rarely give a year: a bare month/day is taken in the current
+    year unless that lies more than DEADLINE_PAST_GRACE_DAYS in the past, in
+    which case it means next year (a December post's "shoots Jan 5"). The
+    same phrases recur across posts, so results are cached per phrase and day.
+    While dates are deferred, a month/day is left in YEARLESS_YEAR.
+    """
+    year_match = _YEAR_RE.search(phrase)
+    year = int(year_match.group(1)) if year_match else None
+    month = None
+    end = None
+    for part in _DATE_PART_RE.finditer(phrase[:year_match.start()] if year_match else phrase):
+        if part.group("month"):
+            month = _MONTHS.get(part.group("month")[:3])
+        elif part.group("num_month"):
+            month = int(part.group("num_month"))
+        if part.group("short_year"):
+            short_year = int(part.group("short_year"))
+            year = short_year + 2000 if short_year < 100 else short_year
+        end = (month, int(part.group("day")))
+    if end is None or end[0] is None:
+        return None
+    try:
+        if year is not None:
+            return date(year, *end)
+        if today == TODAY:
+            return date(YEARLESS_YEAR, *end)
+        return upcoming(*end, today)
+    except ValueError:
+        return None
+
+
+
+def _deadline(lowered: str, today: date) -> date | None:
+    shoot_date = None
+    for match in _DATE_RE.finditer(lowered):
+        parsed = _parse_date(match.group("date"), today)
+        if parsed is None:
+            continue
+        if match.group("submit"):
+            return parsed
+        shoot_date = max(shoot_date or parsed, parsed)
+    return shoot_date
+
+
+def _pay(lowered: str) -> str | None:
+    match = _PAY_RE.search(lowered)
+    if not match:
+        return None
+    amount = f"${match.group('amount')}"
+    if match.group("unit"):
+        unit = match.group("unit")
+        return f"{amount}/{_PAY_UNITS.get(unit, unit)}"
+    return f"{amount} flat" if match.group("flat") else amount
+
+
+def extract(text: str, today: date | None = None) -> Extracted:
+    """Pull structured fields out of a listing's free text.
+
+    `today` anchors dates given without a year; it defaults to parse_today().
+    """
+    lowered = text.lower()
+    words = _words(lowered)
+    found: list[tuple[int, str] | None] = [None] * len(_DEFAULTS)
+    skip_to = 0
+    for i, word in enumerate(words):
+        if i < skip_to:
+            continue  # inside a phrase already matched ("north hollywood")
+        entries = _INDEX.get(word)
+        if entries is None:
+            continue
+        for rest, field, rank, value in entries:
+            if rest and tuple(words[i + 1:i + 1 + len(rest)]) != rest:
+                continue
+            best = found[field]
+            if best is None or rank < best[0]:
+                found[field] = (rank, value)
+            skip_to = i + 1 + len(rest)
+            break
+    location, role_type, school, union_status, compensation = (
+        f[1] if f else d for f, d in zip(found, _DEFAULTS)
+    )
+    return Extracted(
+        location=location,
+        role_type=role_type,
+        school=school,
+        union_status=union_status,
+        compensation=_pay(lowered) or compensation,
+        deadline=_deadline(lowered, today or parse_today()),
+    )
+
+
+def extract_all(texts: Iterable[str], today: date | None = None) -> list[Extracted]:
+    """Extract fields from a batch of listing texts (one result per text)."""
+    today = today or parse_today()
+    return [extract(t, today) for t in texts]
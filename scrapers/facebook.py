@@ -4,30 +4,158 @@ from __future__ import annotations
 import json
 import logging
 import os
-from datetime import date
+import re
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
 from bs4 import BeautifulSoup
 
-from models import CastingListing
+from config import (
+    FRESHNESS_HOURS, FACEBOOK_MAX_SCROLLS, FACEBOOK_SCROLL_PAUSE_MS,
+    FACEBOOK_IDLE_ROUNDS, FACEBOOK_STOP_AFTER_KNOWN, FACEBOOK_POSTS_DAYS, FACEBOOK_POSTS_PATH,
+)
+from markets import active_markets
+from models import CastingListing, listing_key
 from scrapers.base import BaseScraper
+from scrapers.browser import browser_pool
+from scrapers.dates import parse_today
+from scrapers.extract import extract_all
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
 
 logger = logging.getLogger(__name__)
 
-# Public casting groups in LA area
-FACEBOOK_GROUPS = [
-    "https://www.facebook.com/groups/lacastingcalls",
-    "https://www.facebook.com/groups/actorsinla",
-]
+# Only posts mentioning one of these are treated as casting calls
+CASTING_KEYWORDS = ("casting", "audition", "seeking", "looking for actors",
+                    "open call", "background", "extras", "role")
+
+# Runs in the page: returns posts not returned by an earlier call (they are
+# tagged as collected), so each scroll step only ships the new ones back
+# instead of re-serializing the whole feed with page.content().
+_COLLECT_NEW_POSTS_JS = """
+() => {
+    const posts = [];
+    for (const el of document.querySelectorAll(
+            "[role='article']:not([data-scout-seen]), [data-ad-preview]:not([data-scout-seen])")) {
+        el.setAttribute("data-scout-seen", "1");
+        if (el.parentElement && el.parentElement.closest("[role='article']")) continue;  // a comment
+        const link = el.querySelector("a[href*='/posts/'], a[href*='/permalink/']")
+            || el.querySelector("a[href]");
+        const stamp = el.querySelector("abbr[data-utime]");
+        posts.push({
+            text: el.innerText || "",
+            url: link ? link.getAttribute("href") : "",
+            utime: stamp ? Number(stamp.dataset.utime) : null,
+            age: link ? (link.getAttribute("aria-label") || link.innerText || "") : "",
+        });
+    }
+    return posts;
+}
+"""
+
+_AGE_RE = re.compile(r"^(\d+)\s*(m|min|mins|h|hr|hrs|d|w)\b")
+_AGE_UNITS = {"m": "minutes", "min": "minutes", "mins": "minutes",
+              "h": "hours", "hr": "hours", "hrs": "hours", "d": "days", "w": "weeks"}
+
+
+def _post_time(post: dict, now: datetime) -> datetime | None:
+    """When a post was made, from its timestamp or relative age ("3h"), if known."""
+    if post.get("utime"):
+        return datetime.fromtimestamp(post["utime"])
+    age = post.get("age", "").strip().lower()
+    if age in ("just now", "now"):
+        return now
+    if age == "yesterday":
+        return now - timedelta(days=1)
+    match = _AGE_RE.match(age)
+    if match:
+        return now - timedelta(**{_AGE_UNITS[match.group(2)]: int(match.group(1))})
+    return None
+
+
+def _normalize(post: dict) -> tuple[str, str]:
+    """(text, absolute url) for a collected post, as both fetch and parse see it."""
+    text = " ".join(post.get("text", "").split())
+    url = post.get("url", "")
+    if url and not url.startswith("http"):
+        url = f"https://www.facebook.com{url}"
+    return text, url
+
+
+def _post_id(post: dict) -> str:
+    """The post's permalink without tracking parameters, else its opening text."""
+    text, url = _normalize(post)
+    return url.partition("?")[0] or text[:100]
+
+
+class _GroupFeed:
+    """One group's page while it is being scrolled."""
+
+    def __init__(self, url: str, page: Page):
+        self.url = url
+        self.page = page
+        self.posts: list[dict] = []
+        self.done = False
+        self._known_streak = 0
+        self._idle_rounds = 0
+
+    def step(self, is_known: Callable[[dict], bool], is_read: Callable[[dict], bool]) -> None:
+        """Collect newly rendered posts, then scroll for more unless finished.
+
+        Posts that `is_known` (stale or sent) are dropped. Posts that were
+        only read before are kept, as an earlier run may not have got them
+        sent, but both count towards stopping.
+        """
+        new = self.page.evaluate(_COLLECT_NEW_POSTS_JS)
+        self._idle_rounds = 0 if new else self._idle_rounds + 1
+        for post in new:
+            post["group"] = self.url
+            known, read = is_known(post), is_read(post)
+            if not known:
+                self.posts.append(post)
+            if known or read:
+                # Several in a row, so one pinned or bumped old post doesn't stop us
+                self._known_streak += 1
+                if self._known_streak >= FACEBOOK_STOP_AFTER_KNOWN:
+                    self.done = True
+                    break
+            else:
+                self._known_streak = 0
+        if self._idle_rounds >= FACEBOOK_IDLE_ROUNDS:
+            self.done = True
+        if not self.done:
+            self.page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
 
 
 class FacebookScraper(BaseScraper):
-    """Best-effort Facebook scraper. Highly fragile — Facebook blocks scrapers."""
+    """Best-effort Facebook scraper. Highly fragile — Facebook blocks scrapers.
+
+    Scrolls each group's feed and collects posts as they render, stopping at
+    posts already read (this run, or by one in the last FACEBOOK_POSTS_DAYS,
+    whose ids are kept in FACEBOOK_POSTS_PATH), already sent (per `is_seen`,
+    a dedup-key lookup) or older than the freshness window.
+    """
+
+    def __init__(self, is_seen: Callable[[str], bool] | None = None):
+        self._is_seen = is_seen
+        self._read: dict[str, str] | None = None  # post id -> day read; loaded on first fetch
+
+    def __getstate__(self) -> dict:
+        # Pickled for the parse pool, whose workers only run parse(). Early
+        # stopping is all in fetch(), in this process, so the workers need
+        # neither `is_seen` (a closure over the dedup stores) nor the read ids.
+        return {**self.__dict__, "_is_seen": None, "_read": None}
 
     @property
     def source_name(self) -> str:
         return "facebook"
 
-    def scrape(self) -> list[CastingListing]:
+    def fetch(self) -> list[str]:
+        """Returns one JSON list of collected posts per group."""
+        # Public casting groups of each active market (config.MARKETS)
+        groups = [group for market in active_markets() for group in market.facebook_groups]
         cookies_json = os.environ.get("FACEBOOK_COOKIES", "")
         if not cookies_json:
             logger.info("Facebook cookies not configured, skipping")
@@ -39,73 +167,136 @@ class FacebookScraper(BaseScraper):
             logger.warning("Invalid Facebook cookies JSON")
             return []
 
-        all_listings: list[CastingListing] = []
-        try:
-            from playwright.sync_api import sync_playwright
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context()
+        now = datetime.now()
+        cutoff = now - timedelta(hours=FRESHNESS_HOURS)
+        read_ids, today = self._read_posts(now.date()), now.date().isoformat()
+
+        def is_known(post: dict) -> bool:
+            # Stale or already seen. Also stamps the post's date for parse().
+            posted = _post_time(post, now)
+            if posted is not None:
+                post["posted"] = posted.date().isoformat()
+                if posted < cutoff:
+                    return True
+            if self._is_seen is None:
+                return False
+            text, url = _normalize(post)
+            return self._is_seen(listing_key(url or "https://www.facebook.com", text[:100].strip()))
 
-                # Set stored cookies
-                context.add_cookies(cookies)
+        def is_read(post: dict) -> bool:
+            # Read earlier in this run (another group) or by a recent run
+            post_id = _post_id(post)
+            read = post_id in read_ids
+            read_ids[post_id] = today
+            return read
 
-                for group_url in FACEBOOK_GROUPS:
+        feeds: list[_GroupFeed] = []
+        errors: list[Exception] = []
+        with browser_pool.context() as context:
+            context.add_cookies(cookies)
+
+            # Start every group loading before waiting on any: the pages share
+            # one context (and its cookies) and render in parallel.
+            for group_url in groups:
+                try:
+                    page = context.new_page()
+                    page.goto(group_url, wait_until="commit", timeout=30000)
+                    feeds.append(_GroupFeed(group_url, page))
+                except Exception as e:
+                    logger.exception(f"Facebook failed for {group_url}")
+                    errors.append(e)
+
+            # Round-robin: one collect/scroll step per page, then one shared pause
+            for _ in range(FACEBOOK_MAX_SCROLLS):
+                active = [f for f in feeds if not f.done]
+                if not active:
+                    break
+                active[0].page.wait_for_timeout(FACEBOOK_SCROLL_PAUSE_MS)
+                for feed in active:
                     try:
-                        page = context.new_page()
-                        page.goto(group_url, wait_until="domcontentloaded", timeout=30000)
-                        page.wait_for_timeout(3000)  # Allow JS to render
-                        html = page.content()
-                        page.close()
-                        all_listings.extend(self.parse_html(html))
-                    except Exception:
-                        logger.exception(f"Facebook failed for {group_url}")
-                        continue
-
-                browser.close()
-        except Exception:
-            logger.exception("Facebook scraper failed")
-
-        return all_listings
+                        feed.step(is_known, is_read)
+                    except Exception as e:
+                        logger.exception(f"Facebook failed for {feed.url}")
+                        errors.append(e)
+                        feed.done = True
+                        feed.posts = []
+
+        self._save_read_posts()
+        if errors and len(errors) == len(groups):
+            raise errors[-1]
+        for feed in feeds:
+            logger.info(f"Facebook {feed.url}: {len(feed.posts)} new post(s)")
+        return [json.dumps(feed.posts) for feed in feeds if feed.posts]
+
+    def _read_posts(self, today: date) -> dict[str, str]:
+        """Ids of posts read in the last FACEBOOK_POSTS_DAYS, by earlier runs too."""
+        if self._read is None:
+            path = Path(FACEBOOK_POSTS_PATH)
+            try:
+                self._read = json.loads(path.read_text()) if path.exists() else {}
+            except (OSError, json.JSONDecodeError):
+                logger.warning(f"Could not read {path}; starting without read posts")
+                self._read = {}
+        oldest = (today - timedelta(days=FACEBOOK_POSTS_DAYS)).isoformat()
+        self._read = {post_id: day for post_id, day in self._read.items() if day >= oldest}
+        return self._read
+
+    def _save_read_posts(self) -> None:
+        path = Path(FACEBOOK_POSTS_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self._read))
+
+    def parse(self, body: str) -> list[CastingListing]:
+        return self._posts_to_listings(json.loads(body))
 
     def parse_html(self, html: str) -> list[CastingListing]:
-        """Parse Facebook group posts. Very fragile — FB changes DOM constantly."""
+        """Parse a saved group page. Very fragile — FB changes DOM constantly."""
         soup = BeautifulSoup(html, "html.parser")
-        listings: list[CastingListing] = []
+        posts: list[dict] = []
 
         # Facebook's DOM is heavily obfuscated. These selectors are best-effort.
-        posts = soup.select("[data-ad-preview], [role='article']")
+        for post in soup.select("[data-ad-preview], [role='article']"):
+            link = post.find("a", href=True)
+            posts.append({"text": post.get_text(" ", strip=True), "url": link["href"] if link else ""})
+        return self._posts_to_listings(posts)
+
+    def _posts_to_listings(self, posts: list[dict]) -> list[CastingListing]:
+        rows: list[tuple[str, str, date, str]] = []
         for post in posts:
             try:
-                text = post.get_text(" ", strip=True)
+                text, url = _normalize(post)
                 if not text or len(text) < 20:
                     continue
 
-                # Only include posts that seem casting-related
-                casting_keywords = ["casting", "audition", "seeking", "looking for actors",
-                                    "open call", "background", "extras", "role"]
-                if not any(kw in text.lower() for kw in casting_keywords):
+                lowered = text.lower()
+                if not any(kw in lowered for kw in CASTING_KEYWORDS):
                     continue
 
-                link = post.find("a", href=True)
-                url = link["href"] if link else ""
-                if url and not url.startswith("http"):
-                    url = f"https://www.facebook.com{url}"
-
-                title = text[:100].strip()
-
-                listings.append(CastingListing(
-                    title=title,
-                    source="facebook",
-                    url=url or "https://www.facebook.com",
-                    posted_date=date.today(),
-                    location="",  # Facebook posts rarely have structured location
-                    union_status="",
-                    role_type="other",
-                    description=text[:500],
-                    how_to_apply=f"See Facebook post: {url}" if url else "Check Facebook group",
-                ))
+                posted = date.fromisoformat(post["posted"]) if post.get("posted") else parse_today()
+                rows.append((text, url, posted, post.get("group", "")))
             except Exception:
                 logger.exception("Failed to parse Facebook post")
                 continue
 
+        # Facebook posts have no structured fields; everything comes from the
+        # text. A post naming no place gets its group's market city, so it is
+        # still routed to that market (a post's link is seldom under the
+        # group's own URL, which markets.LocationRouter would route by).
+        group_cities = {group: market.city for market in active_markets() for group in market.facebook_groups}
+        listings: list[CastingListing] = []
+        for (text, url, posted, group), extracted in zip(rows, extract_all(r[0] for r in rows)):
+            listings.append(CastingListing(
+                title=text[:100].strip(),
+                source="facebook",
+                url=url or "https://www.facebook.com",
+                posted_date=posted,
+                location=extracted.location or group_cities.get(group, ""),
+                union_status=extracted.union_status,
+                role_type=extracted.role_type,
+                description=text[:500],
+                how_to_apply=f"See Facebook post: {url}" if url else "Check Facebook group",
+                compensation=extracted.compensation,
+                deadline=extracted.deadline,
+                school_or_production=extracted.school,
+            ))
         return listings
@@ -0,0 +1,153 @@
+# scrapers/parse_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+
+from config import MARKETS, PARSE_CACHE_PATH, PARSE_CACHE_MAX_MB
+from scrapers.parse_pool import FIELDS, Page, PageStats
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parse_cache (
+    key TEXT PRIMARY KEY,
+    rows BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_parse_cache_last_used ON parse_cache (last_used);
+"""
+
+_DATE_FIELDS = tuple(i for i, name in enumerate(FIELDS) if name in ("posted_date", "deadline"))
+
+
+@lru_cache(maxsize=1)
+def _inputs() -> str:
+    """Identifies what parsers derive fields from besides the page: the
+    extract tables (and gazetteer) and the markets (e.g. Craigslist's site
+    cities)."""
+    from scrapers.extract import fingerprint
+
+    markets = hashlib.sha256(json.dumps(MARKETS, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    return f"{fingerprint()}:{markets}"
+
+
+def parse_key(source: str, parser_version: int, body: str) -> str:
+    """Cache key for one page body.
+
+    Cached pages hold deferred dates (see scrapers.dates), resolved when they
+    are read, so a result is reused on any later day the body is unchanged.
+    Editing the gazetteer, the extract tables or MARKETS changes every key.
+    """
+    digest = hashlib.sha256(f"{source}:{parser_version}:{_inputs()}\0".encode())
+    digest.update(body.encode())
+    return digest.hexdigest()
+
+
+def _encode(page: Page) -> bytes:
+    plain = [
+        [v.isoformat() if i in _DATE_FIELDS and v is not None else v for i, v in enumerate(row)]
+        for row in page.rows
+    ]
+    data = {"rows": plain, "stats": list(page.stats)}
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+
+
+def _decode(blob: bytes) -> Page:
+    data = json.loads(zlib.decompress(blob))
+    if isinstance(data, list):  # written before pages kept their stats
+        data = {"rows": data, "stats": [len(data), {}]}
+    rows = [
+        tuple(date.fromisoformat(v) if i in _DATE_FIELDS and v is not None else v
+              for i, v in enumerate(row))
+        for row in data["rows"]
+    ]
+    return Page(rows, PageStats(*data["stats"]))
+
+
+class ParseCache:
+    """SQLite map of page-body hash -> parsed Page, LRU-evicted by size.
+
+    Checked before a scraper's parser runs, so a byte-identical page (an
+    unchanged Craigslist search, say) costs a hash and a lookup instead of a
+    BeautifulSoup parse. Rows and stats are stored as zlib-compressed JSON.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int):
+        self._path = db_path
+        self._max_bytes = max_bytes
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self._path != ":memory:":
+                Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self._path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def get_many(self, keys: list[str]) -> dict[str, Page]:
+        """Cached pages for whichever keys are present; marks them recently used."""
+        if not keys:
+            return {}
+        db = self._db()
+        placeholders = ", ".join("?" for _ in keys)
+        found = db.execute(
+            f"SELECT key, rows FROM parse_cache WHERE key IN ({placeholders})", keys
+        ).fetchall()
+        if found:
+            with db:
+                db.executemany(
+                    "UPDATE parse_cache SET last_used = ? WHERE key = ?",
+                    [(time.time(), key) for key, _ in found],
+                )
+        return {key: _decode(blob) for key, blob in found}
+
+    def put_many(self, pages: dict[str, Page]) -> None:
+        if not pages:
+            return
+        db = self._db()
+        now = time.time()
+        records = []
+        for key, page in pages.items():
+            blob = _encode(page)
+            records.append((key, blob, len(blob), now))
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO parse_cache (key, rows, size, last_used) VALUES (?, ?, ?, ?)",
+                records,
+            )
+            self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Drop least recently used entries until the total fits max_bytes."""
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM parse_cache").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        excess = total - self._max_bytes
+        freed = 0
+        stale = []
+        for key, size in db.execute("SELECT key, size FROM parse_cache ORDER BY last_used"):
+            stale.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        db.executemany("DELETE FROM parse_cache WHERE key = ?", stale)
+        logger.info(f"Parse cache: evicted {len(stale)} entries ({freed} bytes)")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+parse_cache = ParseCache(PARSE_CACHE_PATH, PARSE_CACHE_MAX_MB * 1024 * 1024)
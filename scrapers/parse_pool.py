@@ -0,0 +1,136 @@
+# scrapers/parse_pool.py
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import fields
+from typing import Callable, Iterable, NamedTuple
+
+from config import PARSE_POOL_MIN_BYTES, PARSE_WORKERS
+from models import CastingListing
+from scrapers.dates import deferred_dates
+
+logger = logging.getLogger(__name__)
+
+Parser = Callable[[str], list[CastingListing]]
+
+FIELDS = tuple(f.name for f in fields(CastingListing))
+
+
+class PageStats(NamedTuple):
+    """What a parser's selectors matched on one page.
+
+    A site that changes its DOM parses to nothing, which looks like a quiet
+    day; these numbers, against the source's usual ones, tell them apart
+    (see breakage.py).
+    """
+
+    candidates: int  # cards, rows or API objects the parser's selector matched
+    missing: dict[str, int]  # field -> candidates without it (fields never missing are left out)
+
+
+def total_stats(stats: Iterable[PageStats]) -> PageStats:
+    """Sum several pages' stats into one for the whole source."""
+    candidates, missing = 0, Counter()
+    for s in stats:
+        candidates += s.candidates
+        missing.update(s.missing)
+    return PageStats(candidates, dict(missing))
+
+
+StatsParser = Callable[[str], tuple[list[CastingListing], PageStats]]
+
+
+class Page(NamedTuple):
+    """One parsed page body: its rows (see to_row) and PageStats."""
+
+    rows: list[tuple]
+    stats: PageStats
+
+
+def to_row(listing: CastingListing) -> tuple:
+    """Listing as a plain tuple in field order; cheaper to pickle than the dataclass."""
+    return tuple(getattr(listing, name) for name in FIELDS)
+
+
+def from_row(row: tuple) -> CastingListing:
+    return CastingListing(*row)
+
+
+def _parse_rows(parse: Parser, body: str) -> list[tuple]:
+    """Worker entry point: parse one page body into compact rows."""
+    return [to_row(l) for l in parse(body)]
+
+
+def _parse_page(parse: StatsParser, body: str) -> Page:
+    """Worker entry point: parse one page body into rows and its PageStats,
+    with day-dependent dates deferred (see scrapers.dates)."""
+    with deferred_dates():
+        listings, stats = parse(body)
+    return Page([to_row(l) for l in listings], stats)
+
+
+class ParsePool:
+    """Process pool for the CPU-bound HTML/JSON parsing of scraped pages.
+
+    BeautifulSoup parsing holds the GIL, so pages are shipped as raw bodies to
+    worker processes and come back as compact tuples. Workers start on first
+    use and are kept until close(), so a daemon reuses them across polls. A
+    single page is parsed inline, as is less than `min_bytes` of page text
+    while no workers are running: starting them would cost more than the
+    parse.
+    """
+
+    def __init__(self, workers: int, min_bytes: int = PARSE_POOL_MIN_BYTES):
+        self._workers = workers
+        self._min_bytes = min_bytes
+        self._executor: Executor | None = None
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            # forkserver: forking a process that may be running browser or
+            # HTTP threads is unsafe, and spawn would re-import per worker.
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            logger.info(f"Starting {self._workers} parse workers")
+            self._executor = ProcessPoolExecutor(max_workers=self._workers, mp_context=context)
+        return self._executor
+
+    def parse(self, parse: Parser, bodies: list[str]) -> list[CastingListing]:
+        """Run `parse` over every body; listings come back in page order."""
+        return [from_row(row) for rows in self.parse_rows(parse, bodies) for row in rows]
+
+    def parse_rows(self, parse: Parser, bodies: list[str]) -> list[list[tuple]]:
+        """Run `parse` over every body; returns each page's rows (see to_row).
+
+        `parse` must be picklable (a module-level function, or a method of a
+        stateless scraper).
+        """
+        return self._map(_parse_rows, parse, bodies)
+
+    def parse_pages(self, parse: StatsParser, bodies: list[str]) -> list[Page]:
+        """Like parse_rows, for a parser that also returns its PageStats. The
+        rows hold deferred dates, so they can be cached; see resolve_dates."""
+        return self._map(_parse_page, parse, bodies)
+
+    def _map(self, entry: Callable, parse: Callable, bodies: list[str]) -> list:
+        small = self._executor is None and sum(map(len, bodies)) < self._min_bytes
+        if self._workers <= 1 or len(bodies) < 2 or small:
+            return [entry(parse, body) for body in bodies]
+        try:
+            return list(self._pool().map(entry, [parse] * len(bodies), bodies))
+        except BrokenProcessPool:
+            logger.exception("Parse worker died; parsing inline")
+            self.close()
+            return [entry(parse, body) for body in bodies]
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+parse_pool = ParsePool(PARSE_WORKERS)
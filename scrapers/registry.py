@@ -0,0 +1,139 @@
+# scrapers/registry.py
+from __future__ import annotations
+
+import importlib
+import logging
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable
+
+from config import (
+    ACTORS_ACCESS_CONCURRENCY, DEFAULT_POLL_INTERVAL_MINUTES, POLL_INTERVAL_MINUTES,
+    SCRAPERS_ENABLED,
+)
+
+if TYPE_CHECKING:
+    from scrapers.base import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+# Installed packages can add sources by exposing a ScraperSpec under this group:
+#   [project.entry-points."casting_scout.scrapers"]
+#   mysite = "mypackage.scout:SPEC"
+ENTRY_POINT_GROUP = "casting_scout.scrapers"
+
+
+class Cost(IntEnum):
+    """Rough price of one scrape, for ordering a poll round."""
+
+    LOW = 1     # a few HTTP requests
+    MEDIUM = 2  # one rendered browser page
+    HIGH = 3    # login, many pages, or scrolling
+
+
+@dataclass(frozen=True)
+class ScraperSpec:
+    """What the orchestration needs to know about a source, without importing it."""
+
+    name: str  # the scraper's source_name
+    target: str  # "module:Class", imported only when the source is enabled
+    needs_browser: bool = False
+    needs_auth: bool = False
+    poll_minutes: int = DEFAULT_POLL_INTERVAL_MINUTES
+    cost: Cost = Cost.LOW
+    # Pages or requests the scraper may have in flight at once
+    concurrency: int = 1
+    # Whether it runs when SCRAPERS_ENABLED doesn't mention it
+    enabled: bool = True
+    # Its constructor takes is_seen, a dedup-key lookup, to stop early
+    incremental: bool = False
+
+    @property
+    def is_enabled(self) -> bool:
+        return SCRAPERS_ENABLED.get(self.name, self.enabled)
+
+    @property
+    def interval_seconds(self) -> float:
+        return 60 * POLL_INTERVAL_MINUTES.get(self.name, self.poll_minutes)
+
+    def load(self) -> type[BaseScraper]:
+        module, _, attr = self.target.partition(":")
+        return getattr(importlib.import_module(module), attr)
+
+    def create(self, is_seen: Callable[[str], bool] | None = None) -> BaseScraper:
+        cls = self.load()
+        scraper = cls(is_seen=is_seen) if self.incremental else cls()
+        scraper.concurrency = self.concurrency
+        return scraper
+
+
+BUILTIN_SPECS: tuple[ScraperSpec, ...] = (
+    ScraperSpec("craigslist", "scrapers.craigslist:CraigslistScraper", poll_minutes=5),
+    ScraperSpec("reddit", "scrapers.reddit:RedditScraper", poll_minutes=15),
+    ScraperSpec(
+        "backstage", "scrapers.backstage:BackstageScraper",
+        needs_browser=True, poll_minutes=60, cost=Cost.MEDIUM,
+    ),
+    ScraperSpec(
+        "casting_networks", "scrapers.casting_networks:CastingNetworksScraper",
+        needs_browser=True, poll_minutes=60, cost=Cost.MEDIUM,
+    ),
+    ScraperSpec(
+        "actors_access", "scrapers.actors_access:ActorsAccessScraper",
+        needs_browser=True, needs_auth=True, poll_minutes=120, cost=Cost.HIGH,
+        concurrency=ACTORS_ACCESS_CONCURRENCY,
+    ),
+    ScraperSpec(
+        "facebook", "scrapers.facebook:FacebookScraper",
+        needs_browser=True, needs_auth=True, poll_minutes=30, cost=Cost.HIGH, incremental=True,
+    ),
+)
+
+
+@lru_cache(maxsize=1)
+def all_specs() -> dict[str, ScraperSpec]:
+    """Built-in sources plus any installed through the entry-point group, by name.
+
+    The entry-point scan is slow, so it runs on the first call, from the
+    commands that run or list sources, not on import.
+    """
+    from importlib.metadata import entry_points
+
+    specs = {spec.name: spec for spec in BUILTIN_SPECS}
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            spec = ep.load()
+        except Exception:
+            logger.exception(f"Failed to load scraper plugin {ep.name}")
+            continue
+        if not isinstance(spec, ScraperSpec):
+            logger.warning(f"Scraper plugin {ep.name} is not a ScraperSpec; ignoring")
+        elif spec.name in specs:
+            logger.warning(f"Scraper plugin {ep.name} reuses source name {spec.name}; ignoring")
+        else:
+            specs[spec.name] = spec
+    return specs
+
+
+def enabled_specs() -> list[ScraperSpec]:
+    """Specs of the sources to run, in run order."""
+    return sorted((s for s in all_specs().values() if s.is_enabled), key=_order_key)
+
+
+def _order_key(spec: ScraperSpec | None) -> tuple[int, int]:
+    # Browser sources first, as one group, so the shared browser is busy for one
+    # stretch; within each group the most expensive first, so slow sources
+    # don't start last and hold up the round.
+    if spec is None:
+        return (1, -Cost.LOW)
+    return (0 if spec.needs_browser else 1, -spec.cost)
+
+
+def run_order(scrapers: list[BaseScraper]) -> list[BaseScraper]:
+    """`scrapers` in the order a poll round should run them.
+
+    Sources without a spec sort as cheap HTTP sources; ties keep their order.
+    """
+    specs = all_specs()
+    return sorted(scrapers, key=lambda s: _order_key(specs.get(s.source_name)))
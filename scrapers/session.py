@@ -0,0 +1,145 @@
+# scrapers/session.py
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable
+from urllib.parse import urlsplit
+
+import requests
+
+from config import (
+    RATE_LIMITS, DEFAULT_RATE_LIMIT, RATE_LIMIT_BURST,
+    HTTP_MAX_RETRIES, BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS, MAX_RETRY_AFTER_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying; anything else (notably 403) fails immediately.
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+_session: requests.Session | None = None
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Token-bucket rate limiter. acquire() blocks until a token is available."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if the bucket is empty. Returns seconds waited."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            # Reserve the token now (tokens may go negative) so concurrent
+            # callers queue up behind each other instead of all waking at once.
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide HTTP session, creating it on first use.
+
+    Reusing one session keeps TCP/TLS connections to each host warm between
+    requests, which matters most in daemon mode where sources are polled often.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def close_session() -> None:
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+
+def _bucket_for(host: str) -> TokenBucket:
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT), RATE_LIMIT_BURST)
+        return _buckets[host]
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given 0-based retry attempt."""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def retry_after_seconds(resp: requests.Response) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP date), if present."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def fetch(url: str, sleep: Callable[[float], None] = time.sleep, **kwargs) -> requests.Response:
+    """GET `url` through the shared session, rate limited per host.
+
+    Retries connection errors and 429/5xx responses with exponential backoff
+    and jitter, honoring Retry-After. Raises once retries are exhausted, on a
+    non-retryable status, or when the server asks us to wait too long.
+    """
+    kwargs.setdefault("timeout", 30)
+    bucket = _bucket_for(urlsplit(url).netloc)
+
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        bucket.acquire()
+        try:
+            resp = get_session().get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == HTTP_MAX_RETRIES:
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"Connection error for {url}, retrying in {delay:.1f}s")
+            sleep(delay)
+            continue
+
+        if resp.status_code not in RETRYABLE_STATUSES or attempt == HTTP_MAX_RETRIES:
+            resp.raise_for_status()
+            return resp
+
+        delay = retry_after_seconds(resp)
+        if delay is None:
+            delay = backoff_delay(attempt)
+        elif delay > MAX_RETRY_AFTER_SECONDS:
+            logger.warning(f"{url} asked us to wait {delay:.0f}s; giving up for now")
+            resp.raise_for_status()
+        logger.warning(f"HTTP {resp.status_code} from {url}, retrying in {delay:.1f}s")
+        sleep(delay)
+
+    raise AssertionError("unreachable")
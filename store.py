@@ -0,0 +1,354 @@
+# store.py
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+from datetime import date
+from pathlib import Path
+
+from gazetteer import default_gazetteer
+from models import CastingListing, CareerCategory
+from rules import default_engine
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    key TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    posted_date TEXT NOT NULL,
+    location TEXT NOT NULL,
+    city TEXT NOT NULL COLLATE NOCASE,
+    union_status TEXT NOT NULL,
+    role_type TEXT NOT NULL,
+    description TEXT NOT NULL,
+    how_to_apply TEXT NOT NULL,
+    deadline TEXT,
+    compensation TEXT,
+    school_or_production TEXT,
+    category INTEGER NOT NULL,
+    first_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_listings_source ON listings (source, posted_date);
+CREATE INDEX IF NOT EXISTS idx_listings_posted ON listings (posted_date);
+CREATE INDEX IF NOT EXISTS idx_listings_category ON listings (category, posted_date);
+CREATE INDEX IF NOT EXISTS idx_listings_city ON listings (city, posted_date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# External-content FTS5 index over the text columns, kept in sync by triggers
+# so it is built incrementally as listings arrive. It references listings by
+# rowid, so never VACUUM the database (that can renumber rowids of tables
+# without an INTEGER PRIMARY KEY); 'rebuild' the index if you ever must.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS listings_fts USING fts5(
+    title, description, school_or_production, location,
+    content='listings', content_rowid='rowid',
+    tokenize='porter unicode61', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS listings_fts_ai AFTER INSERT ON listings BEGIN
+    INSERT INTO listings_fts (rowid, title, description, school_or_production, location)
+    VALUES (new.rowid, new.title, new.description, new.school_or_production, new.location);
+END;
+CREATE TRIGGER IF NOT EXISTS listings_fts_ad AFTER DELETE ON listings BEGIN
+    INSERT INTO listings_fts (listings_fts, rowid, title, description, school_or_production, location)
+    VALUES ('delete', old.rowid, old.title, old.description, old.school_or_production, old.location);
+END;
+CREATE TRIGGER IF NOT EXISTS listings_fts_au AFTER UPDATE ON listings BEGIN
+    INSERT INTO listings_fts (listings_fts, rowid, title, description, school_or_production, location)
+    VALUES ('delete', old.rowid, old.title, old.description, old.school_or_production, old.location);
+    INSERT INTO listings_fts (rowid, title, description, school_or_production, location)
+    VALUES (new.rowid, new.title, new.description, new.school_or_production, new.location);
+END;
+"""
+
+# Listings first seen per day, category and source, kept up to date by a
+# trigger so dashboard totals are a primary-key range read, never a scan of
+# listings.
+_DAILY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_counts (
+    day TEXT NOT NULL,
+    category INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (day, category, source)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS daily_counts_ai AFTER INSERT ON listings BEGIN
+    INSERT INTO daily_counts (day, category, source, n)
+    VALUES (new.first_seen, new.category, new.source, 1)
+    ON CONFLICT (day, category, source) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS daily_counts_ad AFTER DELETE ON listings BEGIN
+    UPDATE daily_counts SET n = n - 1
+    WHERE day = old.first_seen AND category = old.category AND source = old.source;
+END;
+"""
+
+# bm25() column weights: title matches count most, then school/production.
+# Stored as the index's default rank so "ORDER BY rank" is sorted inside FTS5.
+_RANK_FUNCTION = "bm25(10.0, 1.0, 5.0, 2.0)"
+
+_TERM_RE = re.compile(r"[\w']+\*?")
+
+_COLUMNS = (
+    "key", "title", "source", "url", "posted_date", "location", "city", "union_status",
+    "role_type", "description", "how_to_apply", "deadline", "compensation",
+    "school_or_production", "category", "first_seen",
+)
+
+
+def _city(location: str) -> str:
+    """'Burbank, CA' -> 'burbank', 'Studio City, LA' -> 'studio city', by the
+    gazetteer, else the text before the first comma. Indexed so location
+    queries avoid a full scan."""
+    place = default_gazetteer().lookup(location)
+    name = place.name if place else location
+    return name.split(",")[0].strip().lower()
+
+
+def _derived_version() -> str:
+    """Identifies how the category and city columns are computed from a listing."""
+    return f"{default_engine().fingerprint}:{default_gazetteer().fingerprint}"
+
+
+def _match_expression(terms: str) -> str:
+    """Turn free text into a safe FTS5 query: every term must match, and a
+    trailing '*' makes a term a prefix query ("improv*" -> improvisation)."""
+    tokens = []
+    for term in _TERM_RE.findall(terms):
+        word = term.rstrip("*").replace('"', "")
+        if word:
+            tokens.append(f'"{word}"*' if term.endswith("*") else f'"{word}"')
+    return " ".join(tokens)
+
+
+class ListingStore:
+    """Local SQLite warehouse of every scraped listing, indexed for ad-hoc queries."""
+
+    def __init__(self, db_path: str, read_only: bool = False):
+        """Open (creating or migrating) the archive at `db_path`.
+
+        With `read_only` an existing archive is opened as it is: nothing is
+        created, and stale derived columns are left for the next writer.
+        """
+        path = Path(db_path)
+        if read_only:
+            self._conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+            self._conn.row_factory = sqlite3.Row
+            return
+        if db_path != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._init_fts()
+        self._init_daily()
+        self._init_derived()
+
+    def _init_fts(self) -> None:
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'listings_fts'"
+        ).fetchone()
+        self._conn.executescript(_FTS_SCHEMA)
+        if exists:
+            return
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO listings_fts (listings_fts, rank) VALUES ('rank', ?)", (_RANK_FUNCTION,)
+            )
+            if self.count():
+                logger.info("Building full-text index over archived listings...")
+                self._conn.execute("INSERT INTO listings_fts (listings_fts) VALUES ('rebuild')")
+
+    def _init_daily(self) -> None:
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'daily_counts'"
+        ).fetchone()
+        self._conn.executescript(_DAILY_SCHEMA)
+        if exists:
+            return
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO daily_counts (day, category, source, n) "
+                "SELECT first_seen, category, source, COUNT(*) FROM listings "
+                "GROUP BY first_seen, category, source"
+            )
+
+    def _init_derived(self) -> None:
+        """Recompute stored categories and cities if the category rules (e.g.
+        CATEGORY_RULES_FILE) or the gazetteer changed since they were stored."""
+        version = _derived_version()
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'derived'").fetchone()
+        if row and row[0] == version:
+            return
+        with self._conn:
+            if self.count():
+                self._recompute_derived()
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('derived', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (version,),
+            )
+
+    def _recompute_derived(self) -> None:
+        rows = self._conn.execute("SELECT rowid, * FROM listings").fetchall()
+        listings = [_row_to_listing(r) for r in rows]
+        changed = []
+        for row, listing, category in zip(rows, listings, default_engine().categorize_all(listings)):
+            city = _city(listing.location)
+            if category.value != row["category"] or city != row["city"]:
+                changed.append((category.value, city, row["rowid"]))
+        if not changed:
+            return
+        logger.info(f"Category rules or gazetteer changed; updating {len(changed)} archived listing(s)")
+        self._conn.executemany("UPDATE listings SET category = ?, city = ? WHERE rowid = ?", changed)
+        self._conn.execute("DELETE FROM daily_counts")
+        self._conn.execute(
+            "INSERT INTO daily_counts (day, category, source, n) "
+            "SELECT first_seen, category, source, COUNT(*) FROM listings "
+            "GROUP BY first_seen, category, source"
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def add_many(self, listings: list[CastingListing], seen_on: date | None = None) -> int:
+        """Bulk-insert listings in one transaction; already-stored keys are skipped.
+
+        Returns the number of newly stored listings.
+        """
+        seen = (seen_on or date.today()).isoformat()
+        rows = [
+            (
+                l.dedup_key(), l.title, l.source, l.url, l.posted_date.isoformat(),
+                l.location, _city(l.location), l.union_status, l.role_type,
+                l.description, l.how_to_apply,
+                l.deadline.isoformat() if l.deadline else None,
+                l.compensation, l.school_or_production, category.value, seen,
+            )
+            for l, category in zip(listings, default_engine().categorize_all(listings))
+        ]
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._conn:
+            cur = self._conn.executemany(
+                f"INSERT OR IGNORE INTO listings ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                rows,
+            )
+            return cur.rowcount
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def query(
+        self,
+        category: CareerCategory | None = None,
+        source: str | None = None,
+        location: str | None = None,
+        since: date | None = None,
+        text: str | None = None,
+        limit: int = 100,
+        until: date | None = None,
+        offset: int = 0,
+    ) -> list[CastingListing]:
+        """Return stored listings matching every given filter, newest first.
+
+        `location` matches the start of the city (e.g. "burbank", "north holly");
+        `text` is a case-insensitive substring of the title or description;
+        `since` and `until` bound the posted date, inclusive.
+        """
+        clauses: list[str] = []
+        params: list[object] = []
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(int(category))
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if location:
+            clauses.append("city LIKE ?")
+            params.append(f"{_city(location)}%")
+        if since:
+            clauses.append("posted_date >= ?")
+            params.append(since.isoformat())
+        if until:
+            clauses.append("posted_date <= ?")
+            params.append(until.isoformat())
+        if text:
+            clauses.append("(title LIKE ? OR description LIKE ?)")
+            params.extend([f"%{text}%"] * 2)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn.execute(
+            f"SELECT * FROM listings {where} ORDER BY posted_date DESC, rowid DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        ).fetchall()
+        return [_row_to_listing(r) for r in rows]
+
+    def daily_counts(self, since: date | None = None) -> list[tuple[date, CareerCategory, str, int]]:
+        """(day first seen, category, source, listings) from `since` on, oldest first."""
+        rows = self._conn.execute(
+            "SELECT day, category, source, n FROM daily_counts WHERE day >= ? AND n > 0 ORDER BY day",
+            ((since or date.min).isoformat(),),
+        ).fetchall()
+        return [(date.fromisoformat(day), CareerCategory(cat), source, n) for day, cat, source, n in rows]
+
+    def search(
+        self,
+        terms: str,
+        category: CareerCategory | None = None,
+        source: str | None = None,
+        since: date | None = None,
+        limit: int = 20,
+    ) -> list[tuple[CastingListing, float]]:
+        """Full-text search, best match first. Returns (listing, bm25 score) pairs.
+
+        All terms must match (stemmed, case-insensitive); end a term with '*'
+        for a prefix query. Lower scores are better, as in SQLite's bm25().
+        """
+        expression = _match_expression(terms)
+        if not expression:
+            return []
+
+        clauses = ["listings_fts MATCH ?"]
+        params: list[object] = [expression]
+        if category is not None:
+            clauses.append("l.category = ?")
+            params.append(int(category))
+        if source:
+            clauses.append("l.source = ?")
+            params.append(source)
+        if since:
+            clauses.append("l.posted_date >= ?")
+            params.append(since.isoformat())
+
+        rows = self._conn.execute(
+            f"SELECT l.*, listings_fts.rank AS score "
+            f"FROM listings_fts JOIN listings l ON l.rowid = listings_fts.rowid "
+            f"WHERE {' AND '.join(clauses)} ORDER BY listings_fts.rank LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [(_row_to_listing(r), r["score"]) for r in rows]
+
+
+def _row_to_listing(row: sqlite3.Row) -> CastingListing:
+    return CastingListing(
+        title=row["title"],
+        source=row["source"],
+        url=row["url"],
+        posted_date=date.fromisoformat(row["posted_date"]),
+        location=row["location"],
+        union_status=row["union_status"],
+        role_type=row["role_type"],
+        description=row["description"],
+        how_to_apply=row["how_to_apply"],
+        deadline=date.fromisoformat(row["deadline"]) if row["deadline"] else None,
+        compensation=row["compensation"],
+        school_or_production=row["school_or_production"],
+    )
@@ -0,0 +1,18 @@
+import pytest
+
+from mailer.sender import get_client
+from tests.mailer.fake_sendgrid import FakeSendGrid
+
+
+@pytest.fixture(autouse=True)
+def fresh_client_cache():
+    get_client.cache_clear()
+    yield
+    get_client.cache_clear()
+
+
+@pytest.fixture
+def fake_sendgrid():
+    server = FakeSendGrid().start()
+    yield server
+    server.stop()
@@ -0,0 +1,55 @@
+"""A local stand-in for the SendGrid v3 mail/send endpoint."""
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeSendGrid:
+    """Records every POST /v3/mail/send body. Set `fail_next` to make the
+    next N requests fail with `fail_status`."""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.fail_next = 0
+        self.fail_status = 503
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True,
+        )
+
+    @property
+    def host(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> FakeSendGrid:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with fake._lock:
+                    if fake.fail_next > 0:
+                        fake.fail_next -= 1
+                        status = fake.fail_status
+                    else:
+                        fake.requests.append(json.loads(body))
+                        status = 202 if self.path == "/v3/mail/send" else 404
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -1,7 +1,7 @@
 # tests/mailer/test_formatter.py
 from datetime import date
 
-from mailer.formatter import format_digest
+from mailer.formatter import format_digest, render_digest
 from models import CastingListing, CareerCategory
 
 
@@ -62,3 +62,65 @@ def test_format_digest_flags_school():
     listings = [_make_listing(title="USC Film", school_or_production="USC")]
     _, html = format_digest(listings)
     assert "USC" in html
+
+
+def test_format_digest_shows_top_k_per_category(monkeypatch):
+    monkeypatch.setattr("mailer.formatter.DIGEST_TOP_K", 2)
+    listings = [
+        _make_listing(title="Unpaid Lead", compensation="Unpaid", url="https://backstage.com/1"),
+        _make_listing(title="Paid Lead", compensation="$400/day", url="https://backstage.com/2"),
+        _make_listing(title="Another Lead", url="https://backstage.com/3"),
+    ]
+    subject, html = format_digest(listings)
+    assert "3 New Opportunities" in subject
+    assert html.index("Paid Lead") < html.index("Another Lead")
+    assert "Unpaid Lead" not in html
+    assert "+ 1 more" in html
+
+
+def test_render_digest_text_part_matches_html():
+    listings = [
+        _make_listing(title="Lead Role", compensation="$200/day"),
+        _make_listing(title="BG Extra", role_type="background", url="https://backstage.com/2"),
+    ]
+    digest = render_digest(listings, ["reddit"])
+    assert "<" not in digest.text
+    assert "1. Lead Role" in digest.text and "$200/day" in digest.text
+    assert "2. BG Extra" in digest.text and "https://backstage.com/2" in digest.text
+    assert digest.text.index("PRINCIPAL / SPEAKING ROLES") < digest.text.index("BACKGROUND / EXTRA WORK")
+    assert "Unavailable today: reddit" in digest.text
+
+
+def test_compact_digest_uses_shared_classes():
+    listings = [_make_listing(title=f"Role {i}", url=f"https://backstage.com/{i}") for i in range(10)]
+    full = render_digest(listings, compact=False)
+    compact = render_digest(listings, compact=True)
+    assert "<style>" in compact.html and 'class="card"' in compact.html
+    assert 'style="' not in compact.html
+    assert len(compact.html) < len(full.html)
+    assert compact.text == full.text
+
+
+def test_digest_is_trimmed_to_size_budget():
+    listings = [
+        _make_listing(title=f"Lead {i}", url=f"https://backstage.com/{i}", description="x" * 200)
+        for i in range(10)
+    ] + [
+        _make_listing(title=f"Extra {i}", role_type="background", url=f"https://backstage.com/bg{i}")
+        for i in range(10)
+    ]
+    digest = render_digest(listings, max_bytes=4000)
+    assert len(digest.html.encode()) <= 4000
+    assert "Lead 0" in digest.html and "Extra 0" in digest.html  # every category keeps its best
+    assert "Lead 9" not in digest.html and "Lead 9" not in digest.text
+    assert "more principal / speaking roles not shown" in digest.html
+    # Left out for size, so not among the listings to mark seen
+    shown = {l.title for l in digest.shown}
+    assert "Lead 0" in shown and "Lead 9" not in shown
+    assert all(l.title in digest.text for l in digest.shown)
+
+
+def test_digest_budget_always_shows_each_category_best():
+    listings = [_make_listing(title="Lead"), _make_listing(title="Extra", role_type="background")]
+    digest = render_digest(listings, max_bytes=0)
+    assert "Lead" in digest.html and "Extra" in digest.html
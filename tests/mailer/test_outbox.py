@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from mailer.outbox import Outbox, DEAD, PENDING, SENT
+from mailer.sender import send_batch
+
+NOW = datetime(2026, 3, 1, 7, 0)
+
+
+def _sender(ok=True, error=None):
+    """A drain() sender that reports every recipient in the group as `ok`."""
+    def send(group):
+        if error:
+            raise error
+        return {entry.to_email: ok for entry in group}
+    return MagicMock(side_effect=send)
+
+
+def _outbox(tmp_path, max_attempts=3) -> Outbox:
+    return Outbox(
+        str(tmp_path / "outbox.json"),
+        max_attempts=max_attempts,
+        backoff_base=timedelta(minutes=10),
+        backoff_max=timedelta(hours=6),
+    )
+
+
+def test_enqueue_is_idempotent(tmp_path):
+    outbox = _outbox(tmp_path)
+    a = outbox.enqueue("Digest", "<p>x</p>", "a@example.com", "s@example.com", now=NOW)
+    b = outbox.enqueue("Digest", "<p>x</p>", "a@example.com", "s@example.com", now=NOW)
+    assert a == b
+    assert len(outbox.entries) == 1
+
+
+def test_sent_digest_is_never_resent(tmp_path):
+    outbox = _outbox(tmp_path)
+    outbox.enqueue("Digest", "<p>x</p>", "a@example.com", "s@example.com", now=NOW)
+    send = _sender(ok=True)
+    assert outbox.drain(send, now=NOW) == (1, 0)
+
+    # Same digest queued again (e.g. a re-run) and drained again: no second send
+    reloaded = _outbox(tmp_path)
+    reloaded.enqueue("Digest", "<p>x</p>", "a@example.com", "s@example.com", now=NOW)
+    reloaded.drain(send, now=NOW + timedelta(days=1))
+    send.assert_called_once()
+
+
+def test_failure_backs_off_exponentially(tmp_path):
+    outbox = _outbox(tmp_path, max_attempts=10)
+    outbox.enqueue("Digest", "<p>x</p>", "a@example.com", "s@example.com", now=NOW)
+    send = _sender(ok=False)
+
+    outbox.drain(send, now=NOW)
+    [entry] = outbox.entries
+    first_retry = datetime.fromisoformat(entry.next_attempt)
+    assert NOW + timedelta(minutes=5) <= first_retry <= NOW + timedelta(minutes=10)
+
+    # Not due yet: nothing is attempted
+    outbox.drain(send, now=NOW + timedelta(minutes=1))
+    assert send.call_count == 1
+
+    outbox.drain(send, now=first_retry)
+    second_retry = datetime.fromisoformat(entry.next_attempt)
+    assert second_retry - first_retry >= timedelta(minutes=10)
+
+
+def test_gives_up_after_max_attempts(tmp_path):
+    outbox = _outbox(tmp_path, max_attempts=2)
+    outbox.enqueue("Digest", "<p>x</p>", "a@example.com", "s@example.com", now=NOW)
+    send = _sender(error=Exception("boom"))
+    outbox.drain(send, now=NOW)
+    assert outbox.entries[0].status == PENDING
+    outbox.drain(send, now=NOW + timedelta(days=1))
+    assert outbox.entries[0].status == DEAD
+
+
+def test_queue_survives_restart(tmp_path):
+    outbox = _outbox(tmp_path)
+    outbox.enqueue("Digest", "<p>x</p>", "a@example.com", "s@example.com", now=NOW)
+    outbox.drain(_sender(ok=False), now=NOW)
+    assert [e.status for e in _outbox(tmp_path).entries] == [PENDING]
+
+
+def test_drains_against_fake_sendgrid(tmp_path, fake_sendgrid):
+    fake_sendgrid.fail_next = 1
+    outbox = _outbox(tmp_path)
+    key = outbox.enqueue("Digest", "<p>x</p>", "a@example.com", "s@example.com", now=NOW)
+
+    def send(group):
+        first = group[0]
+        return send_batch(first.subject, first.html, "fake-key", {e.to_email: e.id for e in group},
+                          first.from_email, host=fake_sendgrid.host)
+
+    assert outbox.drain(send, now=NOW) == (0, 1)
+    assert outbox.drain(send, now=NOW + timedelta(hours=1)) == (1, 0)
+    assert outbox.entries[0].status == SENT
+    assert [r["personalizations"][0]["headers"]["X-Casting-Scout-Digest-Id"]
+            for r in fake_sendgrid.requests] == [key]
+
+
+def test_same_digest_to_many_recipients_sent_as_one_group(tmp_path):
+    outbox = _outbox(tmp_path)
+    for to in ("a@example.com", "b@example.com", "c@example.com"):
+        outbox.enqueue("Digest", "<p>x</p>", to, "s@example.com", now=NOW)
+    outbox.enqueue("Other", "<p>y</p>", "a@example.com", "s@example.com", now=NOW)
+    send = _sender(ok=True)
+    assert outbox.drain(send, now=NOW) == (4, 0)
+    group_sizes = sorted(len(call.args[0]) for call in send.call_args_list)
+    assert group_sizes == [1, 3]
+
+
+def test_text_part_survives_reload(tmp_path):
+    _outbox(tmp_path).enqueue("Digest", "<p>x</p>", "a@example.com", "s@example.com", text="x", now=NOW)
+    [entry] = _outbox(tmp_path).entries
+    assert entry.text == "x"
@@ -1,11 +1,13 @@
 # tests/mailer/test_sender.py
+import json
 from unittest.mock import patch, MagicMock
 
-from mailer.sender import send_email
+import mailer.sender
+from mailer.sender import send_batch, send_email
 
 
 def test_send_email_calls_sendgrid():
-    with patch("mailer.sender.SendGridAPIClient") as mock_sg:
+    with patch("sendgrid.SendGridAPIClient") as mock_sg:
         mock_client = MagicMock()
         mock_client.send.return_value = MagicMock(status_code=202)
         mock_sg.return_value = mock_client
@@ -22,8 +24,7 @@ def test_send_email_calls_sendgrid():
 
 
 def test_send_email_returns_false_on_failure():
-    with patch("mailer.sender.SendGridAPIClient") as mock_sg, \
-         patch("mailer.sender.time.sleep"):
+    with patch("sendgrid.SendGridAPIClient") as mock_sg:
         mock_client = MagicMock()
         mock_client.send.side_effect = Exception("API error")
         mock_sg.return_value = mock_client
@@ -36,3 +37,101 @@ def test_send_email_returns_false_on_failure():
             from_email="scout@example.com",
         )
         assert result is False
+
+
+def test_send_email_posts_to_sendgrid_api(fake_sendgrid):
+    result = send_email(
+        subject="Digest",
+        html_body="<h1>Hi</h1>",
+        api_key="fake-key",
+        to_email="actor@example.com",
+        from_email="scout@example.com",
+        host=fake_sendgrid.host,
+        digest_id="abc123",
+    )
+    assert result is True
+    [payload] = fake_sendgrid.requests
+    assert payload["subject"] == "Digest"
+    assert payload["personalizations"][0]["to"] == [{"email": "actor@example.com"}]
+    assert payload["personalizations"][0]["headers"] == {"X-Casting-Scout-Digest-Id": "abc123"}
+
+
+def test_send_email_does_not_sleep_or_retry(fake_sendgrid):
+    fake_sendgrid.fail_next = 1
+    result = send_email("s", "<p>b</p>", "fake-key", "a@example.com", host=fake_sendgrid.host)
+    assert result is False
+    assert fake_sendgrid.requests == []
+
+
+def test_send_batch_uses_one_request_with_personalizations(fake_sendgrid):
+    recipients = {"a@example.com": "id-a", "b@example.com": "id-b"}
+    results = send_batch("Digest", "<p>x</p>", "fake-key", recipients, host=fake_sendgrid.host)
+    assert results == {"a@example.com": True, "b@example.com": True}
+    [payload] = fake_sendgrid.requests
+    assert [p["to"][0]["email"] for p in payload["personalizations"]] == ["a@example.com", "b@example.com"]
+    assert [p["headers"]["X-Casting-Scout-Digest-Id"] for p in payload["personalizations"]] == ["id-a", "id-b"]
+
+
+def test_send_batch_splits_at_personalization_limit(fake_sendgrid):
+    recipients = {f"actor{i}@example.com": None for i in range(5)}
+    with patch.object(mailer.sender, "MAX_PERSONALIZATIONS", 2):
+        results = send_batch("Digest", "<p>x</p>", "fake-key", recipients, host=fake_sendgrid.host)
+    assert all(results.values())
+    assert [len(r["personalizations"]) for r in fake_sendgrid.requests] == [2, 2, 1]
+
+
+def test_send_batch_skips_malformed_address(fake_sendgrid):
+    results = send_batch("Digest", "<p>x</p>", "fake-key",
+                         {"good@example.com": None, "not-an-address": None}, host=fake_sendgrid.host)
+    assert results == {"good@example.com": True, "not-an-address": False}
+
+
+def _bad_request(*fields):
+    from python_http_client.exceptions import BadRequestsError
+
+    body = json.dumps({"errors": [{"message": "Does not contain a valid address.", "field": f}
+                                  for f in fields]}).encode()
+    return BadRequestsError(MagicMock(code=400, reason="Bad Request", hdrs={}, read=lambda: body))
+
+
+def test_send_batch_drops_rejected_recipient_and_resends():
+    calls = []
+
+    def send(message):
+        emails = [p["to"][0]["email"] for p in message.get()["personalizations"]]
+        calls.append(emails)
+        if "bounce@example.com" in emails:
+            raise _bad_request(f"personalizations.{emails.index('bounce@example.com')}.to.0.email")
+        return MagicMock(status_code=202)
+
+    with patch("sendgrid.SendGridAPIClient") as mock_sg:
+        mock_sg.return_value.send.side_effect = send
+        results = send_batch("Digest", "<p>x</p>", "fake-key", {
+            "a@example.com": None, "bounce@example.com": None,
+            "c@example.com": None, "d@example.com": None,
+        })
+    assert results == {
+        "a@example.com": True, "bounce@example.com": False,
+        "c@example.com": True, "d@example.com": True,
+    }
+    assert len(calls) == 2
+
+
+def test_send_batch_fails_whole_request_on_other_bad_requests():
+    with patch("sendgrid.SendGridAPIClient") as mock_sg:
+        mock_sg.return_value.send.side_effect = _bad_request("from.email")
+        results = send_batch("Digest", "<p>x</p>", "fake-key", {
+            "a@example.com": None, "b@example.com": None, "c@example.com": None,
+        })
+    assert results == {"a@example.com": False, "b@example.com": False, "c@example.com": False}
+    assert mock_sg.return_value.send.call_count == 1
+
+
+def test_send_batch_with_text_body_is_multipart(fake_sendgrid):
+    send_batch("Digest", "<p>x</p>", "fake-key", {"a@example.com": None},
+               host=fake_sendgrid.host, text_body="x")
+    [payload] = fake_sendgrid.requests
+    assert payload["content"] == [
+        {"type": "text/plain", "value": "x"},
+        {"type": "text/html", "value": "<p>x</p>"},
+    ]
@@ -1,5 +1,13 @@
 # tests/scrapers/test_actors_access.py
-from scrapers.actors_access import ActorsAccessScraper
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from config import ACTORS_ACCESS_CONCURRENCY
+from scrapers.actors_access import _BREAKDOWN_JS, _INDEX_JS, ACTORS_ACCESS_URL, ActorsAccessScraper
 
 
 def test_scraper_returns_empty_without_credentials():
@@ -13,3 +21,144 @@ def test_parse_html_with_empty_page():
     scraper = ActorsAccessScraper()
     listings = scraper.parse_html("<html><body></body></html>")
     assert listings == []
+
+
+BASE = "https://www.actorsaccess.com"
+
+
+class FakeSite:
+    def __init__(self, indexes, details):
+        self.indexes = indexes
+        self.details = details
+        self.session_valid = True
+        self.logged_in = False
+        self.logins = 0
+        self.open_pages = 0
+        self.max_open_pages = 0
+
+
+class FakePage:
+    def __init__(self, site):
+        self.site = site
+        self.url = "about:blank"
+
+    def goto(self, url, **kwargs):
+        login_required = url.startswith(ACTORS_ACCESS_URL) and not self.site.logged_in
+        self.url = f"{BASE}/login" if login_required else url
+
+    def query_selector(self, selector):
+        return None
+
+    def fill(self, selector, value):
+        pass
+
+    def click(self, selector):
+        self.site.logins += 1
+        self.site.logged_in = self.site.session_valid = True
+
+    def wait_for_load_state(self, state, **kwargs):
+        pass
+
+    def evaluate(self, script, arg=None):
+        if script == _INDEX_JS:
+            return self.site.indexes[self.url]
+        assert script == _BREAKDOWN_JS
+        return self.site.details[self.url]
+
+    def content(self):
+        return "<html><body><div class='redesigned'>Project A</div></body></html>"
+
+    def close(self):
+        self.site.open_pages -= 1
+
+
+class FakeContext:
+    def __init__(self, site):
+        self.site = site
+
+    def new_page(self):
+        self.site.open_pages += 1
+        self.site.max_open_pages = max(self.site.max_open_pages, self.site.open_pages)
+        return FakePage(self.site)
+
+    def storage_state(self, path):
+        Path(path).write_text(json.dumps({"cookies": [{"name": "session"}]}))
+
+
+def _site(pages=3, per_page=3):
+    urls = [ACTORS_ACCESS_URL] + [f"{ACTORS_ACCESS_URL}?page={n}" for n in range(2, pages + 1)]
+    indexes, details = {}, {}
+    for n, url in enumerate(urls):
+        projects = [{"title": f"Project {n}-{i}", "url": f"{BASE}/breakdown/{n}-{i}"}
+                    for i in range(per_page)]
+        # Each index page links only to its neighbours
+        indexes[url] = {"projects": projects, "pages": urls[max(n - 1, 0):n + 2]}
+        for p in projects:
+            details[p["url"]] = f"{p['title']}: shoots in Burbank, pays $150/day"
+    return FakeSite(indexes, details)
+
+
+def _fetch(site, tmp_path, monkeypatch):
+    monkeypatch.setenv("ACTORS_ACCESS_EMAIL", "me@example.com")
+    monkeypatch.setenv("ACTORS_ACCESS_PASSWORD", "secret")
+    state = tmp_path / "state.json"
+
+    @contextmanager
+    def context(storage_state=None):
+        # A fresh browser context: only a restored session counts as logged in
+        site.logged_in = storage_state is not None and site.session_valid
+        yield FakeContext(site)
+
+    with patch("scrapers.actors_access.ACTORS_ACCESS_STATE_PATH", str(state)), \
+            patch("scrapers.actors_access.browser_pool") as pool:
+        pool.context.side_effect = context
+        return ActorsAccessScraper().fetch(), state
+
+
+def test_logs_in_once_then_reuses_saved_session(tmp_path, monkeypatch):
+    site = _site()
+    _, state = _fetch(site, tmp_path, monkeypatch)
+    assert site.logins == 1 and state.exists()
+
+    _fetch(site, tmp_path, monkeypatch)
+    assert site.logins == 1
+
+    site.session_valid = False  # expired: log in again
+    _fetch(site, tmp_path, monkeypatch)
+    assert site.logins == 2
+
+
+def test_crawls_every_index_and_breakdown_page(tmp_path, monkeypatch):
+    site = _site(pages=6, per_page=5)
+    bodies, _ = _fetch(site, tmp_path, monkeypatch)
+    assert len(bodies) == 6
+    assert site.max_open_pages <= ACTORS_ACCESS_CONCURRENCY
+
+    listings = [l for body in bodies for l in ActorsAccessScraper().parse(body)]
+    assert len(listings) == 30
+    assert listings[0].url == f"{BASE}/breakdown/0-0"
+    assert listings[0].location == "Burbank, CA"
+    assert listings[0].description.startswith("Project 0-0: shoots in Burbank")
+
+
+def test_rejected_login_raises(tmp_path, monkeypatch):
+    site = _site()
+    with patch.object(FakePage, "click", lambda self, selector: None):
+        with pytest.raises(RuntimeError):
+            _fetch(site, tmp_path, monkeypatch)
+
+
+def test_empty_index_falls_back_to_html_and_reports_no_candidates(tmp_path, monkeypatch):
+    site = _site(pages=1)
+    site.indexes[ACTORS_ACCESS_URL]["projects"] = []
+    bodies, _ = _fetch(site, tmp_path, monkeypatch)
+    assert bodies[0].startswith("<html>")
+    assert ActorsAccessScraper().parse_stats(bodies[0]) == ([], (0, {}))
+
+
+def test_parse_stats_counts_projects_missing_breakdown_text():
+    body = json.dumps([{"title": "A", "url": f"{BASE}/a", "text": "Shoots in Burbank"},
+                       {"title": "B", "url": f"{BASE}/b", "text": ""}])
+    listings, stats = ActorsAccessScraper().parse_stats(body)
+    assert len(listings) == 2
+    assert stats == (2, {"text": 1})
@@ -0,0 +1,99 @@
+# tests/scrapers/test_cards.py
+import json
+
+from scrapers.backstage import SITE
+from scrapers.cards import _EXTRACT_CARDS_JS, cards_from_json, fetch_cards, parse_cards, parse_cards_stats
+
+
+class FakeResponse:
+    def __init__(self, url, payload):
+        self.url = url
+        self.payload = payload
+
+    def json(self):
+        if self.payload is None:
+            raise ValueError("not JSON")
+        return self.payload
+
+
+class FakePage:
+    def __init__(self, responses=(), cards=None, html="<html></html>"):
+        self.responses = list(responses)
+        self.cards = cards
+        self.html = html
+        self.handlers = []
+        self.evaluated = False
+
+    def on(self, event, handler):
+        self.handlers.append(handler)
+
+    def goto(self, url, **kwargs):
+        for response in self.responses:
+            for handler in self.handlers:
+                handler(response)
+
+    def evaluate(self, script, arg=None):
+        assert script == _EXTRACT_CARDS_JS
+        self.evaluated = True
+        if isinstance(self.cards, Exception):
+            raise self.cards
+        return self.cards or []
+
+    def content(self):
+        return self.html
+
+
+API_URL = "https://www.backstage.com/api/casting/search?page=1"
+
+
+def test_cards_from_json_finds_nested_objects():
+    payload = {"data": {"results": [
+        {"title": "Lead - Indie Short", "url": "/casting/1", "location": {"city": "LA"}},
+        {"name": "Extras for Music Video", "path": "/casting/2", "union_status": "SAG-AFTRA"},
+        {"title": "No link, not a card"},
+    ]}}
+    cards = cards_from_json(payload, SITE)
+    assert [c["href"] for c in cards] == ["/casting/1", "/casting/2"]
+    assert cards[0]["location"] is None  # not a string
+    assert cards[1]["union"] == "SAG-AFTRA"
+
+
+def test_fetch_prefers_intercepted_api_responses():
+    page = FakePage(responses=[
+        FakeResponse("https://www.backstage.com/static/app.js", None),
+        FakeResponse(API_URL, {"results": [{"title": "Lead Role", "url": "/casting/1"}]}),
+    ])
+    body = fetch_cards(page, SITE, "https://www.backstage.com/casting/")
+    assert json.loads(body)[0]["title"] == "Lead Role"
+    assert not page.evaluated
+
+
+def test_fetch_falls_back_to_dom_extraction_then_html():
+    cards = [{"title": "Lead", "href": "/c/1", "location": None, "union": None, "role": None}]
+    page = FakePage(responses=[FakeResponse(API_URL, None)], cards=cards)
+    assert json.loads(fetch_cards(page, SITE, "https://www.backstage.com/casting/")) == cards
+
+    page = FakePage(cards=RuntimeError("page crashed"), html="<html><body></body></html>")
+    assert fetch_cards(page, SITE, "https://www.backstage.com/casting/") == "<html><body></body></html>"
+
+
+def test_json_and_html_bodies_parse_alike():
+    html = """<article class="casting-card"><a href="/casting/9"><h3>Supporting Role</h3></a>
+        <span class="location">Burbank, CA</span><span class="role-type">Theater</span></article>"""
+    card = {"title": "Supporting Role", "href": "/casting/9", "location": "Burbank, CA",
+            "union": None, "role": "Theater"}
+    assert parse_cards(json.dumps([card]), SITE) == parse_cards(html, SITE)
+    listing = parse_cards(html, SITE)[0]
+    assert listing.url == "https://www.backstage.com/casting/9"
+    assert listing.role_type == "theater"
+    assert listing.union_status == "non-union"
+
+
+def test_stats_count_cards_and_missing_fields():
+    html = """<article class="casting-card"><a href="/casting/1">Lead</a><span class="location">LA</span></article>
+        <article class="casting-card"><a href="/casting/2">Extra</a></article>
+        <div class="redesigned-card"><a href="/casting/3">Not matched</a></div>"""
+    listings, stats = parse_cards_stats(html, SITE)
+    assert len(listings) == 2
+    assert stats.candidates == 2
+    assert stats.missing == {"location": 1, "union": 2, "role": 2}
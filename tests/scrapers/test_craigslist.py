@@ -23,3 +23,19 @@ def test_parse_extracts_location():
     scraper = CraigslistScraper()
     listings = scraper.parse_html(html)
     assert any(l.location for l in listings)
+
+
+def test_parse_extracts_compensation():
+    html = (FIXTURES / "craigslist_sample.html").read_text()
+    listings = CraigslistScraper().parse_html(html)
+    assert any(l.compensation == "$200/day" for l in listings)
+
+
+def test_relative_links_and_missing_locations_use_the_page_site():
+    html = """<html><head><link rel="canonical" href="https://atlanta.craigslist.org/search/tlg"></head>
+    <body><ol><li class="cl-static-search-result" title="Extras needed">
+      <a href="/atl/tlg/d/extras/1.html"><div class="title">Extras needed</div></a>
+    </li></ol></body></html>"""
+    [listing] = CraigslistScraper().parse_html(html)
+    assert listing.url == "https://atlanta.craigslist.org/atl/tlg/d/extras/1.html"
+    assert listing.location == "Atlanta, GA"
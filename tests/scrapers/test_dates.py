@@ -0,0 +1,45 @@
+# tests/scrapers/test_dates.py
+from datetime import date
+
+from models import CastingListing
+from scrapers.dates import TODAY, deferred_dates, parse_today, posted_on, resolve_dates
+from scrapers.extract import extract
+
+
+def _listing(posted: date, deadline: date | None = None) -> CastingListing:
+    return CastingListing(
+        title="Lead", source="craigslist", url="https://example.com/1",
+        posted_date=posted, location="", union_status="", role_type="",
+        description="", how_to_apply="", deadline=deadline,
+    )
+
+
+def test_deferred_dates_do_not_depend_on_the_day():
+    with deferred_dates():
+        assert parse_today() == TODAY
+        assert posted_on(2, 29) == date(4, 2, 29)
+        assert extract("Submit by 3/14").deadline == date(4, 3, 14)
+        assert extract("Deadline: April 1, 2025").deadline == date(2025, 4, 1)
+    assert parse_today() == date.today()
+
+
+def test_resolve_dates_against_the_day_read():
+    with deferred_dates():
+        listing = _listing(posted_on(12, 30), extract("Shoots Jan 5").deadline)
+    resolved = resolve_dates(listing, date(2026, 1, 2))
+    assert resolved.posted_date == date(2025, 12, 30)
+    assert resolved.deadline == date(2026, 1, 5)
+    later = resolve_dates(listing, date(2026, 3, 10))
+    assert later.deadline == date(2027, 1, 5)
+    assert resolve_dates(_listing(TODAY), date(2026, 3, 10)).posted_date == date(2026, 3, 10)
+
+
+def test_resolved_dates_match_a_direct_parse():
+    text = "Submit by 3/14, shoots 3/20"
+    with deferred_dates():
+        deferred = _listing(posted_on(3, 9), extract(text).deadline)
+    today = date(2026, 3, 10)
+    assert resolve_dates(deferred, today) == _listing(date(2026, 3, 9), extract(text, today).deadline)
+    # Already-resolved listings come back as they are
+    listing = _listing(date(2026, 3, 9))
+    assert resolve_dates(listing, today) is listing
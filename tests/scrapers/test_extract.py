@@ -0,0 +1,91 @@
+# tests/scrapers/test_extract.py
+from datetime import date
+
+import pytest
+
+from scrapers.extract import extract, extract_all
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Shooting in North Hollywood this weekend", "North Hollywood, CA"),
+    ("Downtown LA rooftop shoot", "Downtown LA, CA"),
+    ("Indie short, LA based", "Los Angeles, CA"),
+    ("LA area; shooting in Burbank", "Burbank, CA"),
+    ("Filming in L.A. next week", "Los Angeles, CA"),
+    ("Santa Monica beach scene", "Santa Monica, CA"),
+    ("Remote self-tape only", ""),
+    ("Lavish party scene", ""),  # "la" only counts as a whole word
+])
+def test_extract_location(text, expected):
+    assert extract(text).location == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Background extras needed", "background"),
+    ("Lead role in a feature; extras also needed", "background"),
+    ("Seeking LEAD for thesis film", "principal"),
+    ("Misleading ad copy is not a role", "commercial"),
+    ("An extraordinary opportunity", "other"),
+    ("Spotlight on new talent", "other"),
+    ("V.O. artist for animation", "voice"),
+])
+def test_extract_role_type(text, expected):
+    assert extract(text).role_type == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("USC thesis film", "USC"),
+    ("Loyola Marymount senior project", "LMU"),
+    ("Cal Arts animation", "CalArts"),
+    ("Student film, no pay", "Student Film"),
+    ("Focused actors wanted", None),  # "usc" inside a word is not USC
+])
+def test_extract_school(text, expected):
+    assert extract(text).school == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Non-union, paid", "non-union"),
+    ("SAG-AFTRA and non union welcome", "non-union"),
+    ("SAG ultra low budget", "SAG-AFTRA"),
+    ("Paid gig", ""),
+])
+def test_extract_union_status(text, expected):
+    assert extract(text).union_status == expected
+
+
+def test_extract_all_matches_single():
+    texts = ["USC lead in Burbank", "Background in Pasadena, nonunion", ""]
+    assert extract_all(texts) == [extract(t) for t in texts]
+    first = extract_all(texts)[0]
+    assert (first.location, first.role_type, first.school) == ("Burbank, CA", "principal", "USC")
+
+
+TODAY = date(2026, 3, 10)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Submit by 3/14, shoots 3/20", date(2026, 3, 14)),
+    ("Shoots March 20-22 in Burbank", date(2026, 3, 22)),
+    ("Auditions 3/12. Shooting 3/20 - 3/22/26", date(2026, 3, 22)),
+    ("Deadline: April 1, 2025", date(2025, 4, 1)),
+    ("Submissions due Mar. 5th", date(2026, 3, 5)),
+    ("Shoots Jan 5", date(2027, 1, 5)),  # long past this year, so next year
+    ("Shooting 2 days next month", None),
+    ("Apply by the 14th", None),
+])
+def test_extract_deadline(text, expected):
+    assert extract(text, TODAY).deadline == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Background extras - $200/day", "$200/day"),
+    ("Pays $25 per hour", "$25/hr"),
+    ("$1,500 flat for the weekend", "$1,500 flat"),
+    ("Copy/credit/meals provided", "Copy/credit/meals"),
+    ("Unpaid, copy and credit", "Unpaid"),
+    ("Paid gig", "Paid"),
+    ("Lead role", None),
+])
+def test_extract_compensation(text, expected):
+    assert extract(text, TODAY).compensation == expected
@@ -1,5 +1,19 @@
 # tests/scrapers/test_facebook.py
-from scrapers.facebook import FacebookScraper
+import json
+from unittest.mock import patch
+
+import pytest
+
+from markets import LocationRouter, active_markets
+from models import listing_key
+from scrapers.facebook import _COLLECT_NEW_POSTS_JS, FacebookScraper
+
+
+@pytest.fixture(autouse=True)
+def posts_path(tmp_path, monkeypatch):
+    path = tmp_path / "facebook_posts.json"
+    monkeypatch.setattr("scrapers.facebook.FACEBOOK_POSTS_PATH", str(path))
+    return path
 
 
 def test_scraper_returns_empty_without_cookies():
@@ -12,3 +26,91 @@ def test_parse_html_with_empty_page():
     scraper = FacebookScraper()
     listings = scraper.parse_html("<html><body></body></html>")
     assert listings == []
+
+
+def _post(n, age="1h", text="Casting call: seeking actors for a short film in Burbank"):
+    return {"text": f"{text} #{n}", "url": f"/groups/x/posts/{n}", "utime": None, "age": age}
+
+
+class FakePage:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.scrolls = 0
+
+    def goto(self, url, **kwargs):
+        pass
+
+    def wait_for_timeout(self, ms):
+        pass
+
+    def evaluate(self, script):
+        if script == _COLLECT_NEW_POSTS_JS:
+            return self.batches.pop(0) if self.batches else []
+        self.scrolls += 1
+
+
+class FakeContext:
+    def __init__(self, pages):
+        self.pages = list(pages)
+
+    def add_cookies(self, cookies):
+        pass
+
+    def new_page(self):
+        return self.pages.pop(0)
+
+
+def _fetch(scraper, pages, monkeypatch):
+    monkeypatch.setenv("FACEBOOK_COOKIES", "[]")
+    context = FakeContext(pages)
+    with patch("scrapers.facebook.browser_pool") as pool:
+        pool.context.return_value.__enter__.return_value = context
+        return scraper.fetch()
+
+
+def test_fetch_scrolls_until_posts_are_already_seen(monkeypatch):
+    seen = {listing_key(f"https://www.facebook.com/groups/x/posts/{n}",
+                        " ".join(_post(n)["text"].split())[:100].strip()) for n in (3, 4, 5)}
+    page = FakePage([[_post(1)], [_post(2), _post(3)], [_post(4), _post(5)], [_post(6)]])
+    bodies = _fetch(FacebookScraper(is_seen=seen.__contains__), [page], monkeypatch)
+    posts = json.loads(bodies[0])
+    assert [p["url"] for p in posts] == ["/groups/x/posts/1", "/groups/x/posts/2"]
+    assert page.batches == [[_post(6)]]  # stopped before loading more
+    assert page.scrolls == 2
+
+
+def test_fetch_stops_at_posts_older_than_freshness_window(monkeypatch):
+    page = FakePage([[_post(1, age="2h"), _post(2, age="5d"), _post(3, age="1w"), _post(4, age="2w")]])
+    bodies = _fetch(FacebookScraper(), [page], monkeypatch)
+    listings = FacebookScraper().parse(bodies[0])
+    assert [l.url for l in listings] == ["https://www.facebook.com/groups/x/posts/1"]
+    assert listings[0].location == "Burbank, CA"
+
+
+def test_posts_naming_no_place_go_to_their_groups_market(monkeypatch):
+    page = FakePage([[_post(1, text="Casting call: seeking actors for a short film")]])
+    bodies = _fetch(FacebookScraper(), [page], monkeypatch)
+    listing, = FacebookScraper().parse(bodies[0])
+    assert listing.location == "Los Angeles, CA"
+    assert LocationRouter(active_markets()).route(listing) == ["la"]
+
+
+def test_fetch_reads_groups_round_robin(monkeypatch):
+    first = FakePage([[_post(1)], [], [], []])
+    second = FakePage([[_post(10)], [_post(11)], [], [], []])
+    bodies = _fetch(FacebookScraper(), [first, second], monkeypatch)
+    assert [len(json.loads(b)) for b in bodies] == [1, 2]
+
+
+def test_fetch_stops_at_posts_read_by_an_earlier_run(monkeypatch, posts_path):
+    chatter = "Anyone know a good headshot photographer around here?"
+    _fetch(FacebookScraper(), [FakePage([[_post(n, text=chatter) for n in (1, 2, 3)]])], monkeypatch)
+    assert set(json.loads(posts_path.read_text())) == {f"https://www.facebook.com/groups/x/posts/{n}"
+                                                        for n in (1, 2, 3)}
+
+    # Never sent (not casting calls), but read before: the feed stops there
+    page = FakePage([[_post(0)], [_post(1, text=chatter), _post(2, text=chatter), _post(3, text=chatter)],
+                     [_post(4)]])
+    bodies = _fetch(FacebookScraper(), [page], monkeypatch)
+    assert [p["url"] for p in json.loads(bodies[0])][0] == "/groups/x/posts/0"
+    assert page.batches == [[_post(4)]]
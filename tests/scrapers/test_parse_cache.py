@@ -0,0 +1,105 @@
+# tests/scrapers/test_parse_cache.py
+import zlib
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from models import CastingListing
+from scrapers.base import BaseScraper
+from scrapers.parse_cache import ParseCache, _decode, _encode, _inputs, parse_key
+from scrapers.parse_pool import Page, PageStats, to_row
+
+
+def _row(title="Lead", deadline=None) -> tuple:
+    return to_row(CastingListing(
+        title=title, source="fake", url=f"https://example.com/{title}",
+        posted_date=date(2026, 3, 1), location="Burbank, CA", union_status="",
+        role_type="principal", description=title, how_to_apply="Apply", deadline=deadline,
+    ))
+
+
+class FakeScraper(BaseScraper):
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.parsed: list[str] = []
+
+    @property
+    def source_name(self) -> str:
+        return "fake"
+
+    def fetch(self) -> list[str]:
+        return self.bodies
+
+    def parse(self, body: str) -> list[CastingListing]:
+        self.parsed.append(body)
+        return [CastingListing(*_row(body))]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ParseCache(str(tmp_path / "parse_cache.db"), max_bytes=1024 * 1024)
+    with patch("scrapers.base.parse_cache", cache):
+        yield cache
+    cache.close()
+
+
+def test_unchanged_page_is_not_reparsed(cache):
+    first = FakeScraper(["page-a", "page-b"])
+    listings = first.scrape()
+    second = FakeScraper(["page-a", "page-c"])
+    assert [l.title for l in second.scrape()] == ["page-a", "page-c"]
+    assert second.parsed == ["page-c"]
+    assert [l.title for l in listings] == ["page-a", "page-b"]
+
+
+def test_rows_round_trip_with_dates(cache):
+    page = Page([_row("a", deadline=date(2026, 3, 14)), _row("b")], PageStats(3, {"location": 1}))
+    cache.put_many({"k": page})
+    assert cache.get_many(["k", "missing"]) == {"k": page}
+
+
+def test_unchanged_page_keeps_its_stats(cache):
+    FakeScraper(["page-a"]).scrape()
+    second = FakeScraper(["page-a"])
+    second.scrape()
+    assert second.parsed == []
+    assert second.last_pages == [("page-a", PageStats(1, {}))]
+
+
+def test_entries_without_stats_still_decode():
+    blob = zlib.compress(b'[["a","fake","u","2026-03-01","LA","","principal","d","Apply",null,null,null]]')
+    page = _decode(blob)
+    assert page.stats == PageStats(1, {})
+    assert page.rows[0][3] == date(2026, 3, 1)
+
+
+def test_key_depends_on_source_parser_version_and_body():
+    base = parse_key("craigslist", 1, "<html>")
+    assert base == parse_key("craigslist", 1, "<html>")
+    assert base != parse_key("craigslist", 2, "<html>")
+    assert base != parse_key("craigslist", 1, "<html> ")
+    assert base != parse_key("backstage", 1, "<html>")
+
+
+def test_key_depends_on_gazetteer_and_extract_tables():
+    base = parse_key("craigslist", 1, "<html>")
+    _inputs.cache_clear()
+    try:
+        with patch("scrapers.extract.fingerprint", return_value="edited"):
+            assert parse_key("craigslist", 1, "<html>") != base
+    finally:
+        _inputs.cache_clear()
+
+
+@patch("scrapers.parse_cache.time.time", side_effect=range(100))
+def test_least_recently_used_entries_evicted_over_size(_clock, tmp_path):
+    rows = Page([_row(f"listing {i}") for i in range(50)], PageStats(50, {}))
+    # Room for two entries
+    cache = ParseCache(str(tmp_path / "parse_cache.db"), max_bytes=2 * len(_encode(rows)))
+    cache.put_many({"old": rows})
+    cache.put_many({"newer": rows})
+    cache.get_many(["old"])  # touch "old" so "newer" is now least recently used
+    cache.put_many({"newest": rows})
+    assert set(cache.get_many(["old", "newer", "newest"])) == {"old", "newest"}
+    cache.close()
@@ -0,0 +1,52 @@
+# tests/scrapers/test_parse_pool.py
+from datetime import date
+from pathlib import Path
+
+from models import CastingListing
+from scrapers.craigslist import CraigslistScraper
+from scrapers.dates import resolve_dates
+from scrapers.parse_pool import ParsePool, _parse_page, from_row, to_row
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+
+def test_row_round_trip():
+    listing = CastingListing(
+        title="Lead", source="craigslist", url="https://example.com/1",
+        posted_date=date(2026, 3, 1), location="Burbank, CA", union_status="",
+        role_type="principal", description="Lead", how_to_apply="Apply",
+        deadline=date(2026, 3, 14), compensation="$200/day",
+    )
+    assert from_row(to_row(listing)) == listing
+
+
+def test_worker_pool_matches_inline_parse():
+    html = (FIXTURES / "craigslist_sample.html").read_text()
+    scraper = CraigslistScraper()
+    pool = ParsePool(workers=2, min_bytes=0)
+    try:
+        listings = pool.parse(scraper.parse, [html, html, html])
+    finally:
+        pool.close()
+    assert listings == scraper.parse_html(html) * 3
+
+
+def test_single_page_parsed_inline():
+    html = (FIXTURES / "craigslist_sample.html").read_text()
+    pool = ParsePool(workers=4)
+    assert pool.parse(CraigslistScraper().parse, [html]) == CraigslistScraper().parse_html(html)
+    assert pool._executor is None
+
+
+def test_little_page_text_parsed_inline():
+    html = (FIXTURES / "craigslist_sample.html").read_text()
+    pool = ParsePool(workers=4, min_bytes=3 * len(html))
+    assert pool.parse(CraigslistScraper().parse, [html, html]) == CraigslistScraper().parse_html(html) * 2
+    assert pool._executor is None
+
+
+def test_pages_parse_with_deferred_dates():
+    html = (FIXTURES / "craigslist_sample.html").read_text()
+    scraper = CraigslistScraper()
+    page = _parse_page(scraper.parse_stats, html)
+    assert [resolve_dates(from_row(row)) for row in page.rows] == scraper.parse_html(html)
@@ -0,0 +1,61 @@
+# tests/scrapers/test_registry.py
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from scrapers import registry
+from scrapers.registry import BUILTIN_SPECS, Cost, ScraperSpec, all_specs, enabled_specs, run_order
+
+
+@pytest.fixture(autouse=True)
+def fresh_specs():
+    all_specs.cache_clear()
+    yield
+    all_specs.cache_clear()
+
+
+def _named(name):
+    scraper = MagicMock()
+    scraper.source_name = name
+    return scraper
+
+
+def test_builtin_specs_create_matching_scrapers():
+    for spec in BUILTIN_SPECS:
+        scraper = spec.create()
+        assert scraper.source_name == spec.name
+        assert scraper.concurrency == spec.concurrency
+
+
+def test_incremental_scrapers_get_the_seen_lookup():
+    is_seen = MagicMock(return_value=False)
+    scraper = all_specs()["facebook"].create(is_seen=is_seen)
+    assert scraper._is_seen is is_seen
+
+
+def test_run_order_puts_browser_sources_first_most_expensive_first():
+    names = ["craigslist", "unknown", "backstage", "reddit", "actors_access", "facebook"]
+    ordered = [s.source_name for s in run_order([_named(n) for n in names])]
+    assert ordered == ["actors_access", "facebook", "backstage", "craigslist", "unknown", "reddit"]
+
+
+def test_enabled_follows_config_then_spec_default():
+    plugin = ScraperSpec("mysite", "mysite:Scraper", cost=Cost.MEDIUM)
+    entry = MagicMock()
+    entry.name = "mysite"
+    entry.load.return_value = plugin
+    with patch("importlib.metadata.entry_points", return_value=[entry]), \
+            patch.dict(registry.SCRAPERS_ENABLED, {"reddit": True}):
+        names = [s.name for s in enabled_specs()]
+    assert "mysite" in names and "reddit" in names
+    assert "facebook" not in names  # off in config
+
+
+def test_broken_or_clashing_plugins_are_ignored():
+    broken = MagicMock()
+    broken.load.side_effect = ImportError("no such module")
+    clash = MagicMock()
+    clash.load.return_value = ScraperSpec("craigslist", "elsewhere:Scraper")
+    with patch("importlib.metadata.entry_points", return_value=[broken, clash]):
+        specs = all_specs()
+    assert specs["craigslist"].target == "scrapers.craigslist:CraigslistScraper"
@@ -0,0 +1,83 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from scrapers import session
+from scrapers.session import TokenBucket, fetch, retry_after_seconds
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit():
+    with patch("scrapers.session._bucket_for"):
+        yield
+
+
+def _response(status, headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    resp.url = "https://example.com/"
+    return resp
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=1, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+    clock.now += 1.0
+    assert bucket.acquire() == 0
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds(_response(429, {"Retry-After": "7"})) == 7
+    assert retry_after_seconds(_response(429)) is None
+
+
+@patch("scrapers.session.get_session")
+def test_fetch_honors_retry_after(mock_get_session):
+    mock_get_session.return_value.get.side_effect = [
+        _response(429, {"Retry-After": "5"}),
+        _response(200),
+    ]
+    sleep = MagicMock()
+    resp = fetch("https://ratelimited.example.com/", sleep=sleep)
+    assert resp.status_code == 200
+    sleep.assert_called_once_with(5.0)
+
+
+@patch("scrapers.session.get_session")
+def test_fetch_does_not_retry_forbidden(mock_get_session):
+    mock_get_session.return_value.get.return_value = _response(403)
+    sleep = MagicMock()
+    with pytest.raises(requests.HTTPError):
+        fetch("https://blocked.example.com/", sleep=sleep)
+    assert mock_get_session.return_value.get.call_count == 1
+    sleep.assert_not_called()
+
+
+@patch("scrapers.session.get_session")
+def test_fetch_gives_up_after_max_retries(mock_get_session):
+    mock_get_session.return_value.get.return_value = _response(503)
+    with pytest.raises(requests.HTTPError):
+        fetch("https://down.example.com/", sleep=MagicMock())
+    assert mock_get_session.return_value.get.call_count == session.HTTP_MAX_RETRIES + 1
@@ -0,0 +1,118 @@
+import json
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from alerts import AlertDispatcher, FileSink, WebhookSink, format_alert
+from models import CastingListing, CareerCategory
+from ranking import Ranker
+
+
+def _make_listing(title="Lead", role_type="principal", **kw) -> CastingListing:
+    defaults = {
+        "title": title,
+        "source": "backstage",
+        "url": f"https://example.com/{title}",
+        "posted_date": date.today(),
+        "location": "Los Angeles, CA",
+        "union_status": "non-union",
+        "role_type": role_type,
+        "description": "",
+        "how_to_apply": "Apply",
+    }
+    defaults.update(kw)
+    return CastingListing(**defaults)
+
+
+class RecordingSink:
+    def __init__(self):
+        self.messages = []
+
+    def send(self, subject, text, listings):
+        self.messages.append((subject, [l.title for l in listings]))
+
+
+def _dispatcher(*sinks, coalesce_seconds=0.0, max_per_message=10, min_score=1.0, alerted_path=None):
+    return AlertDispatcher(
+        list(sinks), {CareerCategory.PRINCIPAL}, min_score, ranker=Ranker({"pay": 2.0}),
+        coalesce_seconds=coalesce_seconds, max_per_message=max_per_message, alerted_path=alerted_path,
+    )
+
+
+def test_only_priority_listings_are_alerted():
+    sink = RecordingSink()
+    alerts = _dispatcher(sink)
+    alerts.submit([
+        _make_listing("Paid Lead", compensation="$300/day"),
+        _make_listing("Unpaid Lead", compensation="Unpaid"),
+        _make_listing("Paid Extra", role_type="background", compensation="$300/day"),
+    ])
+    alerts.close()
+    assert sink.messages == [("Casting Scout alert: Paid Lead", ["Paid Lead"])]
+
+
+def test_burst_is_coalesced_into_one_message():
+    sink = RecordingSink()
+    alerts = _dispatcher(sink, coalesce_seconds=60.0, max_per_message=2)
+    for i in range(3):
+        alerts.submit([_make_listing(f"Lead {i}", compensation="Paid")])
+    alerts.close()  # flushes without waiting out the window
+    assert sink.messages == [("Casting Scout alert: 3 new top listings", ["Lead 0", "Lead 1"])]
+
+
+def test_listing_is_alerted_once():
+    sink = RecordingSink()
+    alerts = _dispatcher(sink)
+    listing = _make_listing(compensation="Paid")
+    alerts.submit([listing])
+    alerts.submit([listing])  # e.g. routed to a second market
+    alerts.close()
+    assert [titles for _, titles in sink.messages] == [["Lead"]]
+
+
+def test_listing_is_not_alerted_again_after_restart(tmp_path):
+    path = str(tmp_path / "alerted.json")
+    sink = RecordingSink()
+    alerts = _dispatcher(sink, alerted_path=path)
+    alerts.submit([_make_listing("Lead", compensation="Paid")])
+    alerts.close()
+    restarted = _dispatcher(sink, alerted_path=path)
+    restarted.submit([_make_listing("Lead", compensation="Paid"), _make_listing("Other Lead", compensation="Paid")])
+    restarted.close()
+    assert [titles for _, titles in sink.messages] == [["Lead"], ["Other Lead"]]
+
+
+def test_failing_sink_does_not_stop_the_others():
+    broken = MagicMock()
+    broken.send.side_effect = OSError("down")
+    sink = RecordingSink()
+    alerts = _dispatcher(broken, sink)
+    alerts.submit([_make_listing(compensation="Paid")])
+    alerts.close()
+    assert len(sink.messages) == 1
+
+
+def test_format_alert_notes_hidden_listings():
+    subject, text = format_alert([_make_listing("A"), _make_listing("B")], hidden=3)
+    assert subject == "Casting Scout alert: 5 new top listings"
+    assert text.endswith("+ 3 more in the next digest")
+    assert "https://example.com/A" in text
+
+
+def test_file_sink_appends_json_lines(tmp_path):
+    path = tmp_path / "alerts" / "alerts.jsonl"
+    sink = FileSink(str(path))
+    sink.send("s", "t", [_make_listing("A")])
+    sink.send("s", "t", [_make_listing("B")])
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["title"] for r in rows] == ["A", "B"]
+    assert rows[0]["url"] == "https://example.com/A"
+
+
+def test_webhook_sink_posts_json():
+    with patch("urllib.request.urlopen") as urlopen:
+        WebhookSink("https://hooks.example.com/x").send("Alert", "- A", [_make_listing("A")])
+    request = urlopen.call_args.args[0]
+    assert request.full_url == "https://hooks.example.com/x"
+    payload = json.loads(request.data)
+    assert payload["text"] == "Alert\n- A"
+    assert payload["listings"][0]["title"] == "A"
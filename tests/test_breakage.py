@@ -0,0 +1,74 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from breakage import BreakageDetector, diagnose
+from metrics import SELECTOR_BREAKAGE, MetricsStore, SourceRun
+from scrapers.parse_pool import PageStats
+
+HEALTHY = [PageStats(20, {"union": 20}), PageStats(24, {"union": 24, "location": 1}), PageStats(22, {"union": 22})]
+
+
+def test_quiet_day_is_not_a_breakage():
+    assert diagnose(PageStats(12, {"union": 12}), HEALTHY) is None
+
+
+def test_selector_matching_nothing_is_a_breakage():
+    assert diagnose(PageStats(0, {}), HEALTHY) == "matched 0 candidates, usually 22"
+
+
+def test_field_suddenly_missing_is_a_breakage():
+    reason = diagnose(PageStats(21, {"union": 21, "location": 20}), HEALTHY)
+    assert reason == "location missing from 95% of 21 candidates, usually 0%"
+
+
+def test_short_or_sparse_history_is_not_judged():
+    assert diagnose(PageStats(0, {}), HEALTHY[:2]) is None
+    assert diagnose(PageStats(0, {}), [PageStats(2, {})] * 5) is None
+
+
+def _runs(store, stats, flagged, start):
+    for i, s in enumerate(stats):
+        run = SourceRun((start + timedelta(hours=i)).isoformat(), "backstage")
+        run.candidates, run.missing = s.candidates, json.dumps(s.missing)
+        run.error = SELECTOR_BREAKAGE if flagged else None
+        store.record([run])
+
+
+def test_detector_flags_run_and_saves_its_pages(tmp_path):
+    store = MetricsStore(":memory:")
+    _runs(store, [PageStats(20, {})] * 3, False, datetime(2026, 3, 1))
+    detector = BreakageDetector(store, str(tmp_path / "pages"), keep=2)
+    body = "<html>new layout</html>"
+    for hour in range(3):
+        run = SourceRun("2026-03-02T00:00:00", "backstage")
+        reason = detector.check("backstage", [(body, PageStats(0, {}))], run, datetime(2026, 3, 2, hour))
+        assert reason == detector.flagged("backstage") == "matched 0 candidates, usually 20"
+        assert (run.candidates, run.error) == (0, SELECTOR_BREAKAGE)
+
+    saved = sorted((tmp_path / "pages").iterdir())
+    assert [p.name for p in saved] == ["backstage-20260302T010000-0.html.gz", "backstage-20260302T020000-0.html.gz"]
+    assert gzip.decompress(saved[0].read_bytes()) == body.encode()
+
+    assert detector.check("backstage", [("[...]", PageStats(19, {}))]) is None
+    assert detector.flagged("backstage") is None
+
+
+def test_flagged_streak_becomes_the_new_baseline(tmp_path):
+    store = MetricsStore(":memory:")
+    _runs(store, [PageStats(20, {})] * 10, False, datetime(2026, 3, 1))
+    _runs(store, [PageStats(4, {})] * 4, True, datetime(2026, 3, 2))
+    detector = BreakageDetector(store, str(tmp_path), accept_runs=5)
+    assert detector.check("backstage", [("<html>", PageStats(4, {}))]) is not None
+
+    _runs(store, [PageStats(4, {})], True, datetime(2026, 3, 3))
+    assert detector.check("backstage", [("<html>", PageStats(4, {}))]) is None
+    # ... and stays accepted once healthy runs follow it
+    _runs(store, [PageStats(4, {})], False, datetime(2026, 3, 4))
+    assert detector.check("backstage", [("<html>", PageStats(5, {}))]) is None
+
+
+def test_run_that_fetched_nothing_is_not_judged(tmp_path):
+    run = SourceRun("2026-03-01T00:00:00", "actors_access")
+    assert BreakageDetector(MetricsStore(":memory:"), str(tmp_path)).check("actors_access", [], run) is None
+    assert run.candidates is None
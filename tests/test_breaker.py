@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from breaker import CircuitBreaker
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+def _breaker(tmp_path, threshold=3, cooldown=timedelta(hours=1)) -> CircuitBreaker:
+    return CircuitBreaker(str(tmp_path / "breaker.json"), threshold=threshold, cooldown=cooldown)
+
+
+def test_closed_until_threshold(tmp_path):
+    b = _breaker(tmp_path)
+    b.record_failure("reddit", now=NOW)
+    b.record_failure("reddit", now=NOW)
+    assert b.allow("reddit", now=NOW)
+    b.record_failure("reddit", now=NOW)
+    assert not b.allow("reddit", now=NOW)
+
+
+def test_reopens_after_cooldown(tmp_path):
+    b = _breaker(tmp_path, threshold=1)
+    b.record_failure("reddit", now=NOW)
+    assert not b.allow("reddit", now=NOW + timedelta(minutes=59))
+    assert b.allow("reddit", now=NOW + timedelta(hours=1))
+    assert b.retry_at("reddit") == NOW + timedelta(hours=1)
+
+
+def test_trial_failure_reopens_circuit(tmp_path):
+    b = _breaker(tmp_path, threshold=2)
+    b.record_failure("reddit", now=NOW)
+    b.record_failure("reddit", now=NOW)
+    later = NOW + timedelta(hours=2)
+    assert b.allow("reddit", now=later)
+    b.record_failure("reddit", now=later)
+    assert not b.allow("reddit", now=later)
+
+
+def test_success_resets(tmp_path):
+    b = _breaker(tmp_path, threshold=2)
+    b.record_failure("reddit", now=NOW)
+    b.record_success("reddit")
+    b.record_failure("reddit", now=NOW)
+    assert b.allow("reddit", now=NOW)
+
+
+def test_state_persists_across_runs(tmp_path):
+    _breaker(tmp_path, threshold=1).record_failure("reddit", now=NOW)
+    b = _breaker(tmp_path, threshold=1)
+    assert not b.allow("reddit", now=NOW)
+    assert b.allow("craigslist", now=NOW)
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import sqlite3
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from dashboard import Dashboard, _handle
+from models import CastingListing, CareerCategory
+from rules import Rule, RuleEngine
+from store import ListingStore
+
+
+def _make_listing(title="Test", **kw) -> CastingListing:
+    defaults = {
+        "title": title,
+        "source": "craigslist",
+        "url": f"https://example.com/{title}",
+        "posted_date": date.today(),
+        "location": "Burbank, CA",
+        "union_status": "non-union",
+        "role_type": "other",
+        "description": "Test",
+        "how_to_apply": "Apply",
+    }
+    defaults.update(kw)
+    return CastingListing(**defaults)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "listings.db")
+    store = ListingStore(path)
+    store.add_many([
+        _make_listing("Lead <b>", role_type="principal"),
+        _make_listing("Short", source="reddit"),
+        _make_listing("Old short", posted_date=date.today() - timedelta(days=10)),
+    ])
+    store.add_many([_make_listing("Yesterday")], seen_on=date.today() - timedelta(days=1))
+    store.close()
+    return path
+
+
+def _get(app, path, query=""):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query.encode(), "headers": []}
+    asyncio.run(app(scope, receive, send))
+    start, body = messages
+    return start["status"], dict(start["headers"])[b"content-type"].decode(), body["body"]
+
+
+def test_listings_are_filtered_and_paginated(db_path):
+    app = Dashboard(db_path)
+    status, content_type, body = _get(app, "/api/listings", "category=short_indie&per_page=1")
+    assert status == 200 and content_type == "application/json"
+    data = json.loads(body)
+    assert data["next_page"] == 2
+    assert [l["category"] for l in data["listings"]] == ["short_indie"]
+
+    data = json.loads(_get(app, "/api/listings", f"source=craigslist&since={date.today().isoformat()}")[2])
+    assert {l["title"] for l in data["listings"]} == {"Lead <b>", "Yesterday"}
+    assert data["next_page"] is None
+
+
+def test_bad_parameter_is_a_400(db_path):
+    status, _, body = _get(Dashboard(db_path), "/api/listings", "since=yesterday")
+    assert status == 400
+    assert "since" in json.loads(body)["error"]
+
+
+def test_stats_come_from_cached_daily_counts(db_path):
+    app = Dashboard(db_path)
+    days = json.loads(_get(app, "/api/stats", "days=2")[2])["days"]
+    assert [d["date"] for d in days] == [(date.today() - timedelta(days=1)).isoformat(), date.today().isoformat()]
+    assert days[0]["total"] == 1
+    assert days[1] == {"date": date.today().isoformat(), "total": 3,
+                       "categories": {"principal": 1, "short_indie": 2},
+                       "sources": {"craigslist": 2, "reddit": 1}}
+
+    store = ListingStore(db_path)
+    store.add_many([_make_listing("New")])
+    store.close()
+    assert json.loads(_get(app, "/api/stats", "days=1")[2])["days"][0]["total"] == 3  # still cached
+
+
+def test_html_page_escapes_listings(db_path):
+    status, content_type, body = _get(Dashboard(db_path), "/")
+    assert status == 200 and content_type.startswith("text/html")
+    assert b"Lead &lt;b&gt;" in body and b"Lead <b>" not in body
+
+
+def test_only_http_links_are_emitted(tmp_path):
+    path = str(tmp_path / "listings.db")
+    store = ListingStore(path)
+    store.add_many([_make_listing("Web"), _make_listing("Sneaky", url="javascript:alert(1)")])
+    store.close()
+    body = _get(Dashboard(path), "/")[2]
+    assert b'<a href="https://example.com/Web">Web</a>' in body
+    assert b"javascript:" not in body and b"Sneaky" in body
+
+
+def test_store_is_opened_read_only(db_path):
+    app = Dashboard(db_path)
+    engine = RuleEngine([Rule(CareerCategory.OPEN_CALL, keywords=("short",))], CareerCategory.PRINCIPAL)
+    with patch("store.default_engine", return_value=engine):
+        _get(app, "/api/listings")
+        # The rules changed, but the stored categories aren't rewritten
+        assert app.store.query(category=CareerCategory.OPEN_CALL) == []
+    with pytest.raises(sqlite3.OperationalError):
+        app.store.add_many([_make_listing("New")])
+    app.close()
+
+
+def test_unknown_path_is_a_404(db_path):
+    assert _get(Dashboard(db_path), "/nope")[0] == 404
+
+
+def test_stdlib_server_serves_the_app(db_path):
+    async def fetch():
+        app = Dashboard(db_path)
+        server = await asyncio.start_server(lambda r, w: _handle(app, r, w), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /api/listings?per_page=2 HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        return response
+
+    head, _, body = asyncio.run(fetch()).partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert len(json.loads(body)["listings"]) == 2
@@ -82,3 +82,61 @@ def test_old_seen_entries_expire(tmp_path):
     d.cleanup(max_age_days=30)
     data = json.loads(path.read_text())
     assert "old_hash_123" not in data
+
+
+def test_is_seen_after_mark_seen(tmp_path):
+    d = Deduplicator(str(tmp_path / "seen.json"))
+    listing = _make_listing(title="Role Y", url="https://example.com/role-y")
+    assert not d.is_seen(listing.dedup_key())
+    d.mark_seen([listing])
+    assert d.is_seen(listing.dedup_key())
+
+
+def test_legacy_flat_file_is_read_as_segments(tmp_path):
+    path = tmp_path / "seen.json"
+    path.write_text(json.dumps({"abc": "2026-03-01", "def": "2026-03-02"}))
+    d = Deduplicator(str(path))
+    assert d.is_seen("abc") and d.is_seen("def")
+    d.flush()
+    assert json.loads(path.read_text()) == {"2026-03-01": {"": ["abc"]}, "2026-03-02": {"": ["def"]}}
+
+
+def test_retention_is_per_source(tmp_path):
+    path = tmp_path / "seen.json"
+    path.write_text(json.dumps({"2026-01-15": {"craigslist": ["cl"], "facebook": ["fb"]}}))
+    d = Deduplicator(str(path), retention={"facebook": 90}, default_retention=30, archive_days=0)
+    d.cleanup(today=date(2026, 3, 1))
+    assert not d.is_seen("cl")
+    assert d.is_seen("fb")
+    assert json.loads(path.read_text()) == {"2026-01-15": {"facebook": ["fb"]}}
+
+
+def test_cleanup_does_not_rewrite_when_nothing_expires(tmp_path):
+    path = tmp_path / "seen.json"
+    path.write_text(json.dumps({"2026-02-20": {"craigslist": ["cl"]}}))
+    d = Deduplicator(str(path), retention={}, default_retention=30)
+    path.write_text("unchanged")
+    d.cleanup(today=date(2026, 3, 1))
+    assert path.read_text() == "unchanged"
+
+
+def test_expired_keys_are_archived_and_still_deduplicated(tmp_path):
+    ancient, old, recent = (
+        _make_listing(title=t, url=f"https://example.com/{t}") for t in ("ancient", "old", "recent")
+    )
+    path = tmp_path / "seen.json"
+    path.write_text(json.dumps({
+        "2025-01-10": {"craigslist": [ancient.dedup_key()]},
+        "2026-01-10": {"craigslist": [old.dedup_key()]},
+        "2026-02-25": {"craigslist": [recent.dedup_key()]},
+    }))
+    d = Deduplicator(str(path), retention={}, default_retention=30, archive_days=365)
+    d.cleanup(today=date(2026, 3, 1))
+    assert list(json.loads(path.read_text())) == ["2026-02-25"]
+
+    archive = tmp_path / "seen_archive"
+    # 2025-01 is past archive_days, so its month is compacted and dropped
+    assert sorted(p.name for p in archive.iterdir()) == ["2026-01.json.gz"]
+    assert d.is_seen(old.dedup_key())
+    fresh = Deduplicator(str(path), retention={}, default_retention=30)
+    assert fresh.deduplicate([ancient, old, recent]) == [ancient]
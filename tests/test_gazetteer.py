@@ -0,0 +1,56 @@
+# tests/test_gazetteer.py
+import pytest
+
+from gazetteer import Gazetteer, Place, default_gazetteer, distance_km
+
+
+@pytest.fixture
+def gazetteer():
+    return default_gazetteer()
+
+
+def test_normalizes_aliases_to_canonical_place(gazetteer):
+    assert gazetteer.lookup("LA").name == "Los Angeles, CA"
+    assert gazetteer.lookup("shooting in l.a. next week").name == "Los Angeles, CA"
+    assert gazetteer.lookup("NoHo").name == "North Hollywood, CA"
+    assert gazetteer.lookup("NYC").name == "New York, NY"
+
+
+def test_most_specific_name_wins(gazetteer):
+    assert gazetteer.lookup("Studio City, Los Angeles").name == "Studio City, CA"
+    assert gazetteer.lookup("Manhattan Beach").name == "Manhattan Beach, CA"
+    assert gazetteer.lookup("Manhattan").name == "Manhattan, NY"
+    assert gazetteer.lookup("Los Angeles 30309").name == "Atlanta, GA"  # ZIP beats names
+
+
+def test_postal_codes(gazetteer):
+    assert gazetteer.lookup("90028").name == "Los Angeles, CA"
+    assert gazetteer.lookup("Suite 4, 10001-1234").name == "New York, NY"
+    assert gazetteer.lookup("V6B 1A1").name == "Vancouver, BC"
+    assert gazetteer.lookup("$90000 budget") is None
+    assert gazetteer.lookup("60601") is None  # Chicago isn't covered
+
+
+def test_whole_words_only(gazetteer):
+    assert gazetteer.lookup("Atlanta").name == "Atlanta, GA"  # not "la"
+    assert gazetteer.lookup("playback singer") is None
+    assert gazetteer.lookup("") is None
+
+
+def test_every_row_loads(gazetteer):
+    assert len(gazetteer) > 50
+    for name, names in gazetteer.terms():
+        assert all(gazetteer.lookup(n).name == name for n in names)
+
+
+def test_distance():
+    la = Place("Los Angeles, CA", 34.0522, -118.2437)
+    nyc = Place("New York, NY", 40.7128, -74.0060)
+    assert distance_km(la, nyc) == pytest.approx(3936, rel=0.01)
+    assert distance_km(la, la) == 0
+
+
+def test_small_custom_gazetteer():
+    g = Gazetteer([("springfield", "Springfield, IL", "city", "39.78", "-89.65")])
+    assert g.lookup("Springfield").lat == 39.78
+    assert g.place("Springfield, IL") is not None
@@ -1,9 +1,35 @@
 # tests/test_main.py
-from datetime import date
+import subprocess
+import sys
+from datetime import date, datetime
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+import pytest
+
+import main
+from mailer.formatter import Digest
 from main import run
+from metrics import SourceRun
 from models import CastingListing
+from scrapers.parse_pool import PageStats
+
+
+def _deliver_all(subject, html, api_key, recipients, *args, **kwargs):
+    return {email: True for email in recipients}
+
+
+def _deliver_none(subject, html, api_key, recipients, *args, **kwargs):
+    return {email: False for email in recipients}
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path):
+    with patch("main.OUTBOX_PATH", str(tmp_path / "outbox.json")), \
+         patch("main.LISTINGS_DB_PATH", str(tmp_path / "listings.db")), \
+         patch("main.METRICS_DB_PATH", str(tmp_path / "metrics.db")), \
+         patch("main.BROKEN_PAGES_DIR", str(tmp_path / "broken_pages")):
+        yield
 
 
 def _make_listing(title="Test", url="https://example.com/1") -> CastingListing:
@@ -15,11 +41,12 @@ def _make_listing(title="Test", url="https://example.com/1") -> CastingListing:
     )
 
 
-@patch("main.send_email", return_value=True)
+@patch("main.get_circuit_breaker", return_value=None)
+@patch("main.send_batch", side_effect=_deliver_all)
 @patch("main.Deduplicator")
 @patch("main.KeywordFilter")
 @patch("main.get_scrapers")
-def test_run_orchestrates_scrape_filter_email(mock_scrapers, mock_filter_cls, mock_dedup_cls, mock_send):
+def test_run_orchestrates_scrape_filter_email(mock_scrapers, mock_filter_cls, mock_dedup_cls, mock_send, _mock_breaker):
     # Setup mock scraper
     scraper = MagicMock()
     scraper.source_name = "test"
@@ -36,18 +63,19 @@ def test_run_orchestrates_scrape_filter_email(mock_scrapers, mock_filter_cls, mo
     mock_dedup.deduplicate.side_effect = lambda x: x
     mock_dedup_cls.return_value = mock_dedup
 
-    with patch("main.SENDGRID_API_KEY", "fake"), patch("main.RECIPIENT_EMAIL", "test@test.com"):
+    with patch("main.SENDGRID_API_KEY", "fake"), patch("main.RECIPIENT_EMAILS", ["test@test.com"]):
         run()
 
     mock_send.assert_called_once()
     mock_dedup.mark_seen.assert_called_once()
 
 
-@patch("main.send_email", return_value=True)
+@patch("main.get_circuit_breaker", return_value=None)
+@patch("main.send_batch", side_effect=_deliver_all)
 @patch("main.Deduplicator")
 @patch("main.KeywordFilter")
 @patch("main.get_scrapers")
-def test_run_handles_scraper_failure(mock_scrapers, mock_filter_cls, mock_dedup_cls, mock_send):
+def test_run_handles_scraper_failure(mock_scrapers, mock_filter_cls, mock_dedup_cls, mock_send, _mock_breaker):
     failing_scraper = MagicMock()
     failing_scraper.source_name = "broken"
     failing_scraper.scrape.side_effect = Exception("boom")
@@ -60,8 +88,238 @@ def test_run_handles_scraper_failure(mock_scrapers, mock_filter_cls, mock_dedup_
     mock_filter_cls.return_value.filter.side_effect = lambda x: x
     mock_dedup_cls.return_value.deduplicate.side_effect = lambda x: x
 
-    with patch("main.SENDGRID_API_KEY", "fake"), patch("main.RECIPIENT_EMAIL", "test@test.com"):
+    with patch("main.SENDGRID_API_KEY", "fake"), patch("main.RECIPIENT_EMAILS", ["test@test.com"]):
         run()
 
     # Email still sent despite one scraper failing
     mock_send.assert_called_once()
+
+
+def test_import_main_does_not_load_heavy_dependencies():
+    """sendgrid, bs4, playwright, requests, the parse pool and the plugin scan
+    load only in the stage that needs them."""
+    heavy = ("sendgrid", "bs4", "playwright", "requests", "multiprocessing", "importlib.metadata",
+             "statistics")
+    code = f"import sys, main; print(','.join(m for m in {heavy!r} if m in sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent, capture_output=True, text=True, check=True,
+    )
+    assert proc.stdout.strip() == ""
+
+
+@patch("main.get_circuit_breaker")
+@patch("main.send_batch", side_effect=_deliver_all)
+@patch("main.Deduplicator")
+@patch("main.KeywordFilter")
+@patch("main.get_scrapers")
+def test_run_skips_source_with_open_circuit(mock_scrapers, mock_filter_cls, mock_dedup_cls, mock_send, mock_breaker):
+    blocked = MagicMock()
+    blocked.source_name = "blocked"
+    working = MagicMock()
+    working.source_name = "good"
+    working.scrape.return_value = [_make_listing()]
+    mock_scrapers.return_value = [blocked, working]
+    mock_filter_cls.return_value.filter.side_effect = lambda x: x
+    mock_dedup_cls.return_value.deduplicate.side_effect = lambda x: x
+    breaker = mock_breaker.return_value
+    breaker.allow.side_effect = lambda name: name != "blocked"
+    breaker.retry_at.return_value = datetime(2026, 3, 1, 12, 0)
+
+    with patch("main.SENDGRID_API_KEY", "fake"), patch("main.RECIPIENT_EMAILS", ["test@test.com"]), \
+         patch("main.render_digest", return_value=Digest("s", "h", "t")) as mock_format:
+        run()
+
+    blocked.scrape.assert_not_called()
+    breaker.record_success.assert_called_once_with("good")
+    assert mock_format.call_args.args[1] == ["blocked"]
+
+
+@patch("main.get_circuit_breaker", return_value=None)
+@patch("main.send_batch", side_effect=_deliver_none)
+@patch("main.Deduplicator")
+@patch("main.KeywordFilter")
+@patch("main.get_scrapers")
+def test_failed_send_is_queued_and_retried_next_run(mock_scrapers, mock_filter_cls, mock_dedup_cls, mock_send, _mock_breaker):
+    scraper = MagicMock()
+    scraper.source_name = "test"
+    scraper.scrape.return_value = [_make_listing()]
+    mock_scrapers.return_value = [scraper]
+    mock_filter_cls.return_value.filter.side_effect = lambda x: x
+    mock_dedup_cls.return_value.deduplicate.side_effect = lambda x: x
+
+    with patch("main.SENDGRID_API_KEY", "fake"), patch("main.RECIPIENT_EMAILS", ["test@test.com"]):
+        run()
+        # Queued digest counts as delivered: listings are marked seen, run does not block
+        mock_dedup_cls.return_value.mark_seen.assert_called_once()
+        assert mock_send.call_count == 1
+
+        # Next run retries the queued digest once it is due
+        outbox = main.get_outbox()
+        [entry] = outbox.entries
+        assert entry.status == "pending" and entry.attempts == 1
+        mock_send.side_effect = _deliver_all
+        outbox.drain(main._send_entries, now=datetime(2100, 1, 1))
+        assert outbox.entries[0].status == "sent"
+
+
+@patch("main.get_circuit_breaker", return_value=None)
+@patch("main.send_batch", side_effect=_deliver_all)
+@patch("main.Deduplicator")
+@patch("main.get_scrapers")
+def test_run_archives_every_scraped_listing(mock_scrapers, mock_dedup_cls, mock_send, _mock_breaker, capsys):
+    scraper = MagicMock()
+    scraper.source_name = "test"
+    # The second listing fails the location filter but is still archived
+    scraper.scrape.return_value = [
+        _make_listing(title="Improv commercial", url="https://example.com/1"),
+        _make_listing(title="NYC role", url="https://example.com/2"),
+    ]
+    scraper.scrape.return_value[1].location = "New York, NY"
+    mock_scrapers.return_value = [scraper]
+    mock_dedup_cls.return_value.deduplicate.side_effect = lambda x: x
+
+    run()
+    capsys.readouterr()
+
+    main.main(["query", "--text", "improv", "--days", "1"])
+    out = capsys.readouterr().out
+    assert "Improv commercial" in out
+    assert "1 listing(s)" in out
+    assert main.get_listing_store().count() == 2
+
+
+@patch("main.get_circuit_breaker", return_value=None)
+@patch("main.send_batch", side_effect=_deliver_all)
+@patch("main.Deduplicator")
+@patch("main.KeywordFilter")
+@patch("main.get_scrapers")
+@patch("main.get_alert_dispatcher")
+def test_run_alerts_each_source_before_the_digest(mock_alerts, mock_scrapers, mock_filter_cls, mock_dedup_cls,
+                                                  mock_send, _mock_breaker):
+    listing = _make_listing()
+    scraper = MagicMock()
+    scraper.source_name = "test"
+    scraper.scrape.return_value = [listing]
+    mock_scrapers.return_value = [scraper]
+    mock_filter_cls.return_value.filter.side_effect = lambda x: x
+    mock_dedup_cls.return_value.is_seen.return_value = False
+    mock_dedup_cls.return_value.deduplicate.side_effect = lambda x: x
+
+    with patch("main.SENDGRID_API_KEY", "fake"), patch("main.RECIPIENT_EMAILS", ["test@test.com"]):
+        run()
+
+    mock_alerts.return_value.submit.assert_called_once_with([listing])
+    mock_alerts.return_value.close.assert_called_once()
+    mock_send.assert_called_once()
+    mock_dedup_cls.return_value.mark_seen.assert_called_once_with([listing])
+
+
+@patch("main.get_circuit_breaker", return_value=None)
+@patch("main.send_batch", side_effect=_deliver_all)
+@patch("main.Deduplicator")
+@patch("main.KeywordFilter")
+@patch("main.get_scrapers")
+def test_run_records_per_source_metrics(mock_scrapers, mock_filter_cls, mock_dedup_cls, mock_send, _mock_breaker):
+    good = MagicMock(source_name="test", fetched_bytes=1234)
+    good.scrape.return_value = [_make_listing(), _make_listing(title="Other", url="https://example.com/2")]
+    broken = MagicMock(source_name="broken")
+    broken.scrape.side_effect = TimeoutError("slow")
+    mock_scrapers.return_value = [good, broken]
+    mock_filter_cls.return_value.filter.side_effect = lambda x: x[:1]
+    mock_dedup_cls.return_value.deduplicate.side_effect = lambda x: x
+
+    with patch("main.SENDGRID_API_KEY", "fake"), patch("main.RECIPIENT_EMAILS", ["test@test.com"]):
+        run()
+
+    store = main.get_metrics_store()
+    rows = {s.source: s for s in store.summary(datetime(2000, 1, 1))}
+    store.close()
+    assert (rows["test"].bytes, rows["test"].parsed, rows["test"].passed, rows["test"].new) == (1234, 2, 1, 1)
+    assert rows["broken"].failures == 1 and rows["broken"].last_error == "TimeoutError"
+
+
+@patch("main.get_circuit_breaker", return_value=None)
+@patch("main.deliver_digest", side_effect=OSError("disk full"))
+@patch("main.Deduplicator")
+@patch("main.KeywordFilter")
+@patch("main.get_scrapers")
+def test_run_records_metrics_when_delivery_raises(mock_scrapers, mock_filter_cls, mock_dedup_cls,
+                                                  _mock_deliver, _mock_breaker):
+    scraper = MagicMock(source_name="test", fetched_bytes=10)
+    scraper.scrape.return_value = [_make_listing()]
+    mock_scrapers.return_value = [scraper]
+    mock_filter_cls.return_value.filter.side_effect = lambda x: x
+    mock_dedup_cls.return_value.deduplicate.side_effect = lambda x: x
+
+    with pytest.raises(OSError):
+        run()
+
+    store = main.get_metrics_store()
+    rows = {s.source: s for s in store.summary(datetime(2000, 1, 1))}
+    store.close()
+    assert (rows["test"].parsed, rows["test"].new) == (1, 1)
+    mock_dedup_cls.return_value.mark_seen.assert_not_called()
+
+
+@patch("main.get_circuit_breaker", return_value=None)
+@patch("main.send_batch", side_effect=_deliver_all)
+@patch("main.Deduplicator")
+@patch("main.KeywordFilter")
+@patch("main.get_scrapers")
+def test_run_reports_source_whose_parser_looks_broken(mock_scrapers, mock_filter_cls, mock_dedup_cls,
+                                                      mock_send, _mock_breaker, tmp_path):
+    store = main.get_metrics_store()
+    for name in ("broken", "quiet"):
+        store.record([SourceRun(f"2026-03-01T0{hour}:00:00", name, candidates=20, missing="{}")
+                      for hour in range(3)])
+    store.close()
+    broken = MagicMock(source_name="broken", fetched_bytes=100, reports_structure=True,
+                       last_pages=[("<html>redesign</html>", PageStats(1, {}))])
+    broken.scrape.return_value = [_make_listing(title="Garbled", url="https://example.com/garbled")]
+    # Only sources that count selector matches are judged
+    quiet = MagicMock(source_name="quiet", fetched_bytes=100, reports_structure=False,
+                      last_pages=[("<html></html>", PageStats(1, {}))])
+    quiet.scrape.return_value = [_make_listing()]
+    mock_scrapers.return_value = [broken, quiet]
+    mock_filter_cls.return_value.filter.side_effect = lambda x: x
+    mock_dedup_cls.return_value.deduplicate.side_effect = lambda x: x
+
+    with patch("main.SENDGRID_API_KEY", "fake"), patch("main.RECIPIENT_EMAILS", ["test@test.com"]), \
+         patch("main.render_digest", return_value=Digest("s", "h", "t")) as mock_format:
+        run()
+
+    listings, failed = mock_format.call_args.args[:2]
+    assert sorted(l.title for l in listings) == ["Garbled", "Test"]
+    assert failed == ["broken"]
+    assert len(list((tmp_path / "broken_pages").iterdir())) == 1
+    store = main.get_metrics_store()
+    assert [stats for stats, broken in store.parse_history("broken", 1)] == [PageStats(1, {})]
+    assert {s.source: s.last_error for s in store.summary(datetime(2000, 1, 1))}["broken"] == "SelectorBreakage"
+    store.close()
+
+
+@patch("main.get_circuit_breaker", return_value=None)
+@patch("main.KeywordFilter")
+@patch("main.get_scrapers")
+def test_listings_past_the_digest_cutoff_go_out_next_run(mock_scrapers, mock_filter_cls, _mock_breaker,
+                                                         tmp_path, capsys):
+    from dedup import Deduplicator
+
+    listings = [_make_listing(title=f"Lead {i}", url=f"https://example.com/{i}") for i in range(3)]
+    scraper = MagicMock()
+    scraper.source_name = "test"
+    scraper.scrape.return_value = listings
+    mock_scrapers.return_value = [scraper]
+    mock_filter_cls.return_value.filter.side_effect = lambda x: x
+
+    with patch("main.Deduplicator", side_effect=lambda _: Deduplicator(str(tmp_path / "seen.json"))), \
+         patch("mailer.formatter.DIGEST_TOP_K", 2):
+        run()
+        first = capsys.readouterr().out
+        assert "+ 1 more not shown" in first
+        run()
+        second = capsys.readouterr().out
+    # The one left out is the only new listing the second time
+    [left_out] = [l.title for l in listings if l.title not in first.split("not shown")[0]]
+    assert f"1. {left_out}" in second and "1 New Opportunity" in second
@@ -0,0 +1,78 @@
+# tests/test_markets.py
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+import markets
+from markets import LocationRouter, Market, active_markets, all_markets, parse_markets
+from models import CastingListing
+
+
+def _listing(location="", url="https://www.backstage.com/casting/1") -> CastingListing:
+    return CastingListing(
+        title="Test", source="test", url=url, posted_date=date.today(), location=location,
+        union_status="non-union", role_type="principal", description="", how_to_apply="",
+    )
+
+
+@pytest.fixture
+def router():
+    return LocationRouter(list(all_markets().values()))
+
+
+def test_routes_by_whole_place_names(router):
+    assert router.route(_listing("Burbank, CA")) == ["la"]
+    assert router.route(_listing("(Studio City)")) == ["la"]
+    assert router.route(_listing("Brooklyn, NY")) == ["nyc"]
+    # "la" inside "atlanta" is not LA; "manhattan beach" is not Manhattan
+    assert router.route(_listing("Atlanta, GA")) == ["atlanta"]
+    assert router.route(_listing("Manhattan Beach")) == ["la"]
+    assert router.route(_listing("Chicago, IL")) == []
+
+
+def test_routes_by_radius_around_the_market_city(router):
+    assert router.route(_listing("Malibu")) == ["la"]  # ~40 km from downtown
+    assert router.route(_listing("Beverly Hills, CA 90210")) == ["la"]
+    assert router.route(_listing("Hoboken, NJ")) == ["nyc"]
+    narrow = Market("la", "Los Angeles, CA", 25, (), (), ())
+    assert LocationRouter([narrow]).route(_listing("Malibu")) == []
+    assert LocationRouter([narrow]).route(_listing("Culver City")) == ["la"]
+
+
+def test_market_sources_route_by_url_whatever_the_location(router):
+    assert router.route(_listing("", "https://atlanta.craigslist.org/atl/tlg/d/1.html")) == ["atlanta"]
+    assert router.route(_listing("Los Angeles", "https://vancouver.craigslist.org/x")) == ["vancouver"]
+    assert router.route(_listing("", "https://www.facebook.com/groups/actorsinla/posts/9")) == ["la"]
+
+
+def test_split_only_covers_given_markets():
+    la_only = LocationRouter([all_markets()["la"]])
+    listings = [_listing("Hollywood"), _listing("Atlanta, GA"), _listing("LA")]
+    assert la_only.split(listings) == {"la": [listings[0], listings[2]]}
+
+
+def test_each_market_has_its_own_seen_file():
+    paths = {m.seen_path for m in all_markets().values()}
+    assert len(paths) == len(all_markets())
+    assert all_markets()["la"].seen_path == "data/seen_listings.json"
+    assert all_markets()["nyc"].seen_path == "data/seen_listings_nyc.json"
+
+
+def test_config_errors_are_reported():
+    with pytest.raises(ValueError, match="not in the gazetteer"):
+        LocationRouter([Market("sf", "San Francisco, CA", 50, (), (), ())])
+    with pytest.raises(ValueError, match="missing"):
+        parse_markets({"sf": {"city": "San Francisco, CA"}})
+    with patch.object(markets, "ACTIVE_MARKETS", ["la", "chicago"]):
+        with pytest.raises(ValueError, match="chicago"):
+            active_markets()
+
+
+def test_market_url_prefixes():
+    market = Market("x", "X, XX", 50, ("xcity",), ("xactors",), ("https://www.facebook.com/groups/x/",))
+    assert market.url_prefixes == [
+        "https://xcity.craigslist.org/",
+        "https://www.reddit.com/r/xactors/",
+        "https://www.facebook.com/groups/x/",
+    ]
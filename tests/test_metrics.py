@@ -0,0 +1,85 @@
+from datetime import date, datetime, timedelta
+
+from metrics import MetricsStore, RunMetrics, SourceRun, YieldDrop
+from models import CastingListing
+
+NOW = datetime(2026, 3, 15, 12, 0)
+
+
+def _make_listing(title="Test", source="craigslist") -> CastingListing:
+    return CastingListing(
+        title=title, source=source, url=f"https://example.com/{title}",
+        posted_date=date(2026, 3, 15), location="Los Angeles, CA",
+        union_status="non-union", role_type="principal",
+        description="Test", how_to_apply="Apply",
+    )
+
+
+def _run(source, hours_ago, parsed=10, error=None, **kw) -> SourceRun:
+    started = (NOW - timedelta(hours=hours_ago)).isoformat(timespec="seconds")
+    return SourceRun(started, source, parsed=parsed, error=error, **kw)
+
+
+def test_run_metrics_count_each_stage_per_source():
+    metrics = RunMetrics()
+    metrics.begin("craigslist", NOW).parsed = 3
+    metrics.begin("reddit", NOW).parsed = 1
+    a, b, c = _make_listing("a"), _make_listing("b"), _make_listing("c", source="reddit")
+    metrics.count_passed([a, b, c])
+    metrics.count_new([a, c])
+    metrics.count_new([a])  # also new in a second market
+    craigslist, reddit = metrics.take()
+    assert (craigslist.parsed, craigslist.passed, craigslist.new) == (3, 2, 1)
+    assert (reddit.parsed, reddit.passed, reddit.new) == (1, 1, 1)
+    assert metrics.take() == []
+
+
+def test_summary_and_daily_history(tmp_path):
+    store = MetricsStore(str(tmp_path / "metrics.db"))
+    store.record([_run("craigslist", 30, parsed=10, duration=2.0, bytes=2048, new=4)])
+    store.record([
+        _run("craigslist", 2, parsed=20, duration=4.0, bytes=4096, new=6),
+        _run("reddit", 2, parsed=0, duration=1.0, error="HTTPError"),
+    ])
+    [craigslist, reddit] = store.summary(NOW - timedelta(days=7))
+    assert craigslist.runs == 2 and craigslist.failures == 0
+    assert (craigslist.duration, craigslist.bytes, craigslist.parsed, craigslist.new) == (3.0, 3072.0, 15.0, 10)
+    assert reddit.failures == 1 and reddit.last_error == "HTTPError"
+
+    days = store.daily("craigslist", NOW - timedelta(days=7))
+    assert [(d.day, d.parsed, d.new) for d in days] == [("2026-03-14", 10.0, 4), ("2026-03-15", 20.0, 6)]
+
+
+def test_yield_drop_is_detected(tmp_path):
+    store = MetricsStore(str(tmp_path / "metrics.db"))
+    store.record([_run("backstage", 100 - i, parsed=40) for i in range(10)])
+    store.record([_run("backstage", 3 - i, parsed=2) for i in range(3)])
+    store.record([_run("craigslist", 100 - i, parsed=30) for i in range(13)])
+    store.record([_run("reddit", 100 - i, parsed=2) for i in range(10)])  # too sparse to judge
+    store.record([_run("reddit", 3 - i, parsed=0) for i in range(3)])
+    assert store.yield_drops(NOW) == [YieldDrop("backstage", 2.0, 40.0)]
+
+
+def test_failed_runs_do_not_count_as_a_yield_drop(tmp_path):
+    store = MetricsStore(str(tmp_path / "metrics.db"))
+    store.record([_run("backstage", 100 - i, parsed=40) for i in range(10)])
+    store.record([_run("backstage", 3 - i, parsed=0, error="TimeoutError") for i in range(3)])
+    assert store.yield_drops(NOW) == []
+
+
+def test_database_without_parse_stats_columns_is_upgraded(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "metrics.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE source_runs (started_at TEXT NOT NULL, source TEXT NOT NULL, duration REAL NOT NULL, "
+                 "bytes INTEGER NOT NULL, parsed INTEGER NOT NULL, passed INTEGER NOT NULL, new INTEGER NOT NULL, "
+                 "error TEXT)")
+    conn.execute("INSERT INTO source_runs VALUES ('2026-03-01T08:00:00', 'backstage', 1.0, 10, 5, 5, 5, NULL)")
+    conn.commit()
+    conn.close()
+
+    store = MetricsStore(path)
+    store.record([SourceRun("2026-03-02T08:00:00", "backstage", parsed=5, candidates=7, missing='{"union": 7}')])
+    assert [(s.candidates, s.missing) for s, _ in store.parse_history("backstage", 10)] == [(7, {"union": 7})]
+    store.close()
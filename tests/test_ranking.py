@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+
+import pytest
+
+from models import CastingListing, CareerCategory
+from ranking import FEATURES, Ranker
+
+TODAY = date(2026, 3, 1)
+
+
+def _make_listing(title="Role", role_type="principal", **kw) -> CastingListing:
+    defaults = {
+        "title": title,
+        "source": "craigslist",
+        "url": f"https://example.com/{title}",
+        "posted_date": TODAY,
+        "location": "Los Angeles, CA",
+        "union_status": "non-union",
+        "role_type": role_type,
+        "description": "",
+        "how_to_apply": "Apply",
+    }
+    defaults.update(kw)
+    return CastingListing(**defaults)
+
+
+def _features(ranker, listing):
+    return dict(zip(FEATURES, ranker.features([listing], [listing.categorize()], TODAY)))
+
+
+def test_features_are_scaled_to_unit_range():
+    ranker = Ranker({}, {"backstage": 0.9})
+    features = _features(ranker, _make_listing(
+        source="backstage", compensation="$2,000 flat", deadline=TODAY,
+        school_or_production="USC",
+    ))
+    assert features == {
+        "category": 0.8,  # STUDENT_FILM: the school wins over role_type
+        "pay": 1.0,
+        "deadline": 1.0,
+        "source": 0.9,
+        "school": 1.0,
+        "freshness": 1.0,
+    }
+
+
+@pytest.mark.parametrize("compensation, expected", [
+    (None, 0.4),
+    ("Unpaid", 0.0),
+    ("Deferred pay", 0.3),
+    ("Paid", 0.7),
+    ("$100/day", 0.775),
+])
+def test_pay_feature(compensation, expected):
+    assert _features(Ranker({}), _make_listing(compensation=compensation))["pay"] == pytest.approx(expected)
+
+
+def test_deadline_and_freshness_decay():
+    ranker = Ranker({})
+    soon = _features(ranker, _make_listing(deadline=TODAY + timedelta(days=1)))
+    later = _features(ranker, _make_listing(deadline=TODAY + timedelta(days=14)))
+    passed = _features(ranker, _make_listing(deadline=TODAY - timedelta(days=1)))
+    assert soon["deadline"] > later["deadline"] > passed["deadline"] == 0.0
+
+    old = _features(ranker, _make_listing(posted_date=TODAY - timedelta(days=2)))
+    assert old["freshness"] == pytest.approx(0.5)  # FRESHNESS_HOURS = 48
+
+
+def test_unknown_weight_is_rejected():
+    with pytest.raises(ValueError, match="popularity"):
+        Ranker({"popularity": 1.0})
+
+
+def test_top_k_keeps_best_per_category():
+    ranker = Ranker({"pay": 1.0})
+    listings = [
+        _make_listing("unpaid", compensation="Unpaid"),
+        _make_listing("paid", compensation="$500"),
+        _make_listing("unknown"),
+        _make_listing("extra", role_type="background"),
+    ]
+    top = ranker.top_k(listings, 2, today=TODAY)
+    assert [l.title for l in top[CareerCategory.PRINCIPAL]] == ["paid", "unknown"]
+    assert [l.title for l in top[CareerCategory.BACKGROUND]] == ["extra"]
+
+
+def test_top_k_ties_keep_input_order():
+    listings = [_make_listing(str(i)) for i in range(5)]
+    top = Ranker({"pay": 1.0}).top_k(listings, 3, today=TODAY)
+    assert [l.title for l in top[CareerCategory.PRINCIPAL]] == ["0", "1", "2"]
@@ -0,0 +1,96 @@
+import json
+from datetime import date
+
+import pytest
+
+from models import CastingListing, CareerCategory
+from rules import RuleEngine, categorize_all, load_engine, parse_rules
+
+
+def _make_listing(title="Role", role_type="other", description="", **kw) -> CastingListing:
+    defaults = {
+        "title": title,
+        "source": "craigslist",
+        "url": "https://example.com/1",
+        "posted_date": date(2026, 3, 1),
+        "location": "Los Angeles, CA",
+        "union_status": "",
+        "role_type": role_type,
+        "description": description,
+        "how_to_apply": "Apply",
+    }
+    defaults.update(kw)
+    return CastingListing(**defaults)
+
+
+@pytest.mark.parametrize("listing, expected", [
+    (_make_listing(school_or_production="UCLA"), CareerCategory.STUDENT_FILM),
+    (_make_listing(title="Chapman thesis", role_type="principal"), CareerCategory.STUDENT_FILM),
+    (_make_listing(role_type="Lead"), CareerCategory.PRINCIPAL),
+    (_make_listing(role_type="supporting", description="commercial shoot"), CareerCategory.PRINCIPAL),
+    (_make_listing(description="National commercial"), CareerCategory.COMMERCIAL),
+    (_make_listing(role_type="commercial"), CareerCategory.COMMERCIAL),
+    (_make_listing(role_type="extras"), CareerCategory.BACKGROUND),
+    (_make_listing(role_type="background", description="commercial"), CareerCategory.COMMERCIAL),
+    (_make_listing(title="Acting workshop"), CareerCategory.OPEN_CALL),
+    (_make_listing(role_type="open call"), CareerCategory.OPEN_CALL),
+    (_make_listing(title="Indie short"), CareerCategory.SHORT_INDIE),
+])
+def test_default_rules_match_original_categories(listing, expected):
+    assert listing.categorize() == expected
+
+
+def test_earliest_rule_wins_regardless_of_text_order():
+    # "workshop" appears before "usc" in the text, but the schools rule comes first
+    listing = _make_listing(title="Workshop for the USC short")
+    assert listing.categorize() == CareerCategory.STUDENT_FILM
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Muscle car music video", CareerCategory.SHORT_INDIE),  # "usc"
+    ("Workshops in focus", CareerCategory.SHORT_INDIE),  # "workshop"
+    ("Commercial, USC-adjacent", CareerCategory.STUDENT_FILM),
+    ("Acting workshop!", CareerCategory.OPEN_CALL),
+])
+def test_keywords_match_whole_words_only(title, expected):
+    assert _make_listing(title=title).categorize() == expected
+
+
+def test_overlapping_keywords_from_different_rules():
+    engine = RuleEngine(
+        parse_rules([
+            {"category": "PRINCIPAL", "keywords": ["call back"]},
+            {"category": "OPEN_CALL", "keywords": ["open call"]},
+        ]),
+        default=CareerCategory.SHORT_INDIE,
+        schools=set(),
+    )
+    # "open call back" — both keywords overlap on "call"; the earlier rule still matches
+    assert engine.categorize(_make_listing(title="open call back")) == CareerCategory.PRINCIPAL
+
+
+def test_batch_api_matches_single():
+    listings = [
+        _make_listing(role_type="lead"),
+        _make_listing(description="commercial"),
+        _make_listing(),
+    ]
+    assert categorize_all(listings) == [l.categorize() for l in listings]
+
+
+def test_rules_loaded_from_json_file(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({
+        "rules": [{"category": "background", "keywords": ["stand-in"]}],
+        "default": "open_call",
+    }))
+    engine = load_engine(str(path))
+    assert engine.categorize(_make_listing(title="Stand-in needed")) == CareerCategory.BACKGROUND
+    assert engine.categorize(_make_listing(role_type="lead")) == CareerCategory.OPEN_CALL
+
+
+def test_invalid_rules_rejected():
+    with pytest.raises(ValueError, match="unknown category"):
+        parse_rules([{"category": "STAR"}])
+    with pytest.raises(ValueError, match="unknown keys"):
+        parse_rules([{"category": "PRINCIPAL", "keyword": ["x"]}])
@@ -0,0 +1,216 @@
+from datetime import date
+from unittest.mock import MagicMock
+
+from main import scrape_source
+from metrics import RunMetrics
+from scheduler import Daemon
+from models import CastingListing
+
+
+def _make_listing(title="Test", url="https://example.com/1") -> CastingListing:
+    return CastingListing(
+        title=title, source="test", url=url,
+        posted_date=date.today(), location="Los Angeles, CA",
+        union_status="non-union", role_type="principal",
+        description="Test", how_to_apply="Apply",
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _scraper(name, listings=None, error=None):
+    scraper = MagicMock()
+    scraper.source_name = name
+    if error:
+        scraper.scrape.side_effect = error
+    else:
+        scraper.scrape.return_value = listings or []
+    return scraper
+
+
+def _deliver_all():
+    """A deliver stub whose digest shows every listing."""
+    return MagicMock(side_effect=lambda listings, *_: listings)
+
+
+def _daemon(scrapers, deliver=None, intervals=None, digest_interval=100.0, order=None,
+            dedup=None, route=None, alert=None, metrics=None, flagged=None):
+    clock = FakeClock()
+    if dedup is None:
+        dedup = MagicMock()
+        dedup.deduplicate.side_effect = lambda x: x
+    keyword_filter = MagicMock()
+    keyword_filter.filter.side_effect = lambda x: x
+    daemon = Daemon(
+        scrapers=scrapers,
+        dedup=dedup,
+        keyword_filter=keyword_filter,
+        deliver=deliver or _deliver_all(),
+        scrape=scrape_source,
+        intervals=intervals or {s.source_name: 10.0 for s in scrapers},
+        digest_interval=digest_interval,
+        order=order,
+        route=route,
+        alert=alert,
+        metrics=metrics,
+        flagged=flagged,
+        clock=clock,
+    )
+    return daemon, clock, dedup
+
+
+def test_polls_each_source_on_its_own_interval():
+    fast = _scraper("fast")
+    slow = _scraper("slow")
+    daemon, clock, _ = _daemon([fast, slow], intervals={"fast": 5.0, "slow": 30.0})
+
+    for t in range(0, 31, 5):
+        clock.now = float(t)
+        daemon.tick()
+
+    assert fast.scrape.call_count == 7  # t=0,5,...,30
+    assert slow.scrape.call_count == 2  # t=0,30
+
+
+def test_tick_returns_time_until_next_event():
+    daemon, clock, _ = _daemon([_scraper("a")], intervals={"a": 10.0}, digest_interval=100.0)
+    assert daemon.tick() == 10.0
+    clock.now = 4.0
+    assert daemon.tick() == 6.0
+
+
+def test_pending_listings_batched_into_one_digest():
+    listing = _make_listing()
+    scraper = _scraper("a", [listing])
+    deliver = _deliver_all()
+    daemon, clock, dedup = _daemon([scraper], deliver=deliver, intervals={"a": 10.0})
+
+    for t in range(0, 100, 10):
+        clock.now = float(t)
+        daemon.tick()
+    # The same listing seen on every poll is only pending once
+    assert len(daemon.pending) == 1
+    deliver.assert_not_called()
+
+    clock.now = 100.0
+    daemon.tick()
+    deliver.assert_called_once_with([listing], [], None)
+    dedup.mark_seen.assert_called_once_with([listing])
+    assert daemon.pending == []
+
+
+def test_failed_delivery_keeps_listings_pending():
+    scraper = _scraper("a", [_make_listing()])
+    daemon, clock, dedup = _daemon([scraper], deliver=MagicMock(return_value=None))
+    daemon.tick()
+    clock.now = 100.0
+    daemon.tick()
+    dedup.mark_seen.assert_not_called()
+    assert len(daemon.pending) == 1
+
+
+def test_listings_the_digest_had_no_room_for_stay_pending():
+    first, second = _make_listing("A", "https://example.com/a"), _make_listing("B", "https://example.com/b")
+    deliver = MagicMock(side_effect=lambda listings, *_: listings[:1])
+    daemon, clock, dedup = _daemon([_scraper("a", [first, second])], deliver=deliver)
+    daemon.tick()
+    clock.now = 100.0
+    daemon.tick()
+    dedup.mark_seen.assert_called_once_with([first])
+    assert daemon.pending == [second]
+    clock.now = 200.0
+    daemon.tick()
+    assert second in deliver.call_args_list[-1].args[0]
+
+
+def test_failed_source_reported_in_digest():
+    deliver = _deliver_all()
+    daemon, clock, _ = _daemon([_scraper("broken", error=Exception("boom"))], deliver=deliver)
+    daemon.tick()
+    clock.now = 100.0
+    daemon.tick()
+    deliver.assert_called_once_with([], ["broken"], None)
+
+
+def test_flagged_source_is_reported_but_its_listings_still_go_out():
+    listing = _make_listing()
+    deliver = _deliver_all()
+    daemon, clock, _ = _daemon([_scraper("shaky", [listing])], deliver=deliver,
+                               flagged={"shaky": "matched 0 candidates"}.get)
+    daemon.tick()
+    clock.now = 100.0
+    daemon.tick()
+    deliver.assert_called_once_with([listing], ["shaky"], None)
+
+
+def test_stop_flushes_seen_state():
+    daemon, _, dedup = _daemon([_scraper("a")])
+    daemon.stop()
+    daemon.run_forever()
+    dedup.flush.assert_called_once()
+
+
+def test_due_sources_run_in_the_given_order():
+    ran = []
+    scrapers = [_scraper(n) for n in ("a", "b", "c")]
+    for s in scrapers:
+        s.scrape.side_effect = lambda name=s.source_name: ran.append(name) or []
+    daemon, _, _ = _daemon(scrapers, order=lambda due: sorted(due, key=lambda s: s.source_name, reverse=True))
+    daemon.tick()
+    assert ran == ["c", "b", "a"]
+
+
+def test_markets_share_one_poll_but_get_their_own_digests():
+    la = _make_listing("LA role", "https://example.com/la")
+    atl = _make_listing("ATL role", "https://example.com/atl")
+    scraper = _scraper("a", [la, atl])
+    dedups = {"la": MagicMock(), "atlanta": MagicMock()}
+    for dedup in dedups.values():
+        dedup.deduplicate.side_effect = lambda x: x
+    deliver = _deliver_all()
+    daemon, clock, _ = _daemon([scraper], deliver=deliver, dedup=dedups,
+                               route=lambda l: ["la"] if l is la else ["la", "atlanta"])
+    daemon.tick()
+    clock.now = 100.0
+    daemon.tick()
+
+    assert scraper.scrape.call_count == 2  # t=0 and t=100, not once per market
+    deliver.assert_any_call([la, atl], [], "la")
+    deliver.assert_any_call([atl], [], "atlanta")
+    dedups["atlanta"].mark_seen.assert_called_once_with([atl])
+
+
+def test_new_listings_are_alerted_and_still_digested():
+    listing = _make_listing()
+    deliver = _deliver_all()
+    alert = MagicMock()
+    daemon, clock, dedup = _daemon([_scraper("a", [listing])], deliver=deliver, alert=alert,
+                                   intervals={"a": 10.0}, digest_interval=15.0)
+
+    daemon.tick()
+    alert.assert_called_once_with([listing])
+
+    clock.now = 10.0
+    daemon.tick()  # re-found while pending: not new, no second alert
+    assert alert.call_count == 1
+
+    clock.now = 15.0
+    daemon.tick()
+    deliver.assert_called_once_with([listing], [], None)
+    dedup.mark_seen.assert_called_once_with([listing])
+
+
+def test_polls_credit_run_metrics():
+    listing = _make_listing()
+    metrics = RunMetrics()
+    metrics.begin("test")
+    daemon, clock, _ = _daemon([_scraper("test", [listing])], metrics=metrics)
+    daemon.tick()
+    [run] = metrics.take()
+    assert (run.passed, run.new) == (1, 1)
@@ -0,0 +1,195 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from models import CastingListing, CareerCategory
+from rules import Rule, RuleEngine
+from store import ListingStore
+
+
+def _make_listing(title="Test", url="https://example.com/1", **kw) -> CastingListing:
+    defaults = {
+        "title": title,
+        "source": "craigslist",
+        "url": url,
+        "posted_date": date.today(),
+        "location": "Burbank, CA",
+        "union_status": "non-union",
+        "role_type": "other",
+        "description": "Test",
+        "how_to_apply": "Apply",
+    }
+    defaults.update(kw)
+    return CastingListing(**defaults)
+
+
+def test_add_many_skips_already_stored(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.db"))
+    a = _make_listing(title="A", url="https://a.com")
+    b = _make_listing(title="B", url="https://b.com")
+    assert store.add_many([a]) == 1
+    assert store.add_many([a, b]) == 1
+    assert store.count() == 2
+
+
+def test_round_trips_all_fields(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.db"))
+    listing = _make_listing(
+        deadline=date(2026, 3, 14), compensation="$200/day", school_or_production="USC",
+    )
+    store.add_many([listing])
+    assert store.query() == [listing]
+
+
+def test_query_combines_filters(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.db"))
+    today = date.today()
+    store.add_many([
+        _make_listing(title="Improv-heavy commercial", url="https://1", role_type="commercial"),
+        _make_listing(title="Scripted commercial", url="https://2", role_type="commercial",
+                      description="scripted"),
+        _make_listing(title="Improv commercial in Pasadena", url="https://3", role_type="commercial",
+                      location="Pasadena, CA"),
+        _make_listing(title="Old improv commercial", url="https://4", role_type="commercial",
+                      posted_date=today - timedelta(days=30)),
+        _make_listing(title="Improv short", url="https://5", role_type="other"),
+    ])
+    result = store.query(
+        category=CareerCategory.COMMERCIAL,
+        location="burbank",
+        since=today - timedelta(days=14),
+        text="improv",
+    )
+    assert [l.title for l in result] == ["Improv-heavy commercial"]
+
+
+def test_query_by_source_newest_first(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.db"))
+    today = date.today()
+    store.add_many([
+        _make_listing(title="Older", url="https://1", posted_date=today - timedelta(days=2)),
+        _make_listing(title="Newer", url="https://2"),
+        _make_listing(title="Reddit", url="https://3", source="reddit"),
+    ])
+    assert [l.title for l in store.query(source="craigslist")] == ["Newer", "Older"]
+
+
+def test_location_query_uses_index(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.db"))
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM listings WHERE city LIKE ?", ("burbank%",)
+    ).fetchall()
+    assert any("idx_listings_city" in row[3] for row in plan)
+
+
+def test_search_ranks_title_matches_first(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.db"))
+    store.add_many([
+        _make_listing(title="Feature film extras", url="https://1", description="Some improv required"),
+        _make_listing(title="Improv comedy sketch", url="https://2", description="Comedy"),
+        _make_listing(title="Drama short", url="https://3", description="Dramatic monologue"),
+    ])
+    results = store.search("improv")
+    assert [l.title for l, _ in results] == ["Improv comedy sketch", "Feature film extras"]
+
+
+def test_search_prefix_and_stemming(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.db"))
+    store.add_many([
+        _make_listing(title="Improvisational actors wanted", url="https://1"),
+        _make_listing(title="Auditioning dancers", url="https://2"),
+    ])
+    assert [l.title for l, _ in store.search("improv*")] == ["Improvisational actors wanted"]
+    assert [l.title for l, _ in store.search("audition")] == ["Auditioning dancers"]
+
+
+def test_search_filters_and_requires_all_terms(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.db"))
+    store.add_many([
+        _make_listing(title="USC thesis film lead", url="https://1", school_or_production="USC"),
+        _make_listing(title="USC thesis film lead", url="https://2", source="reddit",
+                      school_or_production="USC"),
+        _make_listing(title="USC commercial", url="https://3", role_type="commercial"),
+    ])
+    results = store.search("usc thesis", source="reddit", category=CareerCategory.STUDENT_FILM)
+    assert [l.url for l, _ in results] == ["https://2"]
+
+
+def test_search_ignores_fts_syntax_in_input(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.db"))
+    store.add_many([_make_listing(title="Open call", url="https://1")])
+    assert store.search('"open call(') != []
+    assert store.search("  ") == []
+
+
+def test_index_built_for_existing_archive(tmp_path):
+    path = str(tmp_path / "listings.db")
+    store = ListingStore(path)
+    store.add_many([_make_listing(title="Improv night", url="https://1")])
+    store._conn.executescript("DROP TABLE listings_fts;")
+    store.close()
+
+    reopened = ListingStore(path)
+    assert [l.title for l, _ in reopened.search("improv")] == ["Improv night"]
+
+
+def test_query_pages_and_bounds_dates(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.db"))
+    day = date(2026, 3, 10)
+    store.add_many([
+        _make_listing(title=f"L{i}", url=f"https://x.com/{i}", posted_date=day - timedelta(days=i))
+        for i in range(5)
+    ])
+    assert [l.title for l in store.query(limit=2, offset=2)] == ["L2", "L3"]
+    assert [l.title for l in store.query(since=day - timedelta(days=3), until=day - timedelta(days=1))] == \
+        ["L1", "L2", "L3"]
+
+
+def test_daily_counts_track_inserts(tmp_path):
+    path = str(tmp_path / "listings.db")
+    store = ListingStore(path)
+    store.add_many([_make_listing(title="A", url="https://a.com"),
+                    _make_listing(title="B", url="https://b.com", role_type="principal")],
+                   seen_on=date(2026, 3, 1))
+    store.add_many([_make_listing(title="A", url="https://a.com"),  # already stored
+                    _make_listing(title="C", url="https://c.com", source="reddit")],
+                   seen_on=date(2026, 3, 2))
+    assert store.daily_counts() == [
+        (date(2026, 3, 1), CareerCategory.PRINCIPAL, "craigslist", 1),
+        (date(2026, 3, 1), CareerCategory.SHORT_INDIE, "craigslist", 1),
+        (date(2026, 3, 2), CareerCategory.SHORT_INDIE, "reddit", 1),
+    ]
+    assert store.daily_counts(since=date(2026, 3, 2)) == [(date(2026, 3, 2), CareerCategory.SHORT_INDIE, "reddit", 1)]
+
+
+def test_daily_counts_backfilled_for_existing_archive(tmp_path):
+    path = str(tmp_path / "listings.db")
+    store = ListingStore(path)
+    store.add_many([_make_listing()], seen_on=date(2026, 3, 1))
+    store._conn.executescript("DROP TABLE daily_counts; DROP TRIGGER daily_counts_ai; DROP TRIGGER daily_counts_ad;")
+    store.close()
+    assert ListingStore(path).daily_counts() == [(date(2026, 3, 1), CareerCategory.SHORT_INDIE, "craigslist", 1)]
+
+
+def test_city_is_normalized_by_the_gazetteer(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.db"))
+    store.add_many([
+        _make_listing("Short", url="https://example.com/1", location="Studio City, LA"),
+        _make_listing("Promo", url="https://example.com/2", location="LA"),
+    ])
+    assert [l.title for l in store.query(location="studio city")] == ["Short"]
+    assert [l.title for l in store.query(location="los angeles")] == ["Promo"]
+
+
+def test_categories_are_recomputed_when_the_rules_change(tmp_path):
+    path = str(tmp_path / "listings.db")
+    store = ListingStore(path)
+    store.add_many([_make_listing("Cereal spot", description="national commercial")])
+    assert store.query(category=CareerCategory.PRINCIPAL) == []
+    store.close()
+
+    engine = RuleEngine([Rule(CareerCategory.PRINCIPAL, keywords=("cereal",))], CareerCategory.OPEN_CALL)
+    with patch("store.default_engine", return_value=engine):
+        store = ListingStore(path)
+        assert [l.title for l in store.query(category=CareerCategory.PRINCIPAL)] == ["Cereal spot"]
+        assert [(c, n) for _, c, _, n in store.daily_counts()] == [(CareerCategory.PRINCIPAL, 1)]
+        store.close()